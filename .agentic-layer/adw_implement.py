@@ -14,22 +14,27 @@ import sys
 import asyncio
 import argparse
 import logging
-from dotenv import load_dotenv
 from console import console
 from coding_agent import call_coding_agent
 from agent_types import AgentType
 from arg_utils import add_agent_argument, parse_agent_type
+from env_loader import load_env
+from phase_timing import timed_phase
 
-load_dotenv()
 
-
-async def adw_implement(spec_file_path: str, agent_type: AgentType = AgentType.CLAUDE) -> bool:
+@timed_phase("implement")
+async def adw_implement(
+    spec_file_path: str,
+    agent_type: AgentType = AgentType.CLAUDE,
+    lint_on_write: bool = False
+) -> bool:
     """
     Implements a spec file by calling Claude Code with the /implement command.
 
     Args:
-        run_id: The run identifier
         spec_file_path: Path to the spec file
+        agent_type: Type of coding agent to use (default: CLAUDE)
+        lint_on_write: Format and autofix every file the agent writes or edits
 
     Returns:
         bool: True if implementation completed successfully, False otherwise
@@ -40,7 +45,9 @@ async def adw_implement(spec_file_path: str, agent_type: AgentType = AgentType.C
     try:
         status_text = f"[cyan]{agent_type.value.capitalize()} is implementing...[/cyan]"
         with console.status(status_text):
-            await call_coding_agent(agent_type, "implement", [spec_file_path])
+            await call_coding_agent(
+                agent_type, "implement", [spec_file_path], lint_on_write=lint_on_write
+            )
     except Exception as e:
         logger.error("Coding agent failed during implementation: %s", e, exc_info=True)
         raise
@@ -52,18 +59,25 @@ async def adw_implement(spec_file_path: str, agent_type: AgentType = AgentType.C
 
 async def main():
     """Main orchestration function for the ADW implementation flow."""
+    load_env()
+
     # Parse command line arguments
     parser = argparse.ArgumentParser(
         description="Implement specification file for Agentic Development Workflow"
     )
     parser.add_argument("--spec", required=True, help="Path to the spec file")
+    parser.add_argument(
+        "--lint_on_write",
+        action="store_true",
+        help="Format and autofix every file the agent writes or edits (Claude only)"
+    )
     add_agent_argument(parser)
 
     args = parser.parse_args()
 
     try:
         agent_type = parse_agent_type(args)
-        success = await adw_implement(args.spec, agent_type)
+        success = await adw_implement(args.spec, agent_type, lint_on_write=args.lint_on_write)
         if not success:
             sys.exit(1)
     except (FileNotFoundError, ValueError, RuntimeError) as e:
@@ -26,9 +26,14 @@ from classify_draft import classify_draft
 from models import DraftClass
 from generate_branch_name import generate_branch_name
 from create_branch import create_branch
+from git_snapshot import record_base_tree
 from agent_types import AgentType
 from arg_utils import add_agent_argument, parse_agent_type
 from logging_config import setup_logging
+from env_loader import load_env
+from event_bus import EventType, emit
+from phase_timing import timed_phase
+from run_context import set_run_id
 
 
 def _print_initialization_summary(
@@ -75,6 +80,16 @@ def _setup_run_folder_and_draft(run_id: str, draft_file_path: str) -> Tuple[str,
     return draft_destination_path, draft_text
 
 
+def _record_base_tree(run_id: str) -> None:
+    """Record the working tree the run starts from, for diffs in later phases."""
+    logger = logging.getLogger(__name__)
+    try:
+        tree = record_base_tree(get_or_create_run_folder(run_id))
+        logger.info("Recorded base tree: %s", tree)
+    except RuntimeError as e:
+        logger.warning("Could not record base tree: %s", e)
+
+
 async def _classify_and_create_branch(
     run_id: str, draft_file_path: str, issue_id: str = None, agent_type: AgentType = AgentType.CLAUDE
 ) -> Tuple[DraftClass, str]:
@@ -121,6 +136,7 @@ async def _classify_and_create_branch(
     return draft_class, branch_name
 
 
+@timed_phase("init")
 async def adw_init(
     draft_file_path: str,
     run_id: str = None,
@@ -158,6 +174,8 @@ async def adw_init(
 
     # Initialize logging with run-specific log file
     setup_logging(run_id)
+    set_run_id(run_id)
+    emit(EventType.RUN_STARTED, draft=str(draft_file_path), agent=agent_type.value)
     logger = logging.getLogger(__name__)
     logger.info("="*60)
     logger.info("ADW Initialization started - Run ID: %s", run_id)
@@ -166,6 +184,7 @@ async def adw_init(
 
     # Steps 2-4: Set up folder and read draft
     draft_destination_path, draft_text = _setup_run_folder_and_draft(run_id, draft_file_path)
+    _record_base_tree(run_id)
 
     # Steps 5-7: Classify and create branch
     draft_class, branch_name = await _classify_and_create_branch(
@@ -180,6 +199,8 @@ async def adw_init(
 
 async def main():
     """Main orchestration function for the ADW initialization flow."""
+    load_env()
+
     # Parse command line arguments
     parser = argparse.ArgumentParser(description="Initialize the Agentic Development Workflow")
     parser.add_argument("--draft", required=True, help="Path to the draft file to process")
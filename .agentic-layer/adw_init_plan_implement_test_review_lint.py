@@ -17,6 +17,8 @@ import sys
 import asyncio
 import argparse
 import logging
+import tempfile
+from pathlib import Path
 
 from console import console, phase_header, success, error
 from logging_config import setup_logging
@@ -24,13 +26,19 @@ from adw_init import adw_init
 from adw_plan import adw_plan
 from adw_implement import adw_implement
 from adw_lint import adw_lint
-from adw_test_loop import adw_test_loop
+from adw_test_loop import adw_test_loop, DEFAULT_MAX_ITERATIONS
 from adw_review import adw_review
 from get_or_create_folders import get_or_create_test_folder
 from agent_types import AgentType
 from arg_utils import add_agent_argument, parse_agent_type
-from speech_notifications import speak_success, speak_error
-from rich.panel import Panel
+from speech_notifications import subscribe_speech
+from event_bus import EventType, emit, get_event_bus
+from run_budget import RunBudget, set_run_budget
+from env_loader import load_env
+from git_snapshot import (
+    add_worktree, apply_diff, changed_files, diff_snapshots, link_dependency_directories,
+    remove_worktree, snapshot_worktree
+)
 
 
 async def _run_planning_phase(
@@ -56,14 +64,18 @@ async def _run_planning_phase(
         raise
 
 
-async def _run_implementation_phase(spec_file_path: str, agent_type: AgentType):
+async def _run_implementation_phase(
+    spec_file_path: str, agent_type: AgentType, lint_on_write: bool = False
+):
     """Execute the implementation phase."""
     logger = logging.getLogger(__name__)
     console.print(phase_header("IMPLEMENTATION", 3, 6))
     logger.info("Phase 3/6: Implementation - Executing specification")
 
     try:
-        success_impl = await adw_implement(str(spec_file_path), agent_type)
+        success_impl = await adw_implement(
+            str(spec_file_path), agent_type, lint_on_write=lint_on_write
+        )
         if not success_impl:
             error("Implementation failed")
             logger.error("Implementation failed")
@@ -76,14 +88,24 @@ async def _run_implementation_phase(spec_file_path: str, agent_type: AgentType):
         raise
 
 
-async def _run_review_phase(run_id: str, spec_file_path: str, agent_type: AgentType):
+async def _run_review_phase(
+    run_id: str,
+    spec_file_path: str,
+    agent_type: AgentType,
+    max_concurrent_patches: int = 3,
+    merge_patches: bool = False
+):
     """Execute the review phase."""
     logger = logging.getLogger(__name__)
     console.print(phase_header("REVIEW", 5, 6))
     logger.info("Phase 5/6: Review - Validating implementation against specification")
 
     try:
-        success_review = await adw_review(run_id, str(spec_file_path), agent_type)
+        success_review = await adw_review(
+            run_id, str(spec_file_path), agent_type,
+            max_concurrent_patches=max_concurrent_patches,
+            merge_patches=merge_patches
+        )
         if not success_review:
             error("Review failed: blocker issues remain after max iterations")
             logger.error("Review failed: blocker issues remain after max iterations")
@@ -96,14 +118,14 @@ async def _run_review_phase(run_id: str, spec_file_path: str, agent_type: AgentT
         raise
 
 
-async def _run_linting_phase(spec_file_path: str, agent_type: AgentType):
+async def _run_linting_phase(spec_file_path: str, agent_type: AgentType, cwd: str | None = None):
     """Execute the linting phase."""
     logger = logging.getLogger(__name__)
     console.print(phase_header("LINTING", 6, 6))
     logger.info("Phase 6/6: Linting - Running code quality checks")
 
     try:
-        success_lint = await adw_lint(str(spec_file_path), agent_type)
+        success_lint = await adw_lint(str(spec_file_path), agent_type, cwd=cwd)
         if not success_lint:
             error("Linting failed")
             logger.error("Linting failed")
@@ -116,7 +138,87 @@ async def _run_linting_phase(spec_file_path: str, agent_type: AgentType):
         raise
 
 
-async def _run_testing_phase(run_id: str, spec_file_path: str, agent_type: AgentType):
+async def _run_review_and_linting_phases(
+    run_id: str,
+    spec_file_path: str,
+    agent_type: AgentType,
+    max_concurrent_patches: int = 3,
+    merge_patches: bool = False
+):
+    """
+    Execute the review loop and the linting phase concurrently.
+
+    Linting runs in a temporary git worktree checked out from a snapshot of
+    the current working tree, with the ignored dependency directories
+    (.venv, venv, node_modules) symlinked in. Once both phases finish, the
+    lint diff is merged back. If the merge touched files the review loop changed, one short
+    confirmation review runs. If the lint diff does not apply cleanly, linting
+    is repeated in the main working tree instead.
+    """
+    logger = logging.getLogger(__name__)
+    base_tree = snapshot_worktree()
+    worktree = tempfile.mkdtemp(prefix=f"adw_lint_{run_id}_")
+    add_worktree(worktree, base_tree)
+    logger.info("Linting concurrently in worktree: %s", worktree)
+
+    try:
+        linked = link_dependency_directories(worktree)
+        if linked:
+            logger.info("Linked dependency directories into worktree: %s", ", ".join(linked))
+        try:
+            async with asyncio.TaskGroup() as group:
+                group.create_task(_run_review_phase(
+                    run_id, spec_file_path, agent_type, max_concurrent_patches, merge_patches
+                ))
+                group.create_task(_run_linting_phase(
+                    str(Path(spec_file_path).resolve()), agent_type, cwd=worktree
+                ))
+        except ExceptionGroup as e:
+            # Callers handle the phases' own errors, not the group wrapping them
+            raise e.exceptions[0] from e
+
+        review_files = set(changed_files(base_tree, snapshot_worktree()))
+        lint_tree = snapshot_worktree(cwd=worktree)
+        lint_files = set(changed_files(base_tree, lint_tree, cwd=worktree))
+        lint_diff = diff_snapshots(base_tree, lint_tree, cwd=worktree)
+    finally:
+        remove_worktree(worktree)
+
+    if not apply_diff(lint_diff):
+        logger.warning("Lint diff conflicts with review patches - re-running lint in place")
+        console.print("[yellow]⚠[/yellow] Lint changes conflict with review patches. Re-linting.")
+        before_lint = snapshot_worktree()
+        await _run_linting_phase(spec_file_path, agent_type)
+        lint_files = set(changed_files(before_lint, snapshot_worktree()))
+    else:
+        logger.info("Merged lint diff touching %s file(s)", len(lint_files))
+    overlap = lint_files & review_files
+
+    if overlap:
+        console.rule("[cyan]Confirmation review after lint merge[/cyan]")
+        logger.info("Lint merge touched reviewed files %s - confirming", sorted(overlap))
+        success_review = await adw_review(
+            run_id, str(spec_file_path), agent_type,
+            max_concurrent_patches=max_concurrent_patches,
+            merge_patches=merge_patches,
+            max_iterations=2
+        )
+        if not success_review:
+            error("Confirmation review failed: blocker issues remain")
+            logger.error("Confirmation review after lint merge failed")
+            raise RuntimeError("Confirmation review failed: blocker issues remain")
+        success("Confirmation review passed")
+
+
+async def _run_testing_phase(
+    run_id: str,
+    spec_file_path: str,
+    agent_type: AgentType,
+    max_iterations: int = DEFAULT_MAX_ITERATIONS,
+    rollback_on_regression: bool = False,
+    test_shards: int | None = None,
+    test_maxfail: int | None = None
+):
     """Execute the testing phase."""
     logger = logging.getLogger(__name__)
     console.print(phase_header("TESTING", 4, 6))
@@ -124,7 +226,13 @@ async def _run_testing_phase(run_id: str, spec_file_path: str, agent_type: Agent
 
     try:
         test_folder = get_or_create_test_folder(run_id)
-        success_test = await adw_test_loop(str(test_folder), str(spec_file_path), agent_type)
+        success_test = await adw_test_loop(
+            str(test_folder), str(spec_file_path), agent_type,
+            max_iterations=max_iterations,
+            rollback_on_regression=rollback_on_regression,
+            test_shards=test_shards,
+            test_maxfail=test_maxfail
+        )
         if not success_test:
             error("Testing failed: not all tests passed")
             logger.error("Testing failed: not all tests passed")
@@ -137,11 +245,50 @@ async def _run_testing_phase(run_id: str, spec_file_path: str, agent_type: Agent
         raise
 
 
+# Exit code of a run stopped by its budget, distinct from a failed run
+EXIT_BUDGET_EXHAUSTED = 3
+
+
+def _report_budget_exhaustion(budget: RunBudget, run_id: str | None) -> None:
+    """Print and log that the run stopped early with a partial result."""
+    from rich.panel import Panel  # pylint: disable=import-outside-toplevel
+
+    logger = logging.getLogger(__name__)
+    console.print(Panel.fit(
+        f"[bold yellow]⚠ RUN STOPPED: BUDGET EXHAUSTED[/bold yellow]\n\n"
+        f"[cyan]Run ID:[/cyan] {run_id}\n"
+        f"[cyan]Exhausted:[/cyan] {budget.exhausted_reason} during {budget.exhausted_phase or 'the run'}\n"
+        f"[cyan]Used:[/cyan] {budget.summary()}\n\n"
+        "The branch and run folder hold the partial result.",
+        border_style="yellow",
+        title="[bold]Partial result[/bold]"
+    ))
+    logger.warning(
+        "Run %s stopped: %s budget exhausted during %s (%s)",
+        run_id, budget.exhausted_reason, budget.exhausted_phase, budget.summary()
+    )
+
+
+async def _finish_workflow(workflow_success: bool, **data) -> None:
+    """Announce the end of the workflow and wait for subscribers to handle it."""
+    emit(EventType.WORKFLOW_FINISHED, success=workflow_success, **data)
+    await get_event_bus().drain()
+
+
 async def adw_complete(
     draft_file_path: str,
     run_id: str = None,
     issue_id: str = None,
-    agent_type: AgentType = AgentType.CLAUDE
+    agent_type: AgentType = AgentType.CLAUDE,
+    max_concurrent_patches: int = 3,
+    merge_patches: bool = False,
+    max_test_iterations: int = DEFAULT_MAX_ITERATIONS,
+    rollback_on_regression: bool = False,
+    parallel_lint: bool = False,
+    lint_on_write: bool = False,
+    budget: RunBudget | None = None,
+    test_shards: int | None = None,
+    test_maxfail: int | None = None
 ) -> bool:
     """Execute the complete ADW workflow.
 
@@ -149,10 +296,33 @@ async def adw_complete(
         draft_file_path: Path to the draft file to process
         run_id: Optional run ID (generated if not provided)
         issue_id: Optional issue ID for branch naming
+        agent_type: The agent type to use (default: CLAUDE)
+        max_concurrent_patches: Maximum number of review patch groups run concurrently
+        merge_patches: Fix review blockers touching the same files with one patch call
+        max_test_iterations: Maximum number of test-and-fix iterations
+        rollback_on_regression: Roll back test fixes that make more tests fail
+        parallel_lint: Lint in a separate worktree while the review loop runs
+        lint_on_write: Format and autofix every file written during implementation
+        budget: Wall-time, token and agent-call budget of the run
+                (default: limits from the environment)
+        test_shards: Run the tests locally in this many pytest processes
+                     (default: ADW_TEST_SHARDS; 0 lets the agent run them)
+        test_maxfail: Stop local test runs after this many failures
+                      (default: ADW_TEST_MAXFAIL; 0 runs the whole suite)
 
     Returns:
         bool: True if the entire workflow completed successfully, False otherwise
+              (including runs stopped by their budget; see budget.exhausted_reason)
     """
+    from rich.panel import Panel  # pylint: disable=import-outside-toplevel
+
+    # Spoken notifications consume the workflow-finished event off the hot path
+    subscribe_speech()
+
+    # Every agent call of this run counts against the same budget
+    budget = budget or RunBudget.from_env()
+    set_run_budget(budget)
+
     # Display initial header (before logging setup since we don't have run_id yet)
     console.print(Panel.fit(
         "[bold cyan]AGENTIC DEVELOPMENT WORKFLOW[/bold cyan]\n"
@@ -170,6 +340,11 @@ async def adw_complete(
         )
     except (FileNotFoundError, ValueError, RuntimeError) as e:
         error(f"Initialization failed: {e}")
+        if budget.exhausted_reason:
+            _report_budget_exhaustion(budget, run_id)
+        await _finish_workflow(
+            False, failed_phase="init", budget_exhausted=bool(budget.exhausted_reason)
+        )
         return False
 
     # Set up logging (after we have run_id)
@@ -186,10 +361,20 @@ async def adw_complete(
         spec_file_path = await _run_planning_phase(
             run_id, draft_destination_path, draft_class, agent_type
         )
-        await _run_implementation_phase(spec_file_path, agent_type)
-        await _run_testing_phase(run_id, spec_file_path, agent_type)
-        await _run_review_phase(run_id, spec_file_path, agent_type)
-        await _run_linting_phase(spec_file_path, agent_type)
+        await _run_implementation_phase(spec_file_path, agent_type, lint_on_write)
+        await _run_testing_phase(
+            run_id, spec_file_path, agent_type, max_test_iterations, rollback_on_regression,
+            test_shards, test_maxfail
+        )
+        if parallel_lint:
+            await _run_review_and_linting_phases(
+                run_id, spec_file_path, agent_type, max_concurrent_patches, merge_patches
+            )
+        else:
+            await _run_review_phase(
+                run_id, spec_file_path, agent_type, max_concurrent_patches, merge_patches
+            )
+            await _run_linting_phase(spec_file_path, agent_type)
 
         # Success summary
         console.print(Panel.fit(
@@ -206,19 +391,26 @@ async def adw_complete(
         logger.info("Run ID: %s | Branch: %s | Spec: %s", run_id, branch_name, spec_file_path)
         logger.info("="*60)
 
-        # Play success notification
-        speak_success()
+        await _finish_workflow(
+            True, branch=branch_name, spec=str(spec_file_path), budget=budget.as_dict()
+        )
 
         return True
     except (FileNotFoundError, ValueError, RuntimeError):
-        # Play error notification
-        speak_error()
+        if budget.exhausted_reason:
+            _report_budget_exhaustion(budget, run_id)
+        await _finish_workflow(
+            False, branch=branch_name, budget_exhausted=bool(budget.exhausted_reason),
+            budget=budget.as_dict()
+        )
 
         return False
 
 
 async def main():
     """Main orchestration function for the complete ADW flow."""
+    load_env()
+
     parser = argparse.ArgumentParser(
         description="Execute the complete Agentic Development Workflow: "
         "init → plan → implement → test → review → lint"
@@ -226,15 +418,84 @@ async def main():
     parser.add_argument("--draft", required=True, help="Path to the draft file to process")
     parser.add_argument("--run_id", help="Optional run ID (generated if not provided)")
     parser.add_argument("--issue_id", help="Optional issue ID for branch naming")
+    parser.add_argument(
+        "--max_test_iterations",
+        type=int,
+        default=DEFAULT_MAX_ITERATIONS,
+        help=f"Maximum number of test-and-fix iterations (default: {DEFAULT_MAX_ITERATIONS})"
+    )
+    parser.add_argument(
+        "--rollback_on_regression",
+        action="store_true",
+        help="Roll back test fixes that make more tests fail"
+    )
+    parser.add_argument(
+        "--test_shards",
+        type=int,
+        help="Run the tests locally in this many pytest processes (default: ADW_TEST_SHARDS)"
+    )
+    parser.add_argument(
+        "--test_maxfail",
+        type=int,
+        help="Stop local test runs after this many failures (default: ADW_TEST_MAXFAIL)"
+    )
+    parser.add_argument(
+        "--parallel_lint",
+        action="store_true",
+        help="Lint in a separate git worktree while the review loop runs"
+    )
+    parser.add_argument(
+        "--lint_on_write",
+        action="store_true",
+        help="Format and autofix every file written during implementation (Claude only)"
+    )
+    parser.add_argument(
+        "--patch_concurrency",
+        type=int,
+        default=3,
+        help="Maximum number of review patch groups run concurrently (default: 3)"
+    )
+    parser.add_argument(
+        "--merge_patches",
+        action="store_true",
+        help="Fix review blockers touching the same files with a single patch call"
+    )
+    parser.add_argument(
+        "--max_run_minutes",
+        type=float,
+        help="Wall-time budget of the run in minutes (default: ADW_MAX_RUN_MINUTES, unlimited)"
+    )
+    parser.add_argument(
+        "--max_tokens",
+        type=int,
+        help="Token budget of the run (default: ADW_MAX_RUN_TOKENS, unlimited)"
+    )
+    parser.add_argument(
+        "--max_agent_calls",
+        type=int,
+        help="Agent-call budget of the run (default: ADW_MAX_AGENT_CALLS, unlimited)"
+    )
     add_agent_argument(parser)
 
     args = parser.parse_args()
 
     try:
         agent_type = parse_agent_type(args)
-        workflow_success = await adw_complete(args.draft, args.run_id, args.issue_id, agent_type)
+        budget = RunBudget.from_env(args.max_run_minutes, args.max_tokens, args.max_agent_calls)
+        workflow_success = await adw_complete(
+            args.draft, args.run_id, args.issue_id, agent_type,
+            max_concurrent_patches=args.patch_concurrency,
+            merge_patches=args.merge_patches,
+            max_test_iterations=args.max_test_iterations,
+            rollback_on_regression=args.rollback_on_regression,
+            parallel_lint=args.parallel_lint,
+            lint_on_write=args.lint_on_write,
+            budget=budget,
+            test_shards=args.test_shards,
+            test_maxfail=args.test_maxfail
+        )
         if not workflow_success:
-            sys.exit(1)
+            sys.exit(EXIT_BUDGET_EXHAUSTED if budget.exhausted_reason else 1)
     except (FileNotFoundError, ValueError, RuntimeError) as e:
         print(f"Fatal error: {e}", file=sys.stderr)
         sys.exit(1)
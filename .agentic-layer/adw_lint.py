@@ -10,26 +10,109 @@ This script orchestrates code quality checking for a workflow run.
 # ]
 # ///
 
+import os
 import sys
+import json
 import asyncio
 import argparse
 import logging
-from dotenv import load_dotenv
+from pathlib import Path
 from console import console
 from coding_agent import call_coding_agent
 from agent_types import AgentType
 from arg_utils import add_agent_argument, parse_agent_type
+from env_loader import load_env
+from get_or_create_folders import get_or_create_run_folder
+from git_snapshot import branch_changed_files, read_base_tree
+from local_linters import run_local_linters
+from phase_timing import timed_phase
+from run_context import get_run_id
 
-load_dotenv()
 
+def _fast_path_enabled() -> bool:
+    """Return whether local linters should run before the agent (ADW_LINT_FAST_PATH)."""
+    return os.getenv("ADW_LINT_FAST_PATH", "on").strip().lower() not in ("0", "off", "false", "no")
 
-async def adw_lint(spec_file_path: str, agent_type: AgentType = AgentType.CLAUDE) -> bool:
+
+def _run_base_tree() -> str | None:
+    """Return the base tree recorded by adw_init for the current run, if any."""
+    run_id = get_run_id()
+    if not run_id:
+        return None
+    try:
+        return read_base_tree(get_or_create_run_folder(run_id))
+    except ValueError:
+        return None
+
+
+async def _run_fast_path(spec_file_path: str, cwd: str | None) -> tuple[bool, Path | None]:
+    """
+    Run the local linters on the files changed by the run.
+
+    Changes are taken relative to the base tree recorded by adw_init, so
+    committed changes and detached lint worktrees are covered. Without a
+    recorded tree, ADW_BASE_REF (or the uncommitted changes) is used. When no
+    changed file is found or a linter fails, the agent does the whole job.
+
+    Args:
+        spec_file_path: Path to the spec file (violations are written next to it)
+        cwd: Directory to lint in (default: current directory)
+
+    Returns:
+        Tuple of (whether any linter ran, path of the violations file if any remain)
+    """
+    logger = logging.getLogger(__name__)
+    try:
+        files = branch_changed_files(os.getenv("ADW_BASE_REF"), cwd=cwd, base_tree=_run_base_tree())
+    except RuntimeError as e:
+        logger.warning("Could not find changed files, leaving linting to the agent: %s", e)
+        return False, None
+    if not files:
+        logger.info("No changed files found, leaving linting to the agent")
+        return False, None
+
+    try:
+        with console.status(f"[cyan]Running local linters on {len(files)} changed file(s)...[/cyan]"):
+            linters, violations = await run_local_linters(files, cwd=cwd)
+    except RuntimeError as e:
+        console.print(f"[yellow]Local linters failed, leaving linting to the agent: {e}[/yellow]")
+        logger.warning("Local linters failed: %s", e)
+        return False, None
+
+    if not linters:
+        logger.info("No local linters apply to the changed files")
+        return False, None
+
+    console.print(
+        f"[green]✓[/green] Local linters ran ({', '.join(linters)}): "
+        f"{len(violations)} violation(s) remaining"
+    )
+    if not violations:
+        return True, None
+
+    violations_path = Path(spec_file_path).resolve().parent / "lint_violations.json"
+    violations_path.write_text(json.dumps(violations, indent=2), encoding="utf-8")
+    logger.info("Wrote %s lint violations to %s", len(violations), violations_path)
+    return True, violations_path
+
+
+@timed_phase("lint")
+async def adw_lint(
+    spec_file_path: str,
+    agent_type: AgentType = AgentType.CLAUDE,
+    cwd: str | None = None
+) -> bool:
     """
-    Run linting by calling coding agent with the /lint command.
+    Run linting for the files changed on the branch.
+
+    Configured local linters run first and fix what they can. The coding agent
+    is then called with the /lint command only for the remaining violations,
+    or for the whole job when no local linter applies.
 
     Args:
         spec_file_path: Path to the spec file (provides context for fixes)
         agent_type: Type of coding agent to use (default: CLAUDE)
+        cwd: Directory to lint in (default: current directory)
 
     Returns:
         bool: True if linting completed successfully, False otherwise
@@ -37,10 +120,20 @@ async def adw_lint(spec_file_path: str, agent_type: AgentType = AgentType.CLAUDE
     logger = logging.getLogger(__name__)
     logger.info("Starting linting for spec: %s", spec_file_path)
 
+    lint_args = [spec_file_path]
+    if _fast_path_enabled():
+        linters_ran, violations_path = await _run_fast_path(spec_file_path, cwd)
+        if linters_ran and violations_path is None:
+            console.print(f"[green]✓[/green] Lint clean, no agent needed for spec: {spec_file_path}")
+            logger.info("Linting completed locally for spec: %s", spec_file_path)
+            return True
+        if violations_path is not None:
+            lint_args.append(str(violations_path))
+
     try:
         status_text = f"[cyan]{agent_type.value.capitalize()} is linting...[/cyan]"
         with console.status(status_text):
-            await call_coding_agent(agent_type, "lint", [spec_file_path])
+            await call_coding_agent(agent_type, "lint", lint_args, cwd=cwd)
     except Exception as e:
         logger.error("Coding agent failed during linting: %s", e, exc_info=True)
         raise
@@ -52,6 +145,8 @@ async def adw_lint(spec_file_path: str, agent_type: AgentType = AgentType.CLAUDE
 
 async def main():
     """Main orchestration function for the ADW linting flow."""
+    load_env()
+
     parser = argparse.ArgumentParser(
         description="Run linting for Agentic Development Workflow"
     )
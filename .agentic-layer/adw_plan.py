@@ -15,7 +15,6 @@ import asyncio
 import argparse
 import logging
 from pathlib import Path
-from dotenv import load_dotenv
 
 from console import console
 from get_or_create_folders import get_or_create_run_folder
@@ -23,10 +22,12 @@ from models import DraftClass
 from coding_agent import call_coding_agent
 from agent_types import AgentType
 from arg_utils import add_agent_argument, parse_agent_type
-
-load_dotenv()
+from env_loader import load_env
+from phase_timing import timed_phase
+from run_context import set_run_id
 
 
+@timed_phase("plan")
 async def adw_plan(
     run_id: str,
     draft_file_path: str,
@@ -46,6 +47,7 @@ async def adw_plan(
     """
     logger = logging.getLogger(__name__)
     logger.info("Starting planning phase for run %s", run_id)
+    set_run_id(run_id)
 
     # Get or create run folder
     run_folder = get_or_create_run_folder(run_id)
@@ -93,6 +95,8 @@ async def adw_plan(
 
 async def main():
     """Main orchestration function for the ADW planning flow."""
+    load_env()
+
     # Parse command line arguments
     parser = argparse.ArgumentParser(
         description="Create specification file for Agentic Development Workflow"
@@ -11,6 +11,7 @@ until no blocker issues remain.
 # ]
 # ///
 
+import asyncio
 import json
 import logging
 from pathlib import Path
@@ -19,33 +20,231 @@ from console import console
 from coding_agent import call_coding_agent
 from get_or_create_folders import get_or_create_review_folder
 from agent_types import AgentType
+from group_review_issues import group_issues_by_files, merge_issue_descriptions
+from git_snapshot import diff_snapshots, list_worktree_files, repository_root, snapshot_worktree
+from review_fingerprints import ReviewHistory, fingerprint_issue
+from claude_options import ESCALATION_MODEL
+from event_bus import EventType, emit
+from phase_timing import timed_phase
+from run_budget import limit_iterations
+from run_context import set_iteration, set_run_id
 
 
+async def _patch_issues(
+    issues: list[dict], spec_file_path: str, agent_type: AgentType, escalated: set[str]
+) -> None:
+    """Patch one group of issues with a single patch agent call."""
+    logger = logging.getLogger(__name__)
+    issue_nums = ", ".join(f"#{issue.get('review_issue_number')}" for issue in issues)
+    first_desc = issues[0].get('issue_description') or ''
+
+    model = "sonnet"
+    if any(fingerprint_issue(issue) in escalated for issue in issues):
+        model = ESCALATION_MODEL
+
+    console.print(f"  Patching issue {issue_nums} ({model}): {first_desc[:60]}...")
+    logger.info("Patching issue %s with %s: %s", issue_nums, model, first_desc)
+
+    try:
+        await call_coding_agent(
+            agent_type, "patch", [merge_issue_descriptions(issues), str(spec_file_path)],
+            model=model
+        )
+    except Exception as e:
+        logger.error("Patch failed for issue %s: %s", issue_nums, e, exc_info=True)
+        raise RuntimeError(f"Patch failed for issue {issue_nums}: {e}") from e
+
+
+async def _patch_issue_group(
+    group: list[dict],
+    spec_file_path: str,
+    agent_type: AgentType,
+    merge_patches: bool,
+    semaphore: asyncio.Semaphore,
+    escalated: set[str]
+) -> None:
+    """Patch a group of issues sharing files, one patch call after another."""
+    async with semaphore:
+        batches = [group] if merge_patches else [[issue] for issue in group]
+        for batch in batches:
+            await _patch_issues(batch, spec_file_path, agent_type, escalated)
+
+
+async def _patch_blocker_issues(
+    blocker_issues: list[dict],
+    spec_file_path: str,
+    agent_type: AgentType,
+    max_concurrent_patches: int,
+    merge_patches: bool,
+    escalated: set[str] | None = None
+) -> None:
+    """
+    Patch blocker issues, running groups of disjoint files concurrently.
+
+    Issues that touch overlapping files are patched serially within one group.
+    Issues whose files cannot be determined are patched alone afterwards.
+
+    Args:
+        blocker_issues: Blocker issues from the review
+        spec_file_path: Path to the specification file
+        agent_type: Type of coding agent to use
+        max_concurrent_patches: Maximum number of groups patched at once
+        merge_patches: Fix all issues of a group with a single patch call
+        escalated: Fingerprints of issues to patch with the escalation model
+    """
+    logger = logging.getLogger(__name__)
+    escalated = escalated or set()
+    try:
+        root, known_files = repository_root(), list_worktree_files()
+    except RuntimeError as e:
+        logger.warning("Could not list repository files, grouping issues by raw paths: %s", e)
+        root, known_files = None, None
+    groups, unscoped = group_issues_by_files(blocker_issues, root, known_files)
+    logger.info(
+        "Patching %s file group(s) concurrently (limit %s), %s unscoped issue(s) serially",
+        len(groups), max_concurrent_patches, len(unscoped)
+    )
+
+    semaphore = asyncio.Semaphore(max(1, max_concurrent_patches))
+    tasks = [
+        asyncio.create_task(
+            _patch_issue_group(
+                group, spec_file_path, agent_type, merge_patches, semaphore, escalated
+            )
+        )
+        for group in groups
+    ]
+    if tasks:
+        done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        for task in done:
+            if task.exception():
+                raise task.exception()
+
+    for issue in unscoped:
+        await _patch_issues([issue], spec_file_path, agent_type, escalated)
+
+
+def _archive_review_json(review_json_path: Path, iteration: int) -> None:
+    """Keep the review JSON of an iteration as review_<iteration>.json."""
+    if review_json_path.exists():
+        review_json_path.replace(
+            review_json_path.with_name(f"{review_json_path.stem}_{iteration}.json")
+        )
+
+
+def _report_patch_attempts(history: ReviewHistory) -> None:
+    """Print and log how often each blocker has been patched."""
+    logger = logging.getLogger(__name__)
+    if not history.attempts:
+        return
+    console.print("\n  Patch attempts per blocker:")
+    for fingerprint, attempts in sorted(
+        history.attempts.items(), key=lambda item: item[1], reverse=True
+    ):
+        description = history.descriptions.get(fingerprint, "")
+        console.print(f"    {attempts}x [{fingerprint}] {description[:60]}")
+        logger.info("Blocker %s patched %s time(s): %s", fingerprint, attempts, description)
+
+
+def _take_snapshot() -> str | None:
+    """Snapshot the working tree, or return None if git is unavailable."""
+    try:
+        return snapshot_worktree()
+    except RuntimeError as e:
+        logging.getLogger(__name__).warning(
+            "Could not snapshot working tree, incremental review disabled: %s", e
+        )
+        return None
+
+
+def _write_incremental_context(
+    review_folder: Path, iteration: int, before_tree: str | None, open_issues: list[dict]
+) -> list[str] | None:
+    """
+    Write the patch diff and open issues for the next incremental review.
+
+    Args:
+        review_folder: Folder for review artifacts
+        iteration: Iteration whose patches produced the diff
+        before_tree: Snapshot taken before the patches were applied
+        open_issues: Blocker issues the patches tried to fix
+
+    Returns:
+        [diff_path, open_issues_path], or None if a full review is needed
+    """
+    logger = logging.getLogger(__name__)
+    if before_tree is None:
+        return None
+    after_tree = _take_snapshot()
+    if after_tree is None:
+        return None
+
+    try:
+        diff_text = diff_snapshots(before_tree, after_tree)
+    except RuntimeError as e:
+        logger.warning("Could not diff patches, falling back to full review: %s", e)
+        return None
+    if not diff_text.strip():
+        logger.info("Patches produced no changes - next review will be a full review")
+        return None
+
+    diff_path = review_folder / f"patch_diff_{iteration}.diff"
+    diff_path.write_text(diff_text, encoding='utf-8')
+    open_issues_path = review_folder / f"open_issues_{iteration}.json"
+    open_issues_path.write_text(json.dumps(open_issues, indent=2), encoding='utf-8')
+    logger.info("Wrote patch diff (%s chars) to %s", len(diff_text), diff_path)
+    return [str(diff_path), str(open_issues_path)]
+
+
+@timed_phase("review")
 async def adw_review(
     run_id: str,
     spec_file_path: str,
     agent_type: AgentType,
-    review_json_path: str | None = None
+    review_json_path: str | None = None,
+    max_concurrent_patches: int = 3,
+    merge_patches: bool = False,
+    max_patch_attempts: int = 2,
+    max_iterations: int = 5
 ) -> bool:
     # pylint: disable=too-many-locals,too-many-statements
     """
     Run review and patch loop until no blocker issues remain.
 
+    The first iteration reviews the whole implementation. Later iterations
+    only review the diff produced by the previous patches: the diff file and
+    the list of still-open issues are passed as extra arguments to the review
+    command. Once an incremental review finds no blockers, a final full review
+    confirms the result, even if the iteration limit is reached. Blockers found
+    by a confirmation review past the limit are not patched.
+
+    Blockers are fingerprinted across iterations. A blocker that reappears
+    after a patch is retried with a stronger model; once it has been patched
+    max_patch_attempts times the loop stops early instead of spinning.
+
     Args:
         run_id: The run identifier for this workflow execution
         spec_file_path: Path to the specification file
         agent_type: Type of coding agent to use (CLAUDE or COPILOT)
         review_json_path: Optional path where the review JSON output should be written.
                          If not provided, will be constructed as {review_folder}/review.json
+        max_concurrent_patches: Maximum number of file groups patched concurrently
+        merge_patches: Fix all blockers touching the same files with one patch call
+        max_patch_attempts: Patch attempts per blocker before the loop gives up
+        max_iterations: Maximum number of review iterations
 
     Returns:
-        bool: True if review passed (no blocker issues), False if max iterations reached
+        bool: True if review passed (no blocker issues), False if max iterations
+              were reached or blockers kept reappearing
     """
     logger = logging.getLogger(__name__)
     logger.info("Starting review loop - run_id: %s, spec: %s", run_id, spec_file_path)
+    set_run_id(run_id)
 
     iteration = 0
-    max_iterations = 5
 
     # Determine review JSON path - construct if not provided
     if review_json_path is None:
@@ -53,19 +252,38 @@ async def adw_review(
         review_json_path_obj = review_folder / "review.json"
     else:
         review_json_path_obj = Path(review_json_path)
+        review_folder = review_json_path_obj.parent
 
-    while iteration < max_iterations:
+    # [diff_path, open_issues_path] for an incremental review, None for a full review
+    incremental_context = None
+
+    history = ReviewHistory()
+    history_path = review_folder / "review_history.json"
+
+    # The full review confirming a clean incremental review does not count as an iteration
+    confirmation_pending = False
+
+    while iteration < max_iterations or confirmation_pending:
+        confirmation_pending = False
+        # A nearly used-up run budget leaves room for one more iteration only
+        max_iterations = limit_iterations(iteration, max_iterations)
         iteration += 1
         console.rule(f"[cyan]Review Loop Iteration {iteration}[/cyan]")
         logger.info("Review loop iteration %s starting", iteration)
+        set_iteration(iteration)
+        emit(EventType.ITERATION_STARTED)
 
         # Step 1: Run review command
-        console.print("\n[blue][1/3][/blue] Running review...")
-        logger.info("Calling review agent")
+        review_args = [run_id, str(spec_file_path), str(review_json_path_obj)]
+        if incremental_context:
+            console.print("\n[blue][1/3][/blue] Reviewing patch diff...")
+            logger.info("Calling review agent on patch diff: %s", incremental_context[0])
+            review_args.extend(incremental_context)
+        else:
+            console.print("\n[blue][1/3][/blue] Running full review...")
+            logger.info("Calling review agent")
         try:
-            await call_coding_agent(
-                agent_type, "review", [run_id, str(spec_file_path), str(review_json_path_obj)]
-            )
+            await call_coding_agent(agent_type, "review", review_args)
         except Exception as e:
             logger.error("Review command failed: %s", e, exc_info=True)
             raise RuntimeError(f"Review command failed: {e}") from e
@@ -74,6 +292,12 @@ async def adw_review(
         console.print("\n[blue][2/3][/blue] Parsing review results...")
         logger.debug("Reading review JSON from: %s", review_json_path_obj)
 
+        if not review_json_path_obj.exists() and incremental_context:
+            logger.warning("Review JSON not found after incremental review - running full review")
+            incremental_context = None
+            confirmation_pending = True
+            continue
+
         if not review_json_path_obj.exists():
             logger.warning("Review JSON not found at %s - treating as successful review", review_json_path_obj)
             console.print("\n[green]✓[/green] No review JSON found - treating as successful review (no issues).")
@@ -102,51 +326,80 @@ async def adw_review(
             "Review found %s total issues, %s blockers",
             len(review_issues), len(blocker_issues)
         )
+        emit(
+            EventType.REVIEW_RESULTS,
+            issues=len(review_issues),
+            blockers=len(blocker_issues),
+            incremental=incremental_context is not None
+        )
+        history.record_review(iteration, blocker_issues, incremental_context is not None)
+        history.save(history_path)
+
+        # Step 5: If no blockers, confirm with a full review or we're done
+        if not blocker_issues and incremental_context:
+            console.print(
+                "\n[green]✓[/green] No blockers in patch diff. Running full confirmation review."
+            )
+            logger.info("Incremental review passed - running full confirmation review")
+            incremental_context = None
+            confirmation_pending = True
+            _archive_review_json(review_json_path_obj, iteration)
+            continue
 
-        # Step 5: If no blockers, we're done
         if not blocker_issues:
             console.print(
                 "\n[green]✓[/green] No blocker issues found! Review passed."
             )
             logger.info("Review passed - no blocker issues")
+            _report_patch_attempts(history)
             return True
 
+        # A confirmation review past the limit has no iteration left to review its patches
+        if iteration > max_iterations:
+            logger.info(
+                "Confirmation review found blockers after the last iteration, not patching"
+            )
+            _archive_review_json(review_json_path_obj, iteration)
+            break
+
+        # Stop when blockers keep coming back after being patched
+        exhausted = [
+            issue for issue in blocker_issues
+            if history.attempts_for(issue) >= max_patch_attempts
+        ]
+        if exhausted:
+            warning_msg = (
+                f"Review not converging: {len(exhausted)} blocker(s) reappeared after "
+                f"{max_patch_attempts} patch attempt(s). Stopping early."
+            )
+            console.print(f"\n[yellow]⚠[/yellow] {warning_msg}")
+            logger.warning(warning_msg)
+            _report_patch_attempts(history)
+            return False
+        escalated = {
+            fingerprint_issue(issue) for issue in blocker_issues
+            if history.attempts_for(issue) > 0
+        }
+
         # Step 6: Fix blocker issues
         issue_count = len(blocker_issues)
         console.print(
             f"\n[blue][3/3][/blue] Fixing {issue_count} blocker issue(s)..."
         )
-        for issue in blocker_issues:
-            issue_num = issue.get('review_issue_number')
-            issue_desc = issue.get('issue_description')
-            issue_resolution = issue.get('issue_resolution')
-
-            console.print(
-                f"  Patching issue #{issue_num}: {issue_desc[:60]}..."
-            )
-            logger.info("Patching issue #%s: %s", issue_num, issue_desc)
-
-            # Create combined description for patch agent
-            combined_desc = (
-                f"Issue: {issue_desc}\nResolution: {issue_resolution}"
-            )
+        before_tree = _take_snapshot()
+        await _patch_blocker_issues(
+            blocker_issues, spec_file_path, agent_type,
+            max_concurrent_patches, merge_patches, escalated
+        )
+        history.record_patched(blocker_issues)
+        history.save(history_path)
+        incremental_context = _write_incremental_context(
+            review_folder, iteration, before_tree, blocker_issues
+        )
 
-            try:
-                await call_coding_agent(
-                    agent_type, "patch", [combined_desc, str(spec_file_path)]
-                )
-            except Exception as e:
-                logger.error(
-                    "Patch failed for issue #%s: %s", issue_num, e,
-                    exc_info=True
-                )
-                raise RuntimeError(
-                    f"Patch failed for issue #{issue_num}: {e}"
-                ) from e
-
-        # Step 7: Clean up JSON for next iteration
-        logger.debug("Cleaning up review JSON for next iteration")
-        review_json_path_obj.unlink(missing_ok=True)
+        # Step 7: Archive JSON for next iteration
+        logger.debug("Archiving review JSON for iteration %s", iteration)
+        _archive_review_json(review_json_path_obj, iteration)
 
         logger.info("Review loop iteration %s complete", iteration)
 
@@ -157,4 +410,5 @@ async def adw_review(
     )
     console.print(f"\n[yellow]⚠[/yellow] {warning_msg}")
     logger.warning(warning_msg)
+    _report_patch_attempts(history)
     return False
@@ -0,0 +1,376 @@
+"""Cross-run performance statistics for ADW.
+
+Reads every run folder in RUN_DIRECTORY and reports:
+    * p50/p95 wall time per phase (from phases.jsonl)
+    * p50/p95 agent call time per slash command, model and agent
+      (from the transcript index)
+    * iteration counts of the test and review loops
+    * the slowest runs, whose wall time falls back to the run's log files
+      for runs without phase records
+
+Runs are selected by time window (--since/--until) and by the agent calls
+they contain (--where key=value). Passing any --baseline_* option compares
+the selection against a second one, e.g. the week before a change to
+.claude/commands against the week after.
+
+Usage:
+    uv run .agentic-layer/adw_stats.py
+    uv run .agentic-layer/adw_stats.py --since 2026-10-01 --where agent=claude
+    uv run .agentic-layer/adw_stats.py --since 2026-10-08 --baseline_since 2026-10-01 --baseline_until 2026-10-08
+"""
+# /// script
+# dependencies = [
+#   "python-dotenv",
+#   "rich",
+# ]
+# ///
+
+import argparse
+import json
+import math
+import os
+import sys
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from console import console
+from env_loader import load_env
+from phase_timing import PHASES_FILE_NAME
+from transcript_store import read_index
+
+LOOP_PHASES = ("test", "review")
+CALL_GROUPS = (("Slash commands", "command"), ("Models", "model"), ("Agents", "agent"))
+DEFAULT_SLOWEST_RUNS = 10
+
+
+@dataclass
+class RunRecord:
+    """Everything recorded about one run."""
+    run_id: str
+    calls: list[dict] = field(default_factory=list)
+    phases: list[dict] = field(default_factory=list)
+    started_at: datetime | None = None
+    ended_at: datetime | None = None
+
+    @property
+    def wall_s(self) -> float | None:
+        """Wall time of the run in seconds, if known."""
+        if self.started_at is None or self.ended_at is None:
+            return None
+        return (self.ended_at - self.started_at).total_seconds()
+
+    def iterations(self, phase: str) -> int | None:
+        """Return how many iterations a loop phase ran, if it ran."""
+        counts = [record["iterations"] for record in self.phases
+                  if record.get("phase") == phase and record.get("iterations")]
+        if not counts:
+            # Runs without phase records: highest iteration of an agent call
+            counts = [call["iteration"] for call in self.calls
+                      if call.get("phase") == phase and call.get("iteration")]
+        return max(counts) if counts else None
+
+
+def parse_time(value: str) -> datetime:
+    """Parse an ISO date or date-time; naive values are local time."""
+    parsed = datetime.fromisoformat(value)
+    return parsed if parsed.tzinfo else parsed.astimezone()
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    """Return the nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def summarize(values: list[float]) -> dict:
+    """Return count, p50, p95, max and total of a list of durations."""
+    if not values:
+        return {"count": 0}
+    return {
+        "count": len(values),
+        "p50": round(percentile(values, 0.5), 3),
+        "p95": round(percentile(values, 0.95), 3),
+        "max": round(max(values), 3),
+        "total": round(sum(values), 3),
+    }
+
+
+def _read_jsonl(path: Path) -> list[dict]:
+    """Read a JSONL file, skipping lines that are not valid JSON."""
+    entries = []
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                continue
+    return entries
+
+
+def _log_span(path: Path) -> tuple[datetime | None, datetime | None]:
+    """Return the timestamps of the first and last record of a JSONL log file."""
+    try:
+        with open(path, "rb") as f:
+            first = f.readline()
+            f.seek(max(0, f.seek(0, os.SEEK_END) - 65536))
+            last = f.read().splitlines()[-1:]
+        times = [parse_time(json.loads(line)["ts"]) for line in [first, *last] if line.strip()]
+    except (OSError, ValueError, KeyError, TypeError):
+        return None, None
+    return (min(times), max(times)) if times else (None, None)
+
+
+def _extend_span(run: RunRecord, start: datetime | None, end: datetime | None) -> None:
+    """Widen the run's known time span."""
+    if start is not None and (run.started_at is None or start < run.started_at):
+        run.started_at = start
+    if end is not None and (run.ended_at is None or end > run.ended_at):
+        run.ended_at = end
+
+
+def load_run(run_folder: Path) -> RunRecord | None:
+    """
+    Read the phase records, agent calls and log span of a run folder.
+
+    Returns:
+        RunRecord, or None if the folder holds no ADW records
+    """
+    run = RunRecord(run_folder.name)
+    run.calls = read_index(run_folder / "transcripts")
+    phases_path = run_folder / PHASES_FILE_NAME
+    if phases_path.exists():
+        run.phases = _read_jsonl(phases_path)
+
+    for record in run.phases + run.calls:
+        try:
+            start = parse_time(record["started_at"])
+            end = start + timedelta(seconds=float(record.get("duration_s") or 0))
+        except (KeyError, TypeError, ValueError):
+            continue
+        _extend_span(run, start, end)
+    for log_file in run_folder.glob(f"{run.run_id}_adw_*.jsonl*"):
+        _extend_span(run, *_log_span(log_file))
+
+    if run.started_at is None:
+        return None
+    return run
+
+
+def load_runs(run_directory: Path) -> list[RunRecord]:
+    """Load all runs of a run directory, oldest first."""
+    if not run_directory.is_dir():
+        raise FileNotFoundError(f"Run directory not found: {run_directory}")
+    runs = [run for folder in run_directory.iterdir() if folder.is_dir()
+            if (run := load_run(folder)) is not None]
+    return sorted(runs, key=lambda run: run.started_at)
+
+
+def select_runs(
+    runs: list[RunRecord],
+    since: datetime | None = None,
+    until: datetime | None = None,
+    where: list[str] | None = None
+) -> list[RunRecord]:
+    """
+    Select runs by start time and by the agent calls they contain.
+
+    Args:
+        runs: Runs to select from
+        since: Keep runs started at or after this time
+        until: Keep runs started before this time
+        where: "key=value" conditions; a run matches if one of its agent
+               calls matches all of them (e.g. agent=claude, model=opus)
+
+    Raises:
+        ValueError: If a condition is not of the form key=value
+    """
+    conditions = []
+    for condition in where or []:
+        key, separator, value = condition.partition("=")
+        if not separator:
+            raise ValueError(f"Invalid condition '{condition}', expected key=value")
+        conditions.append((key.strip(), value.strip()))
+
+    def matches(run: RunRecord) -> bool:
+        if since and run.started_at < since:
+            return False
+        if until and run.started_at >= until:
+            return False
+        return not conditions or any(
+            all(str(call.get(key)) == value for key, value in conditions) for call in run.calls
+        )
+
+    return [run for run in runs if matches(run)]
+
+
+def build_report(runs: list[RunRecord], slowest: int = DEFAULT_SLOWEST_RUNS) -> dict:
+    """
+    Aggregate the statistics of a selection of runs.
+
+    Returns:
+        dict: Sections "phases", "command", "model", "agent", "iterations"
+              (each mapping a group to its summary), plus "runs" and "slowest_runs"
+    """
+    report: dict = {"runs": summarize([run.wall_s for run in runs if run.wall_s is not None])}
+
+    phases: dict[str, list[float]] = {}
+    for run in runs:
+        for record in run.phases:
+            phases.setdefault(record.get("phase") or "unknown", []).append(record["duration_s"])
+    report["phases"] = {phase: summarize(values) for phase, values in sorted(phases.items())}
+
+    for _, key in CALL_GROUPS:
+        groups: dict[str, list[float]] = {}
+        for run in runs:
+            for call in run.calls:
+                groups.setdefault(str(call.get(key)), []).append(call["duration_s"])
+        report[key] = {group: summarize(values) for group, values in sorted(groups.items())}
+
+    report["iterations"] = {}
+    for phase in LOOP_PHASES:
+        counts = [count for run in runs if (count := run.iterations(phase)) is not None]
+        if counts:
+            report["iterations"][phase] = summarize(counts)
+
+    ranked = sorted((run for run in runs if run.wall_s is not None), key=lambda run: -run.wall_s)
+    report["slowest_runs"] = [
+        {
+            "run_id": run.run_id,
+            "started_at": run.started_at.isoformat(),
+            "wall_s": round(run.wall_s, 3),
+            "calls": len(run.calls),
+            "failed_calls": sum(1 for call in run.calls if call.get("status") != "success"),
+        }
+        for run in ranked[:slowest]
+    ]
+    return report
+
+
+def _format_seconds(value: float | None) -> str:
+    if value is None:
+        return "-"
+    return f"{value / 60:.1f}m" if value >= 600 else f"{value:.1f}s"
+
+
+def _format_delta(current: float | None, baseline: float | None) -> str:
+    if current is None or not baseline:
+        return "-"
+    change = (current - baseline) / baseline * 100
+    color = "red" if change > 5 else "green" if change < -5 else "white"
+    return f"[{color}]{change:+.0f}%[/{color}]"
+
+
+def _print_section(title: str, rows: dict, baseline: dict | None, seconds: bool = True) -> None:
+    """Print one group of summaries as a table."""
+    # pylint: disable=import-outside-toplevel
+    from rich.table import Table
+
+    if not rows and not baseline:
+        return
+    table = Table(title=title, title_justify="left")
+    for column in ("", "count", "p50", "p95", "max"):
+        table.add_column(column, justify="left" if not column else "right")
+    if baseline is not None:
+        for column in ("base p50", "base p95", "Δ p50", "Δ p95"):
+            table.add_column(column, justify="right")
+
+    fmt = _format_seconds if seconds else (lambda value: "-" if value is None else f"{value:g}")
+    for group in sorted(set(rows) | set(baseline or {})):
+        current = rows.get(group, {})
+        cells = [group, str(current.get("count", 0)),
+                 fmt(current.get("p50")), fmt(current.get("p95")), fmt(current.get("max"))]
+        if baseline is not None:
+            base = baseline.get(group, {})
+            cells += [fmt(base.get("p50")), fmt(base.get("p95")),
+                      _format_delta(current.get("p50"), base.get("p50")),
+                      _format_delta(current.get("p95"), base.get("p95"))]
+        table.add_row(*cells)
+    console.print(table)
+
+
+def print_report(report: dict, baseline: dict | None = None) -> None:
+    """Print a report, compared against a baseline report if given."""
+    run_rows = {"all runs": report["runs"]} if report["runs"]["count"] else {}
+    base_rows = {"all runs": baseline["runs"]} if baseline and baseline["runs"]["count"] else {}
+    _print_section("Run wall time", run_rows, base_rows if baseline else None)
+    _print_section("Phase wall time", report["phases"], baseline["phases"] if baseline else None)
+    for title, key in CALL_GROUPS:
+        _print_section(f"{title} (agent call time)", report[key], baseline[key] if baseline else None)
+    _print_section(
+        "Loop iterations", report["iterations"],
+        baseline["iterations"] if baseline else None, seconds=False
+    )
+
+    if report["slowest_runs"]:
+        # pylint: disable=import-outside-toplevel
+        from rich.table import Table
+
+        table = Table(title="Slowest runs", title_justify="left")
+        for column in ("run", "started", "wall", "calls", "failed calls"):
+            table.add_column(column, justify="left" if column in ("run", "started") else "right")
+        for run in report["slowest_runs"]:
+            table.add_row(
+                run["run_id"], run["started_at"][:19], _format_seconds(run["wall_s"]),
+                str(run["calls"]), str(run["failed_calls"])
+            )
+        console.print(table)
+
+
+def main():
+    """Report performance statistics across runs."""
+    load_env()
+
+    parser = argparse.ArgumentParser(description="Report ADW performance statistics across runs")
+    parser.add_argument(
+        "--run_directory",
+        help="Folder holding the run folders (default: RUN_DIRECTORY)"
+    )
+    parser.add_argument("--since", type=parse_time, help="Only runs started at or after this ISO time")
+    parser.add_argument("--until", type=parse_time, help="Only runs started before this ISO time")
+    parser.add_argument(
+        "--where", action="append", metavar="KEY=VALUE",
+        help="Only runs with an agent call matching, e.g. agent=claude or model=opus (repeatable)"
+    )
+    parser.add_argument("--baseline_since", type=parse_time, help="Start of the baseline window")
+    parser.add_argument("--baseline_until", type=parse_time, help="End of the baseline window")
+    parser.add_argument(
+        "--baseline_where", action="append", metavar="KEY=VALUE",
+        help="Conditions of the baseline selection (repeatable)"
+    )
+    parser.add_argument(
+        "--slowest", type=int, default=DEFAULT_SLOWEST_RUNS,
+        help=f"Number of slowest runs to list (default: {DEFAULT_SLOWEST_RUNS})"
+    )
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    try:
+        run_directory = args.run_directory or os.getenv("RUN_DIRECTORY")
+        if not run_directory:
+            raise ValueError("Pass --run_directory or set RUN_DIRECTORY")
+        runs = load_runs(Path(run_directory))
+        report = build_report(select_runs(runs, args.since, args.until, args.where), args.slowest)
+        baseline = None
+        if args.baseline_since or args.baseline_until or args.baseline_where:
+            baseline = build_report(
+                select_runs(runs, args.baseline_since, args.baseline_until, args.baseline_where),
+                args.slowest
+            )
+    except (FileNotFoundError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.json:
+        print(json.dumps({"report": report, "baseline": baseline}, indent=2))
+        return
+    console.print(
+        f"[cyan]{report['runs']['count']} run(s)[/cyan]"
+        + (f" compared against [cyan]{baseline['runs']['count']} baseline run(s)[/cyan]"
+           if baseline else "")
+    )
+    print_report(report, baseline)
+
+
+if __name__ == "__main__":
+    main()
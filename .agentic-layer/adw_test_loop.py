@@ -18,15 +18,29 @@ import logging
 from pathlib import Path
 
 from console import console
-from run_tests import run_tests
+from run_tests import RunTestsResult, run_tests
 from get_failing_test_suites import get_failing_test_suites
 from resolve_test import resolve_test
 from agent_types import AgentType
 from arg_utils import add_agent_argument, parse_agent_type
+from env_loader import load_env
+from event_bus import EventType, emit
+from phase_timing import timed_phase
+from run_budget import limit_iterations
+from run_context import set_iteration
+from convergence_tracker import ConvergenceDecision, ConvergenceTracker, failing_test_ids
+from git_snapshot import restore_snapshot, snapshot_worktree
+from report_archive import archive_test_results
+from flaky_tests import FlakyTestDetector
+from result_history import record_test_reports
+from sharded_tests import maxfail_count, shard_count
+from claude_options import ESCALATION_MODEL
+
+DEFAULT_MAX_ITERATIONS = 10
 
 
 async def _resolve_failing_test_cases(
-    failing_suites: list, spec_file_path: str, agent_type: AgentType
+    failing_suites: list, spec_file_path: str, agent_type: AgentType, model: str = "sonnet"
 ):
     """Resolve all failing test cases from the failing test suites."""
     logger = logging.getLogger(__name__)
@@ -40,7 +54,9 @@ async def _resolve_failing_test_cases(
             console.print(f"    Resolving test case: [yellow]{test_case.name}[/yellow]")
             logger.info("Resolving test case: %s", test_case.name)
             try:
-                test_success = await resolve_test(test_case, spec_file_path, agent_type)
+                test_success = await resolve_test(
+                    test_case, spec_file_path, agent_type, model=model
+                )
                 if not test_success:
                     console.print(
                         f"    [yellow]⚠[/yellow] Warning: Resolution may not have "
@@ -58,25 +74,126 @@ async def _resolve_failing_test_cases(
                 raise
 
 
+def _archive_test_results(
+    test_path_obj: Path, iteration: int, outcome: str, keep_reports: bool = False
+) -> None:
+    """
+    Archive the XML test result files of the current iteration.
+
+    Unless keep_reports is set, the files are removed from the test folder so
+    the next iteration starts clean. If archiving fails they are deleted anyway.
+    """
+    logger = logging.getLogger(__name__)
+    try:
+        entry = archive_test_results(test_path_obj, iteration, outcome, keep_reports)
+    except OSError as e:
+        logger.warning("Could not archive test results of iteration %s: %s", iteration, e)
+        entry = None
+        if not keep_reports:
+            for xml_file in test_path_obj.glob("*.xml"):
+                xml_file.unlink()
+    if entry is not None:
+        console.print(f"  Archived {len(entry['files'])} XML file(s) to {entry['archive']}")
+
+
+def _take_snapshot() -> str | None:
+    """Snapshot the working tree, or return None if git is unavailable."""
+    try:
+        return snapshot_worktree()
+    except RuntimeError as e:
+        logging.getLogger(__name__).warning("Could not snapshot working tree: %s", e)
+        return None
+
+
+async def _run_and_screen_tests(
+    test_path_obj: Path,
+    agent_type: AgentType,
+    test_shards: int | None,
+    maxfail: int,
+    flaky_detector: FlakyTestDetector
+) -> tuple[RunTestsResult, list]:
+    """Run the tests and return the run result and the failing suites that are not flaky."""
+    logger = logging.getLogger(__name__)
+    try:
+        run_result = await run_tests(str(test_path_obj), agent_type, test_shards, maxfail)
+        if not run_result.completed:
+            console.print(
+                "[yellow]⚠[/yellow] Warning: Test run may not have completed successfully"
+            )
+            logger.warning("Test run may not have completed successfully")
+    except Exception as e:
+        logger.error("Test run failed: %s", e, exc_info=True)
+        raise
+    record_test_reports(test_path_obj)
+
+    # Check for failing tests
+    console.print("\n[blue][2/4][/blue] Checking for failures...")
+    logger.debug("Checking for failing test suites")
+    failing_suites = get_failing_test_suites(str(test_path_obj))
+    if failing_suites:
+        # Nondeterministic failures are not for the agent to fix
+        failing_suites, flaky = await flaky_detector.screen(failing_suites)
+        if flaky:
+            console.print(
+                f"  [yellow]⚠[/yellow] Quarantined {len(flaky)} flaky test(s) that "
+                "passed on a local re-run:"
+            )
+            for test_id in sorted(flaky):
+                console.print(f"    [dim]{test_id}[/dim]")
+            logger.warning("Quarantined flaky tests: %s", ", ".join(sorted(flaky)))
+    return run_result, failing_suites
+
+
+@timed_phase("test")
 async def adw_test_loop(
     test_result_folder: str,
     spec_file_path: str,
-    agent_type: AgentType = AgentType.CLAUDE
+    agent_type: AgentType = AgentType.CLAUDE,
+    max_iterations: int = DEFAULT_MAX_ITERATIONS,
+    stall_limit: int = 2,
+    rollback_on_regression: bool = False,
+    test_shards: int | None = None,
+    test_maxfail: int | None = None
 ) -> bool:
+    # pylint: disable=too-many-locals,too-many-statements,too-many-branches
     """
     Run tests and resolve failures in a loop until all tests pass.
 
+    The set of failing tests is tracked per iteration. When it stops shrinking
+    for stall_limit iterations or grows, the resolution model is escalated
+    once; if the loop still does not converge it stops early. With
+    rollback_on_regression, an iteration that makes more tests fail restores
+    the working tree of the best iteration so far.
+
+    Newly failing tests are re-run locally first (ADW_FLAKY_RERUNS). Tests
+    that pass on a re-run are flaky: they are quarantined for the rest of the
+    run and never handed to the agent. If a local run stopped at maxfail and
+    all its failures were flaky, the whole suite is run again before the loop
+    reports success. A run whose only failures are quarantined tests ends
+    with a warning and the "passed_with_quarantine" outcome instead of a
+    plain pass.
+
     Args:
         test_result_folder: Path to directory for test result XML files
         spec_file_path: Path to the specification file
+        agent_type: Type of coding agent to use (default: CLAUDE)
+        max_iterations: Maximum number of test-and-fix iterations
+        stall_limit: Iterations without fewer failing tests before escalating/stopping
+        rollback_on_regression: Restore the best working tree when failures grow
+        test_shards: Run the tests locally in this many pytest processes
+                     (default: ADW_TEST_SHARDS; 0 lets the agent run them)
+        test_maxfail: Stop local test runs after this many failures and start
+                      resolving (default: ADW_TEST_MAXFAIL; 0 runs the whole suite)
 
     Returns:
-        bool: True if all tests passed, False if max iterations reached
+        bool: True if all tests passed (quarantined flaky tests aside), False if max iterations reached or the
+              loop stopped converging
     """
     logger = logging.getLogger(__name__)
     logger.info("Starting test loop - test results: %s, spec: %s",
                 test_result_folder, spec_file_path)
 
+
     test_path_obj = Path(test_result_folder)
     if not test_path_obj.exists():
         error_msg = f"Test results path does not exist: {test_result_folder}"
@@ -84,37 +201,120 @@ async def adw_test_loop(
         raise FileNotFoundError(error_msg)
 
     iteration = 0
-    max_iterations = 10  # Prevent infinite loops
+    tracker = ConvergenceTracker(stall_limit)
+    model = "sonnet"
+    best_tree = None
+    flaky_detector = FlakyTestDetector()
+    # Only local test runs stop early
+    maxfail = maxfail_count(test_maxfail) if shard_count(test_shards) else 0
 
     while iteration < max_iterations:
+        # A nearly used-up run budget leaves room for one more iteration only
+        max_iterations = limit_iterations(iteration, max_iterations)
         iteration += 1
         console.rule(f"[cyan]Test Loop Iteration {iteration}[/cyan]")
         logger.info("Test loop iteration %s starting", iteration)
+        set_iteration(iteration)
+        emit(EventType.ITERATION_STARTED)
 
         # Run tests
         console.print("\n[blue][1/4][/blue] Running tests...")
         logger.info("Running tests...")
-        try:
-            success = await run_tests(test_result_folder, agent_type)
-            if not success:
-                console.print(
-                    "[yellow]⚠[/yellow] Warning: Test run may not have completed successfully"
-                )
-                logger.warning("Test run may not have completed successfully")
-        except Exception as e:
-            logger.error("Test run failed: %s", e, exc_info=True)
-            raise
+        run_result, failing_suites = await _run_and_screen_tests(
+            test_path_obj, agent_type, test_shards, maxfail, flaky_detector
+        )
+        if not failing_suites and run_result.stopped_early:
+            # Only flaky tests failed, and they stopped the rest of the suite from running
+            console.print(
+                "  [yellow]⚠[/yellow] Run stopped early on flaky failures. "
+                "Re-running the whole suite..."
+            )
+            logger.info("Run stopped at maxfail on flaky tests only - re-running without maxfail")
+            _archive_test_results(test_path_obj, iteration, "stopped_early")
+            run_result, failing_suites = await _run_and_screen_tests(
+                test_path_obj, agent_type, test_shards, 0, flaky_detector
+            )
+        emit(
+            EventType.TEST_RESULTS,
+            failing_suites=len(failing_suites),
+            failing_tests=sum(len(list(suite)) for suite in failing_suites),
+            quarantined=len(flaky_detector.quarantined)
+        )
 
-        # Check for failing tests
-        console.print("\n[blue][2/4][/blue] Checking for failures...")
-        logger.debug("Checking for failing test suites")
-        failing_suites = get_failing_test_suites(test_result_folder)
+        if not failing_suites and flaky_detector.quarantined:
+            warning_msg = (
+                f"No failing tests besides {len(flaky_detector.quarantined)} quarantined "
+                "flaky test(s). Exiting loop."
+            )
+            console.print(f"\n[yellow]⚠[/yellow] {warning_msg}")
+            logger.warning(
+                "%s Quarantined: %s", warning_msg, ", ".join(sorted(flaky_detector.quarantined))
+            )
+            _archive_test_results(
+                test_path_obj, iteration, "passed_with_quarantine", keep_reports=True
+            )
+            return True
 
         if not failing_suites:
             console.print("\n[green]✓[/green] All tests passed! Exiting loop.")
             logger.info("All tests passed - test loop complete")
+            _archive_test_results(test_path_obj, iteration, "passed", keep_reports=True)
             return True
 
+        # Track convergence of the failing test set
+        failing_ids = failing_test_ids(failing_suites)
+        if run_result.stopped_early:
+            # A run stopped at maxfail shows only part of the failing set
+            decision = ConvergenceDecision.NO_PROGRESS
+            logger.info("Convergence not tracked: test run stopped after %s failure(s)", maxfail)
+        else:
+            decision = tracker.record(failing_ids)
+            logger.info(
+                "Convergence: %s (best: %s failing at iteration %s)",
+                decision.value, tracker.best_count, tracker.best_iteration
+            )
+        if decision == ConvergenceDecision.PROGRESS and rollback_on_regression:
+            best_tree = _take_snapshot()
+
+        rolled_back = False
+        if decision == ConvergenceDecision.REGRESSED and rollback_on_regression and best_tree:
+            console.print(
+                f"\n[yellow]⚠[/yellow] More tests fail than before. Rolling back to the "
+                f"working tree of iteration {tracker.best_iteration}."
+            )
+            logger.warning("Failing set grew - rolling back to iteration %s", tracker.best_iteration)
+            try:
+                restore_snapshot(best_tree)
+            except RuntimeError as e:
+                logger.error("Rollback failed: %s", e, exc_info=True)
+                raise
+            rolled_back = True
+
+        if decision in (ConvergenceDecision.STALLED, ConvergenceDecision.REGRESSED):
+            if model != ESCALATION_MODEL:
+                model = ESCALATION_MODEL
+                tracker.reset_stall()
+                console.print(
+                    f"\n[yellow]⚠[/yellow] Failing tests are not decreasing. "
+                    f"Escalating to model: {model}"
+                )
+                logger.warning("Test loop not converging - escalating to %s", model)
+            elif decision == ConvergenceDecision.STALLED:
+                warning_msg = (
+                    f"Test loop not converging: still {len(tracker.history[-1])} failing "
+                    f"test(s) after {iteration} iterations. Stopping early."
+                )
+                console.print(f"\n[yellow]⚠[/yellow] {warning_msg}")
+                logger.warning(warning_msg)
+                _archive_test_results(test_path_obj, iteration, "stopped", keep_reports=True)
+                return False
+
+        if rolled_back:
+            # The failures above belong to the discarded tree - re-run the tests
+            console.print("\n[blue][4/4][/blue] Archiving test results...")
+            _archive_test_results(test_path_obj, iteration, "rolled_back")
+            continue
+
         # Count total failing test cases
         total_failing_tests = sum(len(list(suite)) for suite in failing_suites)
         console.print(
@@ -127,16 +327,12 @@ async def adw_test_loop(
             logger.debug("Failing suite: %s with %s test(s)", suite.name, len(list(suite)))
 
         # Resolve each failing test case individually
-        await _resolve_failing_test_cases(failing_suites, spec_file_path, agent_type)
+        await _resolve_failing_test_cases(failing_suites, spec_file_path, agent_type, model)
 
-        # Clean up XML files for next iteration
-        console.print("\n[blue][4/4][/blue] Cleaning up test results...")
-        logger.debug("Cleaning up XML test result files")
-        xml_files = list(test_path_obj.glob("*.xml"))
-        for xml_file in xml_files:
-            xml_file.unlink()
-        console.print(f"  Deleted {len(xml_files)} XML file(s)")
-        logger.debug("Deleted %s XML files", len(xml_files))
+        # Archive the XML files so the next iteration starts clean
+        console.print("\n[blue][4/4][/blue] Archiving test results...")
+        logger.debug("Archiving XML test result files")
+        _archive_test_results(test_path_obj, iteration, "resolved")
 
         logger.info("Test loop iteration %s complete", iteration)
 
@@ -152,6 +348,8 @@ async def adw_test_loop(
 
 async def main():
     """Main orchestration function for the ADW test loop flow."""
+    load_env()
+
     # Parse command line arguments
     parser = argparse.ArgumentParser(
         description="Run tests and resolve failures in a loop until all tests pass"
@@ -162,13 +360,47 @@ async def main():
         help="Path to directory for test result XML files"
     )
     parser.add_argument("--spec", required=True, help="Path to the specification file")
+    parser.add_argument(
+        "--max_iterations",
+        type=int,
+        default=DEFAULT_MAX_ITERATIONS,
+        help=f"Maximum number of test-and-fix iterations (default: {DEFAULT_MAX_ITERATIONS})"
+    )
+    parser.add_argument(
+        "--stall_limit",
+        type=int,
+        default=2,
+        help="Iterations without fewer failing tests before escalating or stopping (default: 2)"
+    )
+    parser.add_argument(
+        "--rollback_on_regression",
+        action="store_true",
+        help="Restore the best working tree when an iteration makes more tests fail"
+    )
+    parser.add_argument(
+        "--test_shards",
+        type=int,
+        help="Run the tests locally in this many pytest processes (default: ADW_TEST_SHARDS)"
+    )
+    parser.add_argument(
+        "--test_maxfail",
+        type=int,
+        help="Stop local test runs after this many failures (default: ADW_TEST_MAXFAIL)"
+    )
     add_agent_argument(parser)
 
     args = parser.parse_args()
 
     try:
         agent_type = parse_agent_type(args)
-        success = await adw_test_loop(args.path, args.spec, agent_type)
+        success = await adw_test_loop(
+            args.path, args.spec, agent_type,
+            max_iterations=args.max_iterations,
+            stall_limit=args.stall_limit,
+            rollback_on_regression=args.rollback_on_regression,
+            test_shards=args.test_shards,
+            test_maxfail=args.test_maxfail
+        )
         if not success:
             sys.exit(1)
     except (FileNotFoundError, ValueError, RuntimeError) as e:
@@ -0,0 +1,176 @@
+"""Registry of coding agent backends.
+
+A backend turns an agent request (slash command, arguments, model) into a
+coroutine that runs the agent and streams its messages into the call's
+transcript. Backends declare capabilities, so callers only pay for features
+a backend can use, e.g. the repository map is only built for backends that
+read it.
+
+Built-in backends (claude, copilot, local) are registered by coding_agent.
+Third-party packages add backends through the ``adw.agent_backends`` entry
+point group. An entry point names an ``AgentBackend`` or a callable that
+returns one:
+
+    [project.entry-points."adw.agent_backends"]
+    my_backend = "my_package.adw_backend:BACKEND"
+
+ADW_COMMAND_BACKENDS routes single commands to another backend, e.g.
+``classify=local,branch_name=local`` runs cheap steps on a local model.
+Commands that run tests or linters are refused on backends without the
+``shell`` capability.
+"""
+
+import logging
+import os
+from dataclasses import dataclass, field
+from importlib.metadata import entry_points
+from pathlib import Path
+from typing import Awaitable, Callable
+
+ENTRY_POINT_GROUP = "adw.agent_backends"
+
+# Backend can run shell commands (tests, linters)
+CAPABILITY_SHELL = "shell"
+# Backend reads the repository map (see repo_map)
+CAPABILITY_REPO_MAP = "repo_map"
+# Backend supports formatting files after every edit
+CAPABILITY_LINT_ON_WRITE = "lint_on_write"
+
+# Commands that run tests or linters through the shell
+SHELL_COMMANDS = frozenset({"test", "resolve_failed_test", "lint"})
+
+
+@dataclass(frozen=True)
+class AgentRequest:
+    """A single coding agent call, independent of the backend running it."""
+    slash_command: str
+    arguments: list[str]
+    model: str = "sonnet"
+    cwd: str | None = None
+    lint_on_write: bool = False
+    repo_map_path: Path | None = None
+
+
+@dataclass(frozen=True)
+class AgentBackend:
+    """A coding agent backend and the capabilities it supports."""
+    name: str
+    # Builds the call that runs the agent, given the transcript to stream into
+    prepare: Callable[[AgentRequest], Callable[..., Awaitable[None]]]
+    capabilities: frozenset[str] = field(default_factory=frozenset)
+    description: str = ""
+
+
+_backends: dict[str, AgentBackend] = {}
+_entry_points_loaded = False
+
+
+def register_backend(backend: AgentBackend, replace: bool = False) -> None:
+    """
+    Register a backend under its name.
+
+    Args:
+        backend: Backend to register
+        replace: Replace an existing backend of the same name
+
+    Raises:
+        ValueError: If a backend of that name exists and replace is False
+    """
+    name = backend.name.lower()
+    if name in _backends and not replace and _backends[name] is not backend:
+        raise ValueError(f"Agent backend '{name}' is already registered")
+    _backends[name] = backend
+
+
+def _load_entry_point_backends() -> None:
+    """Register the backends of installed packages, once."""
+    # pylint: disable=global-statement
+    global _entry_points_loaded
+    if _entry_points_loaded:
+        return
+    _entry_points_loaded = True
+    logger = logging.getLogger(__name__)
+    for entry_point in entry_points(group=ENTRY_POINT_GROUP):
+        try:
+            backend = entry_point.load()
+            if not isinstance(backend, AgentBackend):
+                backend = backend()
+            if not isinstance(backend, AgentBackend):
+                raise TypeError(f"expected an AgentBackend, got {type(backend).__name__}")
+            if backend.name.lower() in _backends:
+                logger.warning("Ignoring agent backend '%s' from %s: name already registered",
+                               backend.name, entry_point.value)
+                continue
+            register_backend(backend)
+            logger.debug("Registered agent backend '%s' from %s", backend.name, entry_point.value)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            # A broken plugin must not break the built-in backends
+            logger.warning("Failed to load agent backend %s: %s", entry_point.name, e)
+
+
+def backend_names() -> list[str]:
+    """Return the names of all registered backends, including entry points."""
+    _load_entry_point_backends()
+    return sorted(_backends)
+
+
+def get_backend(name: str) -> AgentBackend:
+    """
+    Return the backend registered under a name.
+
+    Args:
+        name: Backend name, case-insensitive
+
+    Raises:
+        ValueError: If no backend of that name is registered
+    """
+    _load_entry_point_backends()
+    backend = _backends.get(name.lower())
+    if backend is None:
+        choices = ", ".join(f"'{choice}'" for choice in sorted(_backends))
+        raise ValueError(f"Unknown agent backend: {name}. Registered backends: {choices}")
+    return backend
+
+
+def required_capabilities(slash_command: str) -> frozenset[str]:
+    """Return the capabilities a backend needs to run a command."""
+    if slash_command in SHELL_COMMANDS:
+        return frozenset({CAPABILITY_SHELL})
+    return frozenset()
+
+
+def check_backend_supports(backend: AgentBackend, slash_command: str) -> None:
+    """
+    Check that a backend has the capabilities a command needs.
+
+    Args:
+        backend: Backend the command is routed to
+        slash_command: Command name without slash
+
+    Raises:
+        ValueError: If the backend lacks a required capability
+    """
+    missing = required_capabilities(slash_command) - backend.capabilities
+    if missing:
+        raise ValueError(
+            f"Agent backend '{backend.name}' cannot run /{slash_command}: "
+            f"missing capability {', '.join(sorted(missing))}"
+        )
+
+
+def command_backend(slash_command: str) -> str | None:
+    """
+    Return the backend ADW_COMMAND_BACKENDS routes a command to, if any.
+
+    Args:
+        slash_command: Command name without slash
+
+    Returns:
+        str | None: Backend name, or None to use the workflow's agent
+    """
+    routes = os.getenv("ADW_COMMAND_BACKENDS", "")
+    for route in routes.split(","):
+        command, separator, backend = route.partition("=")
+        if separator and command.strip() == slash_command and backend.strip():
+            return backend.strip().lower()
+    return None
@@ -0,0 +1,331 @@
+"""Record and replay of coding agent calls.
+
+In record mode every agent call runs against a real agent (ADW_RECORD_AGENT,
+default claude), and the following are stored in ADW_RECORDING_DIR:
+    * the call's inputs
+    * the streamed messages
+    * the repository diff the call produced
+    * the files it wrote into the run folder
+
+Recording serializes agent calls so that file-system effects can be
+attributed to the call that caused them.
+
+In replay mode no agent runs. Each call is matched to an unused recorded call
+with the same command and normalized arguments; a call without such a match
+fails the replay. With ADW_REPLAY_LOOSE_MATCH=on, it falls back to the next
+unused recorded call of the same command instead. The matched call's
+messages, repository diff and run-folder files are re-applied, and the error
+of a call that failed while recording is raised again. Run-specific
+values (run folder, run ID) are normalized so that a replay under a new run
+ID still matches.
+"""
+
+import asyncio
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Awaitable, Callable
+
+from agent_types import AgentType
+from git_snapshot import apply_diff, diff_snapshots, snapshot_worktree
+from get_or_create_folders import get_or_create_run_folder
+from run_context import get_run_id
+from transcript_store import message_to_jsonable
+
+# Run-folder entries managed by ADW itself rather than by agents
+_IGNORED_RUN_ENTRIES = ("transcripts", "repo_map", "args", "phases.jsonl")
+
+_record_lock: asyncio.Lock | None = None
+_replay_cursors: dict[Path, set[int]] = {}
+
+
+class _MessageSink:
+    """Collects agent messages while forwarding them to the call's transcript."""
+
+    def __init__(self, transcript):
+        self.transcript = transcript
+        self.messages: list = []
+
+    def write(self, message) -> None:
+        """Store a message and forward it."""
+        self.messages.append(message)
+        if self.transcript is not None:
+            self.transcript.write(message)
+
+
+def recording_dir() -> Path:
+    """
+    Return the recording directory from ADW_RECORDING_DIR.
+
+    Raises:
+        ValueError: If ADW_RECORDING_DIR is not set
+    """
+    value = os.getenv("ADW_RECORDING_DIR")
+    if not value:
+        raise ValueError("ADW_RECORDING_DIR must be set to record or replay agent calls")
+    return Path(value)
+
+
+def recorded_agent_type() -> AgentType:
+    """Return the real agent backend used while recording (ADW_RECORD_AGENT, default claude)."""
+    agent_type = AgentType.from_string(os.getenv("ADW_RECORD_AGENT", "claude"))
+    if agent_type in (AgentType.RECORD, AgentType.REPLAY):
+        raise ValueError("ADW_RECORD_AGENT must name a real agent backend")
+    return agent_type
+
+
+def _run_folder() -> Path | None:
+    """Return the current run folder, if a run is active."""
+    run_id = get_run_id()
+    return get_or_create_run_folder(run_id) if run_id else None
+
+
+def normalize_argument(argument: str) -> str:
+    """Replace run-specific paths and the run ID with placeholders."""
+    text = str(argument)
+    run_id = get_run_id()
+    run_folder = _run_folder()
+    if run_folder is not None:
+        for form in {str(run_folder.resolve()), str(run_folder), run_folder.as_posix()}:
+            text = text.replace(form, "{run}")
+    if run_id:
+        text = text.replace(run_id, "{run_id}")
+    return text
+
+
+def _run_folder_state(run_folder: Path | None) -> dict[str, tuple[int, int]]:
+    """Return (size, mtime) of every agent-visible file in the run folder."""
+    if run_folder is None or not run_folder.exists():
+        return {}
+    state = {}
+    for path in run_folder.rglob("*"):
+        relative = path.relative_to(run_folder)
+        if not path.is_file() or relative.parts[0] in _IGNORED_RUN_ENTRIES:
+            continue
+        if path.name.endswith(".jsonl") and "_adw_" in path.name:
+            continue  # run log files
+        stat = path.stat()
+        state[relative.as_posix()] = (stat.st_size, stat.st_mtime_ns)
+    return state
+
+
+def _take_snapshot(cwd: str | None) -> str | None:
+    """Snapshot the working tree, or None outside a git repository."""
+    try:
+        return snapshot_worktree(cwd)
+    except RuntimeError:
+        return None
+
+
+def _write_recording(
+    folder: Path,
+    slash_command: str,
+    arguments: list[str],
+    model: str,
+    messages: list,
+    effects: tuple[str | None, str | None, dict, dict, Path | None],
+    cwd: str | None,
+    error: Exception | None
+) -> None:
+    """Store a finished call's messages and effects and add it to the call index."""
+    before_tree, after_tree, before_files, after_files, run_folder = effects
+    index_path = folder / "calls.jsonl"
+    folder.mkdir(parents=True, exist_ok=True)
+    sequence = len(index_path.read_text(encoding="utf-8").splitlines()) if index_path.exists() else 0
+    call_folder = folder / "calls" / f"{sequence:05d}"
+    call_folder.mkdir(parents=True, exist_ok=True)
+
+    with (call_folder / "messages.jsonl").open("w", encoding="utf-8") as f:
+        for message in messages:
+            f.write(json.dumps(message_to_jsonable(message), ensure_ascii=False, default=str) + "\n")
+
+    if before_tree and after_tree and before_tree != after_tree:
+        (call_folder / "repo.diff").write_text(
+            diff_snapshots(before_tree, after_tree, cwd), encoding="utf-8"
+        )
+
+    changed = sorted(path for path, state in after_files.items() if before_files.get(path) != state)
+    artifacts = []
+    for relative in changed:
+        # File names such as spec_<run_id>.md must map onto the replay's run
+        stored = normalize_argument(relative)
+        target = call_folder / "artifacts" / stored
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes((run_folder / relative).read_bytes())
+        artifacts.append(stored)
+
+    entry = {
+        "sequence": sequence,
+        "command": slash_command,
+        "arguments": [normalize_argument(arg) for arg in arguments],
+        "model": model,
+        "messages": len(messages),
+        "artifacts": artifacts,
+    }
+    if error is not None:
+        entry["error"] = {"type": type(error).__name__, "message": str(error)}
+    with index_path.open("a", encoding="utf-8") as f:
+        f.write(json.dumps(entry) + "\n")
+    logging.getLogger(__name__).info(
+        "Recorded %s agent call %s (%s) with %s artifact(s)",
+        "failed" if error is not None else "successful", sequence, slash_command, len(artifacts)
+    )
+
+
+async def record_call(
+    execute: Callable[[_MessageSink], Awaitable[None]],
+    slash_command: str,
+    arguments: list[str],
+    model: str,
+    transcript,
+    cwd: str | None = None
+) -> None:
+    """
+    Run an agent call and record its inputs, messages and effects.
+
+    A call that fails is recorded too, with its error and whatever partial
+    effects it had, so that a replay fails at the same point.
+
+    Args:
+        execute: Runs the real agent, writing messages to the given sink
+        slash_command: Command name
+        arguments: Command arguments before sanitizing
+        model: Model name
+        transcript: Transcript of the call (may be None)
+        cwd: Working directory of the agent
+
+    Raises:
+        ValueError: If ADW_RECORDING_DIR is not set
+    """
+    # pylint: disable=global-statement
+    global _record_lock
+    folder = recording_dir()
+    if _record_lock is None:
+        _record_lock = asyncio.Lock()
+
+    async with _record_lock:
+        run_folder = _run_folder()
+        before_tree = _take_snapshot(cwd)
+        before_files = _run_folder_state(run_folder)
+        sink = _MessageSink(transcript)
+        error = None
+        try:
+            await execute(sink)
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            effects = (
+                before_tree, _take_snapshot(cwd), before_files, _run_folder_state(run_folder),
+                run_folder
+            )
+            _write_recording(
+                folder, slash_command, arguments, model, sink.messages, effects, cwd, error
+            )
+
+
+def _load_calls(folder: Path) -> list[dict]:
+    """Read the recorded call index."""
+    index_path = folder / "calls.jsonl"
+    if not index_path.exists():
+        raise FileNotFoundError(f"No recording found at {index_path}")
+    return [json.loads(line) for line in index_path.read_text(encoding="utf-8").splitlines() if line]
+
+
+def loose_match_enabled() -> bool:
+    """Return whether replay may use calls with other arguments (ADW_REPLAY_LOOSE_MATCH)."""
+    return os.getenv("ADW_REPLAY_LOOSE_MATCH", "off").strip().lower() in ("1", "on", "true", "yes")
+
+
+def _match_call(
+    calls: list[dict], used: set[int], slash_command: str, arguments: list[str],
+    loose: bool = False
+) -> dict:
+    """
+    Pick the recorded call matching a command and its normalized arguments.
+
+    Args:
+        calls: Recorded calls
+        used: Sequence numbers of calls already replayed
+        slash_command: Command name
+        arguments: Normalized command arguments
+        loose: Fall back to the next unused call of the same command
+
+    Raises:
+        RuntimeError: If no unused recorded call matches
+    """
+    candidates = [call for call in calls if call["command"] == slash_command and call["sequence"] not in used]
+    for call in candidates:
+        if call["arguments"] == arguments:
+            return call
+    if candidates and loose:
+        logging.getLogger(__name__).warning(
+            "No exact recording for %s %s - using next recorded %s call",
+            slash_command, arguments, slash_command
+        )
+        return candidates[0]
+    if candidates:
+        raise RuntimeError(
+            f"No recorded call of '{slash_command}' has the arguments {arguments} "
+            "(set ADW_REPLAY_LOOSE_MATCH=on to replay the next recorded call anyway)"
+        )
+    raise RuntimeError(f"No recorded call left for command '{slash_command}'")
+
+
+async def replay_call(
+    slash_command: str, arguments: list[str], transcript, cwd: str | None = None
+) -> None:
+    """
+    Re-apply a recorded agent call instead of running an agent.
+
+    Args:
+        slash_command: Command name
+        arguments: Command arguments before sanitizing
+        transcript: Transcript of the call (may be None)
+        cwd: Working directory of the agent
+
+    Raises:
+        ValueError: If ADW_RECORDING_DIR is not set
+        FileNotFoundError: If the recording does not exist
+        RuntimeError: If no recorded call matches or its diff does not apply, or
+                      with the recorded error of a call that failed
+    """
+    folder = recording_dir().resolve()
+    calls = _load_calls(folder)
+    used = _replay_cursors.setdefault(folder, set())
+    call = _match_call(
+        calls, used, slash_command, [normalize_argument(arg) for arg in arguments],
+        loose=loose_match_enabled()
+    )
+    used.add(call["sequence"])
+    call_folder = folder / "calls" / f"{call['sequence']:05d}"
+
+    messages_path = call_folder / "messages.jsonl"
+    if transcript is not None and messages_path.exists():
+        for line in messages_path.read_text(encoding="utf-8").splitlines():
+            transcript.write(json.loads(line))
+
+    diff_path = call_folder / "repo.diff"
+    if diff_path.exists() and not apply_diff(diff_path.read_text(encoding="utf-8"), cwd):
+        raise RuntimeError(
+            f"Recorded changes of call {call['sequence']} ({slash_command}) do not apply"
+        )
+
+    run_folder = _run_folder()
+    if call["artifacts"] and run_folder is None:
+        raise RuntimeError("Replaying run-folder artifacts requires an active run")
+    for stored in call["artifacts"]:
+        target = run_folder / stored.replace("{run_id}", get_run_id())
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes((call_folder / "artifacts" / stored).read_bytes())
+
+    logging.getLogger(__name__).info(
+        "Replayed agent call %s (%s)", call["sequence"], slash_command
+    )
+    error = call.get("error")
+    if error is not None:
+        message = error["message"]
+        if error["type"] != "RuntimeError":
+            message = f"{error['type']}: {message}"
+        raise RuntimeError(message)
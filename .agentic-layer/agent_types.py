@@ -4,16 +4,52 @@ from enum import Enum
 
 
 class AgentType(Enum):
-    """Enumeration for coding agent types."""
+    """Enumeration for coding agent types.
+
+    Besides the built-in members, every backend registered through an entry
+    point (see agent_backends) is available as a member named after it.
+    """
     CLAUDE = "claude"
     COPILOT = "copilot"
+    # Local OpenAI-compatible inference server (see local_agent)
+    LOCAL = "local"
+    # Runs a real agent and records its calls (see agent_recorder)
+    RECORD = "record"
+    # Re-applies recorded calls without running an agent
+    REPLAY = "replay"
+
+    @classmethod
+    def _missing_(cls, value):
+        """Create a member for a backend registered through an entry point."""
+        # pylint: disable=import-outside-toplevel
+        from agent_backends import backend_names
+
+        if not isinstance(value, str) or value.lower() not in backend_names():
+            return None
+        name = value.lower()
+        if name not in cls._value2member_map_:
+            member = object.__new__(cls)
+            member._name_ = name.upper()
+            member._value_ = name
+            cls._value2member_map_[name] = member
+        return cls._value2member_map_[name]
+
+    @classmethod
+    def choices(cls) -> list[str]:
+        """Return all agent type names, including entry-point backends."""
+        # pylint: disable=import-outside-toplevel
+        from agent_backends import backend_names
+
+        return list(dict.fromkeys([member.value for member in cls] + backend_names()))
 
     @classmethod
     def from_string(cls, value: str) -> "AgentType":
         """Convert string to AgentType enum, case-insensitive.
 
         Args:
-            value: String representation of agent type ("claude" or "copilot")
+            value: String representation of agent type
+                   ("claude", "copilot", "local", "record", "replay"
+                   or the name of an entry-point backend)
 
         Returns:
             AgentType: The corresponding enum value
@@ -21,9 +57,8 @@ class AgentType(Enum):
         Raises:
             ValueError: If value is not a valid agent type
         """
-        value_lower = value.lower()
-        if value_lower == "claude":
-            return cls.CLAUDE
-        if value_lower == "copilot":
-            return cls.COPILOT
-        raise ValueError(f"Invalid agent type: {value}. Must be 'claude' or 'copilot'")
+        try:
+            return cls(value.lower())
+        except ValueError:
+            choices = ", ".join(f"'{choice}'" for choice in cls.choices())
+            raise ValueError(f"Invalid agent type: {value}. Must be one of {choices}") from None
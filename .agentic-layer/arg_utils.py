@@ -12,9 +12,11 @@ def add_agent_argument(parser: argparse.ArgumentParser) -> None:
     """
     parser.add_argument(
         "--agent",
-        choices=["claude", "copilot"],
+        choices=AgentType.choices(),
         default="claude",
-        help="Coding agent to use (default: claude)"
+        help="Coding agent to use (default: claude); 'local' uses a local "
+             "OpenAI-compatible server, 'record' and 'replay' record or replay "
+             "agent calls in ADW_RECORDING_DIR"
     )
 
 
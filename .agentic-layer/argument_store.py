@@ -0,0 +1,75 @@
+"""Content-addressed storage for large agent arguments.
+
+Arguments above a size threshold are written to a file named after the
+SHA-256 of their content and passed to the agent by path. This keeps command
+lines short (Copilot receives the whole prompt in argv) and stores repeated
+payloads only once.
+"""
+
+import hashlib
+import logging
+import os
+import tempfile
+from pathlib import Path
+
+from get_or_create_folders import get_or_create_args_folder
+from run_context import get_run_id
+
+DEFAULT_MAX_INLINE_ARGUMENT_BYTES = 2048
+
+
+def _max_inline_bytes() -> int:
+    """Return the inline argument limit from ADW_MAX_INLINE_ARG_BYTES."""
+    value = os.getenv("ADW_MAX_INLINE_ARG_BYTES")
+    try:
+        return int(value) if value else DEFAULT_MAX_INLINE_ARGUMENT_BYTES
+    except ValueError:
+        return DEFAULT_MAX_INLINE_ARGUMENT_BYTES
+
+
+def _args_folder() -> Path:
+    """Return the args folder of the current run, or a temp folder without a run."""
+    run_id = get_run_id()
+    if run_id:
+        return get_or_create_args_folder(run_id)
+    folder = Path(tempfile.gettempdir()) / "adw_args"
+    folder.mkdir(parents=True, exist_ok=True)
+    return folder
+
+
+def store_argument(content: str) -> Path:
+    """
+    Write an argument to its content-addressed file.
+
+    Args:
+        content: Argument text
+
+    Returns:
+        Path: Absolute path of the file holding the argument
+    """
+    data = content.encode("utf-8")
+    path = (_args_folder() / f"{hashlib.sha256(data).hexdigest()}.txt").resolve()
+    if not path.exists():
+        temp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        temp_path.write_bytes(data)
+        temp_path.replace(path)
+    return path
+
+
+def externalize_argument(argument: str) -> str:
+    """
+    Replace an oversized argument with a reference to its stored file.
+
+    Args:
+        argument: Argument value as passed to call_coding_agent
+
+    Returns:
+        str: The argument itself if small enough, otherwise a file reference
+    """
+    argument = str(argument)
+    size = len(argument.encode("utf-8"))
+    if size <= _max_inline_bytes():
+        return argument
+    path = store_argument(argument)
+    logging.getLogger(__name__).debug("Stored %s byte argument in %s", size, path.name)
+    return f"[argument stored in file {path}]"
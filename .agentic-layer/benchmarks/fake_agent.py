@@ -0,0 +1,241 @@
+"""Scripted stand-in for the coding agents, for benchmarks without model calls.
+
+The fake agent understands the slash commands ADW sends and writes the
+artifacts the orchestration expects (classification, branch name, spec,
+JUnit XML, review.json) after a configurable latency. A profile controls
+latency, transient failures, how many test runs fail and how many reviews
+report blockers.
+
+Claude is replaced by patching ``claude_agent_sdk.query`` (or installing a
+minimal ``claude_agent_sdk`` module when the SDK is missing). Copilot is
+replaced by a ``copilot`` executable on PATH that runs fake_copilot.py, which
+shares the command handling below. The Copilot stand-in needs a POSIX shell.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import random
+import re
+import sqlite3
+import stat
+import sys
+import tempfile
+import time
+import types
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+PROFILE_ENV = "ADW_FAKE_AGENT_PROFILE"
+STATE_FILE = "fake_agent_state.sqlite3"
+
+_COPILOT_COMMAND_PATTERN = re.compile(
+    r"commands[/\\](?P<command>\w+)\.md using the following arguments: (?P<args>.*)", re.DOTALL
+)
+
+
+@dataclass
+class FakeAgentProfile:
+    """Behaviour of the fake agent."""
+    latency_s: float = 0.05
+    latency_jitter_s: float = 0.0
+    failure_rate: float = 0.0
+    failing_test_runs: int = 1
+    failing_tests: int = 2
+    blocker_reviews: int = 1
+    blockers: int = 2
+    touch_files: bool = True
+
+    def to_env(self) -> str:
+        """Serialize the profile for the fake Copilot process."""
+        return json.dumps(asdict(self))
+
+    @classmethod
+    def from_env(cls) -> "FakeAgentProfile":
+        """Read the profile passed by the benchmark, or the defaults."""
+        value = os.getenv(PROFILE_ENV)
+        return cls(**json.loads(value)) if value else cls()
+
+
+def _unescape(argument: str) -> str:
+    """Undo coding_agent._sanitize_argument for path-like arguments."""
+    return argument.replace("\\'", "'").replace('\\"', '"')
+
+
+def parse_claude_prompt(prompt: str) -> tuple[str, list[str]]:
+    """Split a Claude slash-command prompt into command and arguments."""
+    command, _, rest = prompt.lstrip("/").partition(" ")
+    return command, [_unescape(arg) for arg in rest.split()]
+
+
+def parse_copilot_prompt(prompt: str) -> tuple[str, list[str]]:
+    """Extract command and arguments from the prompt built for Copilot."""
+    match = _COPILOT_COMMAND_PATTERN.search(prompt)
+    if not match:
+        raise ValueError(f"Unrecognized Copilot prompt: {prompt[:200]}")
+    args = match.group("args").split(". A map of the repository", 1)[0]
+    return match.group("command"), [_unescape(arg) for arg in args.split()]
+
+
+def _next_call(folder: Path, key: str) -> int:
+    """Count calls per key in a state database, so behaviour is shared across processes."""
+    connection = sqlite3.connect(folder / STATE_FILE, timeout=30, isolation_level=None)
+    try:
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS calls (key TEXT PRIMARY KEY, count INTEGER NOT NULL)"
+        )
+        # One statement, so concurrent fake calls cannot lose an increment
+        (count,), = connection.execute(
+            "INSERT INTO calls (key, count) VALUES (?, 1) "
+            "ON CONFLICT(key) DO UPDATE SET count = count + 1 RETURNING count",
+            (key,)
+        ).fetchall()
+        return count
+    finally:
+        connection.close()
+
+
+def _junit_xml(failures: int, total: int) -> str:
+    """Build a JUnit report with the given number of failing tests."""
+    cases = []
+    for index in range(total):
+        body = ""
+        if index < failures:
+            body = (
+                f'<failure message="assert {index} == {index + 1}" type="AssertionError">'
+                f"def test_case_{index}():\n&gt;       assert {index} == {index + 1}\n"
+                f"E       assert {index} == {index + 1}\n\ntests/test_fake.py:{index + 1}: AssertionError"
+                "</failure>"
+            )
+        cases.append(
+            f'<testcase classname="tests.test_fake" name="test_case_{index}" time="0.01">{body}</testcase>'
+        )
+    return (
+        '<?xml version="1.0" encoding="utf-8"?>'
+        f'<testsuites><testsuite name="fake" tests="{total}" failures="{failures}">'
+        + "".join(cases) + "</testsuite></testsuites>"
+    )
+
+
+def _review_json(blockers: int) -> str:
+    """Build a review.json with the given number of blocker issues."""
+    issues = [
+        {
+            "review_issue_number": index + 1,
+            "issue_description": f"Fake blocker {index + 1} in fake_changes/module_{index}.py",
+            "issue_resolution": f"Fix fake_changes/module_{index}.py",
+            "issue_severity": "blocker",
+            "issue_files": [f"fake_changes/module_{index}.py"],
+        }
+        for index in range(blockers)
+    ]
+    return json.dumps({"success": blockers == 0, "review_issues": issues}, indent=2)
+
+
+def _touch_change(command: str, args: list[str]) -> None:
+    """Record a small working-tree change, as a real agent edit would."""
+    digest = hashlib.sha1(" ".join(args).encode("utf-8")).hexdigest()[:10]
+    path = Path("fake_changes") / f"{command}_{digest}.txt"
+    path.parent.mkdir(exist_ok=True)
+    with path.open("a", encoding="utf-8") as f:
+        f.write(f"{time.time()}\n")
+
+
+def perform_command(command: str, args: list[str], profile: FakeAgentProfile) -> None:
+    """
+    Write the artifacts ADW expects from a slash command.
+
+    Args:
+        command: Slash command name
+        args: Command arguments
+        profile: Fake agent behaviour
+
+    Raises:
+        RuntimeError: For an injected transient failure
+    """
+    if profile.failure_rate and random.random() < profile.failure_rate:
+        raise RuntimeError("429 Too Many Requests (injected by fake agent)")
+
+    if command == "classify":
+        Path(args[1]).write_text("FEATURE", encoding="utf-8")
+    elif command == "branch_name":
+        Path(args[1]).write_text("fake_change", encoding="utf-8")
+    elif command in ("feature", "bug"):
+        Path(args[2]).write_text(f"# Fake spec for run {args[0]}\n", encoding="utf-8")
+    elif command == "test":
+        folder = Path(args[0])
+        run = _next_call(folder, "test")
+        failures = profile.failing_tests if run <= profile.failing_test_runs else 0
+        (folder / f"results_{run}.xml").write_text(
+            _junit_xml(failures, max(profile.failing_tests, 5)), encoding="utf-8"
+        )
+    elif command == "review":
+        review_json = Path(args[2])
+        run = _next_call(review_json.parent, "review")
+        blockers = profile.blockers if run <= profile.blocker_reviews else 0
+        review_json.write_text(_review_json(blockers), encoding="utf-8")
+
+    if profile.touch_files and command in ("implement", "resolve_failed_test", "patch", "lint"):
+        _touch_change(command, args)
+
+
+async def fake_query(prompt: str, options=None):
+    """Drop-in replacement for claude_agent_sdk.query."""
+    profile = FakeAgentProfile.from_env()
+    command, args = parse_claude_prompt(prompt)
+    yield {"type": "system", "subtype": "init", "command": command}
+    await asyncio.sleep(max(0.0, profile.latency_s + random.uniform(
+        -profile.latency_jitter_s, profile.latency_jitter_s
+    )))
+    perform_command(command, args, profile)
+    yield {"type": "assistant", "content": f"Fake {command} done"}
+    yield {
+        "type": "result",
+        "subtype": "success",
+        "usage": {"input_tokens": 1000, "output_tokens": 200},
+        "total_cost_usd": 0.0,
+    }
+
+
+class _FakeOptions:
+    """Minimal ClaudeAgentOptions replacement when the SDK is not installed."""
+
+    def __init__(self, **kwargs):
+        self.cwd = None
+        self.system_prompt = None
+        self.__dict__.update(kwargs)
+
+
+class _FakeHookMatcher(_FakeOptions):
+    """Minimal HookMatcher replacement when the SDK is not installed."""
+
+
+def install_fake_claude(profile: FakeAgentProfile) -> None:
+    """Route Claude agent calls in this process to the fake agent."""
+    os.environ[PROFILE_ENV] = profile.to_env()
+    try:
+        import claude_agent_sdk  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        claude_agent_sdk = types.ModuleType("claude_agent_sdk")
+        claude_agent_sdk.ClaudeAgentOptions = _FakeOptions
+        claude_agent_sdk.HookMatcher = _FakeHookMatcher
+        sys.modules["claude_agent_sdk"] = claude_agent_sdk
+    claude_agent_sdk.query = fake_query
+
+
+def install_fake_copilot(profile: FakeAgentProfile) -> Path:
+    """
+    Put a fake ``copilot`` executable first on PATH.
+
+    Returns:
+        Path: Directory holding the executable
+    """
+    os.environ[PROFILE_ENV] = profile.to_env()
+    bin_dir = Path(tempfile.mkdtemp(prefix="adw_fake_copilot_"))
+    script = Path(__file__).resolve().parent / "fake_copilot.py"
+    executable = bin_dir / "copilot"
+    executable.write_text(f'#!/bin/sh\nexec "{sys.executable}" "{script}" "$@"\n', encoding="utf-8")
+    executable.chmod(executable.stat().st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+    os.environ["PATH"] = f"{bin_dir}{os.pathsep}{os.environ.get('PATH', '')}"
+    return bin_dir
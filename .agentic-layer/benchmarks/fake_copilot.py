@@ -0,0 +1,41 @@
+"""Fake ``copilot`` CLI used by the orchestration benchmark.
+
+Accepts the same ``-p <prompt>`` invocation as the real CLI, sleeps for the
+profile's latency and writes the artifacts of the requested slash command.
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from fake_agent import FakeAgentProfile, parse_copilot_prompt, perform_command  # noqa: E402
+
+
+def main():
+    """Run one fake Copilot invocation."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-p", dest="prompt", required=True)
+    parser.add_argument("--allow-all-tools", action="store_true")
+    parser.add_argument("--allow-all-paths", action="store_true")
+    args = parser.parse_args()
+
+    profile = FakeAgentProfile.from_env()
+    command, command_args = parse_copilot_prompt(args.prompt)
+    time.sleep(max(0.0, profile.latency_s + random.uniform(
+        -profile.latency_jitter_s, profile.latency_jitter_s
+    )))
+    try:
+        perform_command(command, command_args, profile)
+    except RuntimeError as e:
+        print(str(e), file=sys.stderr)
+        sys.exit(1)
+    print(f"Fake {command} done")
+    print("Total usage est: 1 Premium request", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,285 @@
+"""Orchestration throughput benchmark with a fake coding agent.
+
+Drives ``adw_complete``, ``adw_test_loop`` or ``adw_review`` at several
+concurrency levels against the scripted fake agent (see fake_agent.py), so
+orchestration overhead and scaling can be measured without model calls.
+
+Every concurrency level runs in a fresh worker process inside a throwaway git
+repository and reports:
+    * wall time of the whole batch and agent calls per second
+    * event-loop lag (mean, p95, max), sampled by a ticker task
+    * peak resident memory of the worker process
+
+Usage:
+    python benchmarks/orchestration_benchmark.py --scenario complete
+    python benchmarks/orchestration_benchmark.py --scenario test_loop --concurrency 1,10,100
+    python benchmarks/orchestration_benchmark.py --scenario review --agent copilot --latency 0.2
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import logging
+import math
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+LAYER_DIR = Path(__file__).resolve().parent.parent
+SCENARIOS = ("complete", "test_loop", "review")
+LAG_SAMPLE_INTERVAL_S = 0.01
+
+
+def _prepare_repository(root: Path) -> None:
+    """Create a git repository with one commit to run the workflows in."""
+    def git(*args):
+        subprocess.run(["git", *args], cwd=root, check=True, capture_output=True)
+
+    git("init", "-q")
+    git("config", "user.email", "bench@localhost")
+    git("config", "user.name", "ADW Benchmark")
+    (root / "README.md").write_text("# Benchmark repository\n", encoding="utf-8")
+    (root / ".gitignore").write_text(".agentic-runs/\n", encoding="utf-8")
+    git("add", "-A")
+    git("commit", "-q", "-m", "Initial commit")
+
+
+async def _sample_loop_lag(samples: list[float], stop: asyncio.Event) -> None:
+    """Record how late a periodic timer fires, which is the event-loop lag."""
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        start = loop.time()
+        await asyncio.sleep(LAG_SAMPLE_INTERVAL_S)
+        samples.append(max(0.0, loop.time() - start - LAG_SAMPLE_INTERVAL_S))
+
+
+def _write_spec(run_id: str) -> Path:
+    """Write a placeholder spec into the run folder."""
+    from get_or_create_folders import get_or_create_run_folder  # pylint: disable=import-outside-toplevel
+
+    spec_path = get_or_create_run_folder(run_id) / f"spec_{run_id}.md"
+    spec_path.write_text(f"# Benchmark spec {run_id}\n", encoding="utf-8")
+    return spec_path
+
+
+async def _run_one(scenario: str, index: int, agent_type) -> bool:
+    """Run a single workflow of the scenario."""
+    # pylint: disable=import-outside-toplevel
+    from get_or_create_folders import get_or_create_test_folder
+    from run_context import set_run_id
+
+    run_id = f"bench{index:03d}"
+    if scenario == "complete":
+        from adw_init_plan_implement_test_review_lint import adw_complete
+
+        draft = Path("drafts") / f"draft_{index}.md"
+        draft.parent.mkdir(exist_ok=True)
+        draft.write_text(f"Add benchmark feature {index}\n", encoding="utf-8")
+        return await adw_complete(str(draft), run_id, None, agent_type)
+
+    set_run_id(run_id)
+    spec_path = _write_spec(run_id)
+    if scenario == "test_loop":
+        from adw_test_loop import adw_test_loop
+
+        return await adw_test_loop(
+            str(get_or_create_test_folder(run_id)), str(spec_path), agent_type
+        )
+
+    from adw_review import adw_review
+
+    return await adw_review(run_id, str(spec_path), agent_type)
+
+
+def _count_agent_calls(run_directory: Path) -> int:
+    """Count the agent calls recorded in all transcript indexes."""
+    return sum(
+        len(index.read_text(encoding="utf-8").splitlines())
+        for index in run_directory.glob("*/transcripts/index.jsonl")
+    )
+
+
+def _max_rss_mb() -> float | None:
+    """Return the peak resident set size of this process in MB, if available."""
+    try:
+        import resource  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return round(max_rss / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+async def _run_batch(scenario: str, concurrency: int, agent_type) -> tuple[list, list[float]]:
+    """Run the scenario concurrently while sampling event-loop lag."""
+    samples: list[float] = []
+    stop = asyncio.Event()
+    sampler = asyncio.create_task(_sample_loop_lag(samples, stop))
+    results = await asyncio.gather(
+        *(_run_one(scenario, index, agent_type) for index in range(concurrency)),
+        return_exceptions=True
+    )
+    stop.set()
+    await sampler
+    return results, samples
+
+
+def run_worker(args: argparse.Namespace) -> dict:
+    """Run one concurrency level in this process and return its measurements."""
+    root = Path(tempfile.mkdtemp(prefix="adw_bench_"))
+    _prepare_repository(root)
+    run_directory = root / ".agentic-runs"
+    os.environ.update({
+        "RUN_DIRECTORY": str(run_directory),
+        "ADW_SPEECH": "off",
+        "ADW_LINT_FAST_PATH": "off",
+        "ADW_RATE_LIMIT_PER_MINUTE": str(args.rate_limit),
+        "ADW_RATE_LIMIT_DB": str(root / "rate_limit.sqlite3"),
+    })
+    if not args.repo_map:
+        os.environ["ADW_REPO_MAP"] = "off"
+    os.chdir(root)
+    sys.path.insert(0, str(LAYER_DIR))
+    sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+    # pylint: disable=import-outside-toplevel
+    from fake_agent import FakeAgentProfile, install_fake_claude, install_fake_copilot
+    from agent_types import AgentType
+
+    profile = FakeAgentProfile(
+        latency_s=args.latency,
+        latency_jitter_s=args.jitter,
+        failure_rate=args.failure_rate,
+        failing_test_runs=args.failing_test_runs,
+        blocker_reviews=args.blocker_reviews,
+    )
+    agent_type = AgentType(args.agent)
+    if agent_type == AgentType.COPILOT:
+        install_fake_copilot(profile)
+    else:
+        install_fake_claude(profile)
+
+    if not args.with_logging:
+        # setup_logging leaves an already configured root logger alone
+        logging.getLogger().addHandler(logging.NullHandler())
+
+    with open(os.devnull, "w", encoding="utf-8") as devnull, \
+            contextlib.redirect_stdout(devnull), contextlib.redirect_stderr(devnull):
+        start = time.perf_counter()
+        results, samples = asyncio.run(_run_batch(args.scenario, args.concurrency, agent_type))
+        wall_s = time.perf_counter() - start
+        # Drain queued log records before stdout is restored for the result line
+        from logging_config import shutdown_logging  # pylint: disable=import-outside-toplevel
+        shutdown_logging()
+
+    agent_calls = _count_agent_calls(run_directory)
+    lags_ms = sorted(sample * 1000 for sample in samples) or [0.0]
+    return {
+        "scenario": args.scenario,
+        "agent": args.agent,
+        "concurrency": args.concurrency,
+        "succeeded": sum(1 for result in results if result is True),
+        "failed": sum(1 for result in results if result is not True),
+        "errors": sorted({repr(result) for result in results if isinstance(result, BaseException)}),
+        "wall_s": round(wall_s, 3),
+        "agent_calls": agent_calls,
+        "calls_per_s": round(agent_calls / wall_s, 2) if wall_s else None,
+        "loop_lag_ms": {
+            "mean": round(statistics.fmean(lags_ms), 2),
+            "p95": round(lags_ms[math.ceil(0.95 * len(lags_ms)) - 1], 2),
+            "max": round(lags_ms[-1], 2),
+        },
+        "max_rss_mb": _max_rss_mb(),
+    }
+
+
+def _worker_command(args: argparse.Namespace, concurrency: int) -> list[str]:
+    """Build the command line of the worker process for one concurrency level."""
+    command = [
+        sys.executable, str(Path(__file__).resolve()), "--worker",
+        "--scenario", args.scenario, "--agent", args.agent,
+        "--concurrency", str(concurrency),
+        "--latency", str(args.latency), "--jitter", str(args.jitter),
+        "--failure_rate", str(args.failure_rate),
+        "--failing_test_runs", str(args.failing_test_runs),
+        "--blocker_reviews", str(args.blocker_reviews),
+        "--rate_limit", str(args.rate_limit),
+    ]
+    if args.repo_map:
+        command.append("--repo_map")
+    if args.with_logging:
+        command.append("--with_logging")
+    return command
+
+
+def main():
+    """Run the benchmark for every concurrency level and print a summary."""
+    parser = argparse.ArgumentParser(description="Benchmark ADW orchestration with a fake agent")
+    parser.add_argument("--scenario", choices=SCENARIOS, default="complete")
+    parser.add_argument("--agent", choices=("claude", "copilot"), default="claude")
+    parser.add_argument(
+        "--concurrency", default="1,10,100",
+        help="Comma-separated numbers of concurrent runs (default: 1,10,100)"
+    )
+    parser.add_argument("--latency", type=float, default=0.05, help="Agent latency in s (default: 0.05)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Latency jitter in s (default: 0)")
+    parser.add_argument(
+        "--failure_rate", type=float, default=0.0,
+        help="Probability of an injected transient error per agent call (default: 0)"
+    )
+    parser.add_argument(
+        "--failing_test_runs", type=int, default=1,
+        help="Test runs per workflow that report failures (default: 1)"
+    )
+    parser.add_argument(
+        "--blocker_reviews", type=int, default=1,
+        help="Reviews per workflow that report blockers (default: 1)"
+    )
+    parser.add_argument(
+        "--rate_limit", type=float, default=0,
+        help="ADW_RATE_LIMIT_PER_MINUTE for the runs (default: 0, disabled)"
+    )
+    parser.add_argument("--repo_map", action="store_true", help="Build repository maps")
+    parser.add_argument("--with_logging", action="store_true", help="Keep ADW logging enabled")
+    parser.add_argument("--output", type=Path, help="Write all results as JSON to this file")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        args.concurrency = int(args.concurrency)
+        print(json.dumps(run_worker(args)))
+        return
+
+    results = []
+    for concurrency in (int(value) for value in args.concurrency.split(",")):
+        completed = subprocess.run(
+            _worker_command(args, concurrency), capture_output=True, text=True, check=False
+        )
+        if completed.returncode != 0:
+            print(f"Worker for {concurrency} run(s) failed:\n{completed.stderr}", file=sys.stderr)
+            sys.exit(1)
+        result = json.loads(completed.stdout.strip().splitlines()[-1])
+        results.append(result)
+        lag = result["loop_lag_ms"]
+        print(
+            f"{args.scenario:10} {args.agent:8} runs {concurrency:4}  "
+            f"ok {result['succeeded']:4}  wall {result['wall_s']:8.2f} s  "
+            f"calls/s {result['calls_per_s'] or 0:7.1f}  "
+            f"lag mean/p95/max {lag['mean']:6.1f}/{lag['p95']:6.1f}/{lag['max']:7.1f} ms  "
+            f"rss {result['max_rss_mb']} MB"
+        )
+        for error in result["errors"]:
+            print(f"    error: {error}")
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+        print(f"\nResults written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+"""Startup-time benchmark for the ADW entry scripts.
+
+For every ``adw_*.py`` entry script this records:
+    * the ``-X importtime`` profile of importing the module (total and the
+      heaviest top-level imports)
+    * the cold-start wall time of ``python <script> --help`` (median of runs)
+
+Results can be written to a baseline file and later compared against it. The
+benchmark exits with status 1 when an entry script's median wall time exceeds
+``baseline * (1 + --max_regression) + --slack_ms``.
+
+Usage:
+    python benchmarks/startup_benchmark.py
+    python benchmarks/startup_benchmark.py --update_baseline
+    python benchmarks/startup_benchmark.py --max_regression 0.25 --slack_ms 20
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+LAYER_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "startup_baseline.json"
+
+
+def _entry_scripts() -> list[Path]:
+    """Return all adw_*.py entry scripts in the agentic layer."""
+    return sorted(LAYER_DIR.glob("adw_*.py"))
+
+
+def _measure_import_time(module: str) -> dict:
+    """
+    Profile importing a module with ``-X importtime``.
+
+    Args:
+        module: Module name to import
+
+    Returns:
+        dict with the cumulative import time in ms and the heaviest imports
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=LAYER_DIR,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+
+    imports = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        # Format: "import time: <self us> | <cumulative us> | <indented name>"
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        imports.append((name[1:], int(self_us), int(cumulative_us)))
+
+    total_us = next((cum for name, _, cum in imports if name == module), 0)
+    # Direct imports of the entry module are indented by two spaces
+    heaviest = sorted(
+        ((name.strip(), cum) for name, _, cum in imports
+         if name.startswith("  ") and not name.startswith("   ")),
+        key=lambda item: item[1],
+        reverse=True
+    )[:10]
+
+    return {
+        "import_ms": round(total_us / 1000, 2),
+        "heaviest_imports_ms": {name: round(cum / 1000, 2) for name, cum in heaviest},
+    }
+
+
+def _measure_wall_time(script: Path, runs: int) -> float:
+    """
+    Measure the median cold-start wall time of ``python <script> --help``.
+
+    Args:
+        script: Entry script to launch
+        runs: Number of launches
+
+    Returns:
+        Median wall time in milliseconds
+    """
+    timings = []
+    env = {**os.environ, "PYTHONDONTWRITEBYTECODE": "1"}
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, str(script), "--help"],
+            cwd=LAYER_DIR,
+            capture_output=True,
+            check=True,
+            env=env
+        )
+        timings.append((time.perf_counter() - start) * 1000)
+    return round(statistics.median(timings), 2)
+
+
+def run_benchmark(runs: int) -> dict:
+    """Benchmark all entry scripts and return results keyed by script name."""
+    results = {}
+    for script in _entry_scripts():
+        results[script.name] = {
+            **_measure_import_time(script.stem),
+            "wall_ms": _measure_wall_time(script, runs),
+        }
+    return results
+
+
+def find_regressions(
+    results: dict, baseline: dict, max_regression: float, slack_ms: float
+) -> list[str]:
+    """
+    Compare results against a baseline.
+
+    Args:
+        results: Current benchmark results
+        baseline: Previously recorded results
+        max_regression: Allowed relative slowdown (0.25 = 25%)
+        slack_ms: Absolute allowance added to every limit to absorb noise
+
+    Returns:
+        Human-readable descriptions of every regression found
+    """
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if not previous:
+            continue
+        limit = previous["wall_ms"] * (1 + max_regression) + slack_ms
+        if current["wall_ms"] > limit:
+            regressions.append(
+                f"{name}: {current['wall_ms']:.1f} ms > limit {limit:.1f} ms "
+                f"(baseline {previous['wall_ms']:.1f} ms)"
+            )
+    return regressions
+
+
+def main():
+    """Run the startup benchmark and compare it against the baseline."""
+    parser = argparse.ArgumentParser(description="Benchmark ADW entry script startup time")
+    parser.add_argument("--runs", type=int, default=5, help="Launches per script (default: 5)")
+    parser.add_argument(
+        "--baseline", type=Path, default=DEFAULT_BASELINE,
+        help="Baseline JSON file (default: benchmarks/startup_baseline.json)"
+    )
+    parser.add_argument(
+        "--update_baseline", action="store_true",
+        help="Write the current results as the new baseline"
+    )
+    parser.add_argument(
+        "--max_regression", type=float, default=0.25,
+        help="Allowed relative wall-time regression (default: 0.25)"
+    )
+    parser.add_argument(
+        "--slack_ms", type=float, default=20.0,
+        help="Absolute wall-time allowance in ms (default: 20)"
+    )
+    args = parser.parse_args()
+
+    results = run_benchmark(args.runs)
+
+    for name, result in results.items():
+        print(f"{name:50} wall {result['wall_ms']:8.1f} ms   import {result['import_ms']:8.1f} ms")
+
+    if args.update_baseline:
+        args.baseline.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+        print(f"\nBaseline written to {args.baseline}")
+        return
+
+    if not args.baseline.exists():
+        print(f"\nNo baseline at {args.baseline}; run with --update_baseline to create one.")
+        return
+
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    regressions = find_regressions(results, baseline, args.max_regression, args.slack_ms)
+    if regressions:
+        print("\nStartup regressions detected:")
+        for regression in regressions:
+            print(f"  {regression}")
+        sys.exit(1)
+    print("\nNo startup regressions.")
+
+
+if __name__ == "__main__":
+    main()
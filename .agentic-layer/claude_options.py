@@ -1,20 +1,106 @@
 """Shared Claude Agent configuration utilities."""
 
-from claude_agent_sdk import ClaudeAgentOptions
+import hashlib
+import logging
+from pathlib import Path
+from typing import TYPE_CHECKING
 
+from local_linters import lint_file
 
-def get_default_claude_options(model: str = "sonnet") -> ClaudeAgentOptions:
+if TYPE_CHECKING:
+    from claude_agent_sdk import ClaudeAgentOptions
+
+# Model used when a loop stops making progress with the default model
+ESCALATION_MODEL = "opus"
+
+# Tools after which the lint-on-write hook runs
+FILE_WRITE_TOOLS = "Write|Edit|MultiEdit"
+
+
+def _file_digest(path: Path) -> str | None:
+    """Return a hash of a file's content, or None if it cannot be read."""
+    try:
+        return hashlib.sha1(path.read_bytes()).hexdigest()
+    except OSError:
+        return None
+
+
+async def lint_on_write_hook(input_data: dict, tool_use_id: str | None, context) -> dict:
+    """
+    PostToolUse hook that formats and autofixes the file the agent just wrote.
+
+    The remaining violations (and whether the file changed on disk) are fed
+    back to the agent as additional context.
+
+    Args:
+        input_data: PostToolUse hook input with the tool name and input
+        tool_use_id: ID of the tool call (unused)
+        context: Hook context (unused)
+
+    Returns:
+        Hook output with additional context, or an empty dict if nothing ran
+    """
+    logger = logging.getLogger(__name__)
+    file_path = (input_data.get("tool_input") or {}).get("file_path")
+    if not file_path:
+        return {}
+
+    cwd = input_data.get("cwd")
+    path = Path(cwd, file_path) if cwd else Path(file_path)
+    before = _file_digest(path)
+    try:
+        linters, violations = await lint_file(str(path), cwd=cwd)
+    except RuntimeError as e:
+        logger.warning("Lint-on-write failed for %s: %s", file_path, e)
+        return {}
+    if not linters:
+        return {}
+
+    lines = [f"Ran {', '.join(linters)} on {file_path}."]
+    if _file_digest(path) != before:
+        lines.append("The file was reformatted on disk; read it again before the next edit.")
+    if violations:
+        lines.append("Remaining violations:")
+        lines.extend(
+            f"- line {v.get('line')}, column {v.get('column')}: [{v.get('code')}] {v.get('message')}"
+            for v in violations
+        )
+    else:
+        lines.append("No remaining violations.")
+    logger.debug("Lint-on-write for %s: %s violation(s)", file_path, len(violations))
+
+    return {
+        "hookSpecificOutput": {
+            "hookEventName": "PostToolUse",
+            "additionalContext": "\n".join(lines),
+        }
+    }
+
+
+def get_default_claude_options(
+    model: str = "sonnet", lint_on_write: bool = False
+) -> "ClaudeAgentOptions":
     """
     Create default ClaudeAgentOptions for ADW scripts.
 
     Args:
         model: The model to use (default: "sonnet")
+        lint_on_write: Run local formatters and autofixers after every file
+                       write or edit and report the results to the agent
 
     Returns:
         ClaudeAgentOptions configured with standard ADW settings
     """
+    # pylint: disable=import-outside-toplevel
+    from claude_agent_sdk import ClaudeAgentOptions, HookMatcher
+
+    hooks = None
+    if lint_on_write:
+        hooks = {"PostToolUse": [HookMatcher(matcher=FILE_WRITE_TOOLS, hooks=[lint_on_write_hook])]}
+
     return ClaudeAgentOptions(
         permission_mode="bypassPermissions",
         setting_sources=["project"],
-        model=model
+        model=model,
+        hooks=hooks
     )
@@ -4,11 +4,30 @@ import asyncio
 import logging
 import platform
 import subprocess
+import time
+from collections import Counter
+from dataclasses import replace
+from functools import partial
 from pathlib import Path
-
+from typing import Awaitable, Callable
+
+from agent_backends import (
+    CAPABILITY_LINT_ON_WRITE, CAPABILITY_REPO_MAP, CAPABILITY_SHELL,
+    AgentBackend, AgentRequest, check_backend_supports, command_backend, get_backend,
+    register_backend
+)
+from agent_recorder import record_call, recorded_agent_type, replay_call
 from agent_types import AgentType
-from claude_agent_sdk import query
+from argument_store import externalize_argument
 from claude_options import get_default_claude_options
+from event_bus import EventType, emit
+from git_snapshot import worktree_fingerprint
+from local_agent import LOCAL_BACKEND
+from rate_limiter import acquire_agent_slot, backoff_delay, is_transient_error, max_retries
+from repo_map import get_repo_map
+from run_budget import BudgetMeter, RunBudget, get_run_budget
+from run_context import get_phase
+from transcript_store import TranscriptWriter, open_transcript
 
 
 logger = logging.getLogger(__name__)
@@ -38,54 +57,232 @@ async def call_coding_agent(
     agent_type: AgentType,
     slash_command: str,
     arguments: list[str],
-    model: str = "sonnet"
+    model: str = "sonnet",
+    cwd: str | None = None,
+    lint_on_write: bool = False
 ) -> bool:
     """
     Execute a coding agent command with unified interface.
 
+    The command runs on the backend registered for the agent type, unless
+    ADW_COMMAND_BACKENDS routes it to another backend (see agent_backends).
+
     Args:
-        agent_type: Type of agent (CLAUDE or COPILOT)
+        agent_type: Type of agent (a registered backend, or RECORD/REPLAY)
         slash_command: Command name without slash (e.g., "implement", "feature", "bug")
         arguments: List of argument values to pass to the command
         model: Model to use (for Claude Code, default: "sonnet")
+        cwd: Working directory for the agent (default: current directory)
+        lint_on_write: Format and autofix files after every agent edit
+                       (only for backends that support it)
 
     Returns:
         bool: True if command executed successfully
 
     Raises:
-        ValueError: If agent_type is invalid
+        ValueError: If agent_type is invalid, or its backend lacks a capability
+                    the command needs (e.g. shell for /test)
         FileNotFoundError: If slash command file not found (for Copilot)
         RuntimeError: If agent execution fails
     """
+    # Pass large arguments by file reference to keep command lines short
+    arguments = [externalize_argument(arg) for arg in arguments]
+
+    backend_name = agent_type.value
+    if agent_type != AgentType.REPLAY:
+        default = recorded_agent_type() if agent_type == AgentType.RECORD else agent_type
+        backend_name = command_backend(slash_command) or default.value
+        # Refuse e.g. /test on a backend without shell before it counts against the budget
+        check_backend_supports(get_backend(backend_name), slash_command)
+
     logger.info(
         "Calling coding agent - Type: %s, Command: %s, Arguments: %s",
-        agent_type.value, slash_command, arguments
+        backend_name, slash_command, arguments
     )
 
-    # Sanitize all arguments to prevent command parsing issues
-    sanitized_arguments = [_sanitize_argument(arg) for arg in arguments]
+    # Stop runaway runs before they start another call
+    budget = get_run_budget()
+    if budget is not None:
+        budget.start_agent_call(get_phase())
+
+    # Stream the full conversation into a per-call transcript in the run folder
+    transcript = open_transcript(backend_name, slash_command, model)
+    # Reported tokens count against the run budget on their way to the transcript
+    sink = BudgetMeter(budget, transcript) if budget is not None else transcript
+    status = "error"
+    emit(EventType.AGENT_CALL_STARTED, command=slash_command, agent=backend_name, model=model)
+    start = time.monotonic()
 
     try:
-        if agent_type == AgentType.CLAUDE:
-            command = _build_claude_command(slash_command, sanitized_arguments)
-            logger.debug("Claude command: %s", command)
-            await _execute_claude_agent(command, model)
-        elif agent_type == AgentType.COPILOT:
-            prompt = _build_copilot_command(slash_command, sanitized_arguments)
-            logger.debug("Copilot prompt: %s", prompt[:200])  # Log first 200 chars
-            await _execute_copilot_agent(prompt)
+        if agent_type == AgentType.REPLAY:
+            await replay_call(slash_command, arguments, sink, cwd)
         else:
-            raise ValueError(f"Invalid agent type: {agent_type}")
+            run_agent = await _prepare_agent_execution(
+                get_backend(backend_name),
+                AgentRequest(slash_command, arguments, model, cwd, lint_on_write)
+            )
+            def execute(call_sink):
+                return _execute_with_retries(partial(run_agent, call_sink), call_sink, cwd)
 
+            if agent_type == AgentType.RECORD:
+                # Retries happen inside one recording, so it holds the call's final effects
+                call = record_call(execute, slash_command, arguments, model, sink, cwd)
+            else:
+                call = execute(sink)
+            await _run_within_budget(call, budget)
+
+        status = "success"
         logger.info("Coding agent execution completed successfully")
         return True
 
     except Exception as e:
         logger.error(
             "Coding agent execution failed - Type: %s, Command: %s, Error: %s",
-            agent_type.value, slash_command, e, exc_info=True
+            backend_name, slash_command, e, exc_info=True
         )
         raise
+    finally:
+        if transcript is not None:
+            transcript.close(status)
+            logger.debug("Transcript written: %s", transcript.call_id)
+        emit(
+            EventType.AGENT_CALL_FINISHED,
+            command=slash_command, agent=backend_name, model=model,
+            status=status, duration_s=round(time.monotonic() - start, 3)
+        )
+
+
+async def _prepare_agent_execution(
+    backend: AgentBackend, request: AgentRequest
+) -> Callable[[TranscriptWriter | None], Awaitable[None]]:
+    """Build the call that runs a backend, given where to stream its messages."""
+    if request.lint_on_write and CAPABILITY_LINT_ON_WRITE not in backend.capabilities:
+        logger.warning("Lint-on-write is not supported for %s; skipping", backend.name)
+        request = replace(request, lint_on_write=False)
+    if CAPABILITY_REPO_MAP in backend.capabilities:
+        # Shared map of the repository so the agent can skip exploring it
+        request = replace(
+            request, repo_map_path=await asyncio.to_thread(get_repo_map, request.cwd)
+        )
+    return backend.prepare(request)
+
+
+def _prepare_claude_agent(request: AgentRequest):
+    """Build the call that runs a command with Claude Code."""
+    command = _build_claude_command(
+        request.slash_command, [_sanitize_argument(arg) for arg in request.arguments]
+    )
+    logger.debug("Claude command: %s", command)
+    return partial(
+        _execute_claude_agent,
+        command, request.model,
+        cwd=request.cwd, lint_on_write=request.lint_on_write, repo_map_path=request.repo_map_path
+    )
+
+
+def _prepare_copilot_agent(request: AgentRequest):
+    """Build the call that runs a command with GitHub Copilot CLI."""
+    prompt = _build_copilot_command(
+        request.slash_command,
+        [_sanitize_argument(arg) for arg in request.arguments],
+        request.repo_map_path
+    )
+    logger.debug("Copilot prompt: %s", prompt[:200])  # Log first 200 chars
+    return partial(_execute_copilot_agent, prompt, cwd=request.cwd)
+
+
+async def _run_within_budget(call: Awaitable[None], budget: RunBudget | None) -> None:
+    """Await an agent call, cutting it off when the run's wall-time budget runs out."""
+    remaining = budget.remaining_wall_s() if budget is not None else None
+    if remaining is None:
+        await call
+        return
+    # wait_for raises the same TimeoutError as the agent's own timeouts; wait() reports the
+    # budget running out as an unfinished task instead
+    task = asyncio.ensure_future(call)
+    try:
+        done, _ = await asyncio.wait({task}, timeout=remaining)
+    finally:
+        if not task.done():
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+    if task not in done:
+        raise budget.exceeded("wall time", get_phase())
+    task.result()
+
+
+def _worktree_state(cwd: str | None) -> str | None:
+    """Fingerprint the agent's working tree, or return None if git is unavailable."""
+    try:
+        return worktree_fingerprint(cwd)
+    except RuntimeError as e:
+        logger.debug("Could not fingerprint working tree: %s", e)
+        return None
+
+
+# Agent attempts running, and ever started, per working tree in this process
+_active_attempts: Counter[str] = Counter()
+_started_attempts: Counter[str] = Counter()
+
+
+async def _execute_with_retries(
+    execute: Callable[[], Awaitable[None]], transcript: TranscriptWriter | None,
+    cwd: str | None = None
+) -> None:
+    """
+    Run an agent execution behind the host-wide rate limiter.
+
+    Transient errors (throttling, overload, network issues) are retried with
+    exponential backoff and jitter; all other errors are raised immediately.
+    An attempt that changed the working tree is not retried, since running
+    the command again would repeat its edits on top of the partial ones. The
+    tree is compared by its cheap fingerprint, so nothing is written to the
+    object store.
+
+    Calls that share a working tree (e.g. concurrent review patch groups)
+    cannot tell their own edits from a sibling's. When another call ran in
+    the same tree during a failed attempt, the change is not attributed to
+    the attempt and it is retried, with a warning.
+    """
+    retries = max_retries()
+    tree = str(Path(cwd or ".").resolve())
+    for attempt in range(retries + 1):
+        await acquire_agent_slot()
+        # Counted before the fingerprint, so edits made while it is taken are attributed too
+        shared = _active_attempts[tree] > 0
+        started = _started_attempts[tree]
+        _active_attempts[tree] += 1
+        _started_attempts[tree] += 1
+        try:
+            before = await asyncio.to_thread(_worktree_state, cwd) if attempt < retries else None
+            await execute()
+            return
+        except RuntimeError as e:
+            if attempt >= retries or not is_transient_error(e):
+                raise
+            shared = shared or _started_attempts[tree] != started + 1
+            changed = before is None or await asyncio.to_thread(_worktree_state, cwd) != before
+            if changed and not shared:
+                logger.warning(
+                    "Not retrying transient agent error, the working tree may hold partial "
+                    "edits: %s", e
+                )
+                raise
+            if changed:
+                logger.warning(
+                    "Working tree changed while other agent calls shared it, retrying "
+                    "anyway: %s", e
+                )
+            delay = backoff_delay(attempt)
+            logger.warning(
+                "Transient agent error (attempt %s/%s), retrying in %.1fs: %s",
+                attempt + 1, retries + 1, delay, e
+            )
+            if transcript is not None:
+                transcript.write({"type": "retry", "attempt": attempt + 1, "error": str(e)})
+            await asyncio.sleep(delay)
+        finally:
+            _active_attempts[tree] -= 1
 
 
 def _build_claude_command(slash_command: str, arguments: list[str]) -> str:
@@ -96,30 +293,58 @@ def _build_claude_command(slash_command: str, arguments: list[str]) -> str:
     return command
 
 
-def _build_copilot_command(slash_command: str, arguments: list[str]) -> str:
+def _build_copilot_command(
+    slash_command: str, arguments: list[str], repo_map_path: Path | None = None
+) -> str:
     """Build GitHub Copilot CLI prompt string."""
     file_path = Path(".claude") / "commands" / f"{slash_command}.md"
     args_str = " ".join(str(arg) for arg in arguments)
     prompt = f"execute the prompt specified in {file_path} using the following arguments: {args_str}"
+    if repo_map_path is not None:
+        prompt += (
+            f". A map of the repository's files and symbols is in {repo_map_path.resolve()}; "
+            "read it instead of exploring the repository"
+        )
     logger.debug("Built Copilot prompt: %s", prompt)
     return prompt
 
 
-async def _execute_claude_agent(command: str, model: str) -> None:
+async def _execute_claude_agent(
+    command: str,
+    model: str,
+    transcript: TranscriptWriter | None = None,
+    cwd: str | None = None,
+    lint_on_write: bool = False,
+    repo_map_path: Path | None = None
+) -> None:
     """Execute command using Claude Code SDK."""
     logger.debug("Executing Claude Code SDK with command: %s", command)
 
-    options = get_default_claude_options(model=model)
+    # Imported here so scripts that never talk to Claude don't pay for the SDK
+    from claude_agent_sdk import query  # pylint: disable=import-outside-toplevel
+
+    options = get_default_claude_options(model=model, lint_on_write=lint_on_write)
+    if cwd:
+        options.cwd = cwd
+    if repo_map_path is not None:
+        # Read from a file to stay clear of command-line length limits
+        options.system_prompt = {"type": "file", "path": str(repo_map_path.resolve())}
 
     try:
         async for message in query(prompt=command, options=options):
-            logger.debug("Claude code message: %s", message)
+            if transcript is not None:
+                transcript.write(message)
+                logger.debug("Claude code message: %s", type(message).__name__)
+            else:
+                logger.debug("Claude code message: %s", message)
     except Exception as e:
         logger.error("Claude Code SDK query failed: %s", e, exc_info=True)
         raise RuntimeError(f"Claude Code SDK execution failed: {e}") from e
 
 
-async def _execute_copilot_agent(prompt: str) -> None:
+async def _execute_copilot_agent(
+    prompt: str, transcript: TranscriptWriter | None = None, cwd: str | None = None
+) -> None:
     """Execute prompt using GitHub Copilot CLI."""
     logger.info("Executing GitHub Copilot CLI")
 
@@ -148,7 +373,8 @@ async def _execute_copilot_agent(prompt: str) -> None:
             stderr=subprocess.PIPE,
             text=True,
             encoding='utf-8',
-            errors='replace'
+            errors='replace',
+            cwd=cwd
         )
         
         # Read output line by line
@@ -158,10 +384,14 @@ async def _execute_copilot_agent(prompt: str) -> None:
         for line in process.stdout:
             logger.debug("Copilot output: %s", line.rstrip())
             stdout_lines.append(line)
+            if transcript is not None:
+                transcript.write({"type": "stdout", "line": line.rstrip()})
 
         # Read stderr (contains both errors and summary stats)
         for line in process.stderr:
             stderr_lines.append(line)
+            if transcript is not None:
+                transcript.write({"type": "stderr", "line": line.rstrip()})
 
         # Wait for process to complete
         process.wait()
@@ -200,3 +430,18 @@ async def _execute_copilot_agent(prompt: str) -> None:
     except Exception as e:
         logger.error("GitHub Copilot CLI execution failed: %s", e, exc_info=True)
         raise RuntimeError(f"GitHub Copilot CLI execution failed: {e}") from e
+
+
+register_backend(AgentBackend(
+    name=AgentType.CLAUDE.value,
+    prepare=_prepare_claude_agent,
+    capabilities=frozenset({CAPABILITY_SHELL, CAPABILITY_REPO_MAP, CAPABILITY_LINT_ON_WRITE}),
+    description="Claude Code through the Claude Agent SDK",
+))
+register_backend(AgentBackend(
+    name=AgentType.COPILOT.value,
+    prepare=_prepare_copilot_agent,
+    capabilities=frozenset({CAPABILITY_SHELL, CAPABILITY_REPO_MAP}),
+    description="GitHub Copilot CLI",
+))
+register_backend(LOCAL_BACKEND)
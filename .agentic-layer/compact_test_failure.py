@@ -0,0 +1,250 @@
+"""Compact representation of a failed JUnit test case for the resolve agent.
+
+The full JUnit XML of a test case can carry megabytes of captured output and
+long stack traces through third-party code. The compact form keeps what the
+agent needs to fix the test:
+    * the assertion or error message
+    * the stack trace, limited to frames inside the repository, with repeated
+      frames collapsed
+    * the head and tail of captured stdout/stderr
+"""
+
+import re
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from junitparser import TestCase
+
+MAX_MESSAGE_CHARS = 2000
+MAX_TRACE_CHARS = 8000
+MAX_LINE_CHARS = 500
+OUTPUT_HEAD_LINES = 30
+OUTPUT_TAIL_LINES = 50
+
+# Path fragments that mark a frame as outside the project's own code
+_LIBRARY_MARKERS = (
+    "site-packages", "dist-packages", "node_modules", "<frozen", "/lib/python",
+    "\\lib\\python", "<string>", "node:internal",
+)
+
+# Python traceback frame: File "path", line 12, in func
+_PYTHON_FRAME = re.compile(r'^\s*File "(?P<path>[^"]+)", line \d+')
+# JavaScript frame: at func (path:12:3) or at path:12:3
+_JS_FRAME = re.compile(r"^\s*at (?:.*?\()?(?P<path>[^()\s]+?):\d+:\d+\)?\s*$")
+# pytest location line closing a frame: path.py:12: Error
+_PYTEST_LOCATION = re.compile(r"^(?P<path>[^\s:][^:]*):\d+: ?")
+# pytest separator between frames of a long traceback: "_ _ _ _"
+_PYTEST_SEPARATOR = re.compile(r"^(?:_ ){3,}_?\s*$")
+
+
+def _is_library_path(path: str, repo_root: Path | None) -> bool:
+    """Return whether a frame path points outside the repository's own code."""
+    normalized = path.replace("\\", "/")
+    if any(marker.replace("\\", "/") in normalized for marker in _LIBRARY_MARKERS):
+        return True
+    candidate = Path(path)
+    if repo_root is None or not candidate.is_absolute():
+        return False
+    try:
+        candidate.resolve().relative_to(repo_root.resolve())
+    except ValueError:
+        return True
+    return False
+
+
+def _cap_line(line: str) -> str:
+    """Shorten a single overlong line."""
+    if len(line) <= MAX_LINE_CHARS:
+        return line
+    return f"{line[:MAX_LINE_CHARS]}… [{len(line) - MAX_LINE_CHARS} chars truncated]"
+
+
+def head_tail(text: str, head: int = OUTPUT_HEAD_LINES, tail: int = OUTPUT_TAIL_LINES) -> str:
+    """
+    Keep the first and last lines of a text and drop the middle.
+
+    Args:
+        text: Text to shorten
+        head: Number of leading lines to keep
+        tail: Number of trailing lines to keep
+
+    Returns:
+        str: Shortened text with a marker for the omitted lines
+    """
+    lines = [_cap_line(line) for line in text.strip("\n").splitlines()]
+    if len(lines) <= head + tail:
+        return "\n".join(lines)
+    omitted = len(lines) - head - tail
+    return "\n".join(
+        lines[:head] + [f"... [{omitted} lines omitted] ..."] + lines[len(lines) - tail:]
+    )
+
+
+def _collapse_repeats(blocks: list[str]) -> list[str]:
+    """Collapse runs of identical consecutive frames into one with a count."""
+    collapsed = []
+    index = 0
+    while index < len(blocks):
+        run_end = index
+        while run_end + 1 < len(blocks) and blocks[run_end + 1] == blocks[index]:
+            run_end += 1
+        collapsed.append(blocks[index])
+        if run_end > index:
+            collapsed.append(f"  [previous frame repeated {run_end - index} more times]")
+        index = run_end + 1
+    return collapsed
+
+
+def _library_marker(count: int) -> str:
+    """Return the placeholder line for omitted library frames."""
+    return f"  ... [{count} library frame(s) omitted]"
+
+
+def _compact_pytest_trace(text: str, repo_root: Path | None) -> list[str]:
+    """Compact a pytest long traceback made of separator-delimited frame blocks."""
+    blocks = []
+    current: list[str] = []
+    for line in text.splitlines():
+        if _PYTEST_SEPARATOR.match(line):
+            blocks.append(current)
+            current = []
+        else:
+            current.append(line)
+    blocks.append(current)
+
+    kept: list[str] = []
+    omitted = 0
+    for block in blocks:
+        location = next(
+            (match for line in reversed(block) if (match := _PYTEST_LOCATION.match(line))), None
+        )
+        if location and _is_library_path(location.group("path"), repo_root):
+            omitted += 1
+            # The error raised inside a library is still the failure's cause
+            errors = [line for line in block if line.startswith("E ")]
+            if errors:
+                kept.extend([_library_marker(omitted), "\n".join(errors)])
+                omitted = 0
+            continue
+        if omitted:
+            kept.append(_library_marker(omitted))
+            omitted = 0
+        kept.append("\n".join(_trim_pytest_block(block)))
+    if omitted:
+        kept.append(_library_marker(omitted))
+    return _collapse_repeats(kept)
+
+
+def _trim_pytest_block(block: list[str]) -> list[str]:
+    """Keep the failing source line with a little context, error lines and the location."""
+    lines = [line for line in block if line.strip()]
+    failing = next((i for i, line in enumerate(lines) if line.startswith(">")), None)
+    if failing is None:
+        return lines
+    trimmed = lines[max(0, failing - 3):failing + 1]
+    trimmed += [line for line in lines[failing + 1:] if not line.startswith((" ", "\t"))]
+    return trimmed
+
+
+def _compact_line_trace(text: str, repo_root: Path | None) -> list[str]:
+    """Compact a Python or JavaScript traceback where each frame starts with its own line."""
+    frames: list[str] = []
+    omitted = 0
+    lines = text.splitlines()
+    index = 0
+    while index < len(lines):
+        line = lines[index]
+        match = _PYTHON_FRAME.match(line) or _JS_FRAME.match(line)
+        if not match:
+            if omitted:
+                frames.append(_library_marker(omitted))
+                omitted = 0
+            frames.append(line)
+            index += 1
+            continue
+
+        frame = [line]
+        index += 1
+        # A Python frame line is followed by its indented source line
+        if _PYTHON_FRAME.match(line):
+            indent = len(line) - len(line.lstrip())
+            while (index < len(lines) and lines[index].strip()
+                   and len(lines[index]) - len(lines[index].lstrip()) > indent
+                   and not _PYTHON_FRAME.match(lines[index])):
+                frame.append(lines[index])
+                index += 1
+
+        if _is_library_path(match.group("path"), repo_root):
+            omitted += 1
+        else:
+            if omitted:
+                frames.append(_library_marker(omitted))
+                omitted = 0
+            frames.append("\n".join(frame))
+    if omitted:
+        frames.append(_library_marker(omitted))
+    return _collapse_repeats(frames)
+
+
+def compact_trace(text: str, repo_root: Path | None = None) -> str:
+    """
+    Reduce a stack trace to the repository's own frames.
+
+    Library frames are replaced by a count, identical consecutive frames are
+    collapsed, and the result is capped at MAX_TRACE_CHARS.
+
+    Args:
+        text: Stack trace or failure text from the JUnit report
+        repo_root: Repository root used to tell project frames from library frames
+
+    Returns:
+        str: Compacted trace
+    """
+    if any(_PYTEST_SEPARATOR.match(line) for line in text.splitlines()):
+        parts = _compact_pytest_trace(text, repo_root)
+    else:
+        parts = _compact_line_trace(text, repo_root)
+    compacted = "\n".join(_cap_line(part) if "\n" not in part else part for part in parts).strip()
+
+    if len(compacted) > MAX_TRACE_CHARS:
+        half = MAX_TRACE_CHARS // 2
+        omitted = len(compacted) - 2 * half
+        compacted = f"{compacted[:half]}\n... [{omitted} chars omitted] ...\n{compacted[-half:]}"
+    return compacted
+
+
+def compact_test_case(test_case: "TestCase", repo_root: Path | None = None) -> str:
+    """
+    Render a failed test case as compact text for the resolve agent.
+
+    Args:
+        test_case: Failed junitparser TestCase
+        repo_root: Repository root used to trim library frames from traces
+
+    Returns:
+        str: Test identity, failure message, compacted trace and captured output
+    """
+    name = f"{test_case.classname}::{test_case.name}" if test_case.classname else test_case.name
+    sections = [f"Test: {name}"]
+
+    for result in test_case.result:
+        kind = type(result).__name__.lower()
+        header = f"Result: {kind}"
+        if result.type:
+            header += f" ({result.type})"
+        sections.append(header)
+        if result.message:
+            message = result.message.strip()
+            if len(message) > MAX_MESSAGE_CHARS:
+                message = f"{message[:MAX_MESSAGE_CHARS]}… [truncated]"
+            sections.append(f"Message: {message}")
+        if result.text and result.text.strip():
+            sections.append(f"Trace:\n{compact_trace(result.text, repo_root)}")
+
+    for label, output in (("Captured stdout", test_case.system_out),
+                          ("Captured stderr", test_case.system_err)):
+        if output and output.strip():
+            sections.append(f"{label}:\n{head_tail(output)}")
+
+    return "\n\n".join(sections)
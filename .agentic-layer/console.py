@@ -9,12 +9,30 @@ for consistent styling across all ADW modules.
 # ]
 # ///
 
-from rich.console import Console
-from rich.panel import Panel
-from rich.text import Text
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from rich.panel import Panel
+
+
+class _LazyConsole:
+    """Proxy that creates the Rich Console on first use.
+
+    Importing rich costs tens of milliseconds, which short invocations such as
+    ``--help`` should not pay.
+    """
+
+    _instance = None
+
+    def __getattr__(self, name):
+        if _LazyConsole._instance is None:
+            from rich.console import Console  # pylint: disable=import-outside-toplevel
+            _LazyConsole._instance = Console()
+        return getattr(_LazyConsole._instance, name)
+
 
 # Singleton console instance
-console = Console()
+console = _LazyConsole()
 
 # Color scheme
 COLORS = {
@@ -26,8 +44,12 @@ COLORS = {
     "info": "white"
 }
 
-def phase_header(phase_name: str, phase_num: int, total: int) -> Panel:
+def phase_header(phase_name: str, phase_num: int, total: int) -> "Panel":
     """Create a styled panel for phase headers."""
+    # pylint: disable=import-outside-toplevel
+    from rich.panel import Panel
+    from rich.text import Text
+
     title = Text(
         f"PHASE {phase_num}/{total}: {phase_name.upper()}",
         style=f"bold {COLORS['phase']}"
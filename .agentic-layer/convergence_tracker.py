@@ -0,0 +1,86 @@
+"""Convergence tracking for the test loop.
+
+The tracker records the set of failing test ids of every iteration and
+decides whether the loop is still making progress, has stalled, or has made
+things worse.
+"""
+
+from enum import Enum
+
+
+class ConvergenceDecision(Enum):
+    """Outcome of recording one test loop iteration."""
+    PROGRESS = "progress"
+    NO_PROGRESS = "no_progress"
+    STALLED = "stalled"
+    REGRESSED = "regressed"
+
+
+def failing_test_ids(failing_suites: list) -> set[str]:
+    """
+    Build stable ids for all failing test cases.
+
+    Args:
+        failing_suites: TestSuite objects containing only failing tests
+
+    Returns:
+        set[str]: Ids of the form "<classname or suite>::<test name>"
+    """
+    return {
+        f"{test_case.classname or suite.name}::{test_case.name}"
+        for suite in failing_suites
+        for test_case in suite
+    }
+
+
+class ConvergenceTracker:
+    """Tracks failing test sets across iterations of the test loop."""
+
+    def __init__(self, stall_limit: int = 2):
+        """
+        Args:
+            stall_limit: Consecutive iterations without a new best result
+                         before the loop is considered stalled
+        """
+        self.stall_limit = stall_limit
+        self.history: list[frozenset[str]] = []
+        self.best_iteration: int | None = None
+        self._iterations_without_progress = 0
+
+    @property
+    def best_count(self) -> int | None:
+        """Fewest failing tests seen so far."""
+        if self.best_iteration is None:
+            return None
+        return len(self.history[self.best_iteration - 1])
+
+    def record(self, failing_ids: set[str]) -> ConvergenceDecision:
+        """
+        Record the failing tests of one iteration.
+
+        Args:
+            failing_ids: Ids of the currently failing tests
+
+        Returns:
+            ConvergenceDecision: PROGRESS for a new best result, REGRESSED if
+            more tests fail than in the previous iteration, STALLED once
+            stall_limit iterations passed without a new best, else NO_PROGRESS
+        """
+        previous = self.history[-1] if self.history else None
+        self.history.append(frozenset(failing_ids))
+
+        if self.best_iteration is None or len(failing_ids) < self.best_count:
+            self.best_iteration = len(self.history)
+            self._iterations_without_progress = 0
+            return ConvergenceDecision.PROGRESS
+
+        self._iterations_without_progress += 1
+        if previous is not None and len(failing_ids) > len(previous):
+            return ConvergenceDecision.REGRESSED
+        if self._iterations_without_progress >= self.stall_limit:
+            return ConvergenceDecision.STALLED
+        return ConvergenceDecision.NO_PROGRESS
+
+    def reset_stall(self) -> None:
+        """Give the loop a fresh stall budget, e.g. after escalating the model."""
+        self._iterations_without_progress = 0
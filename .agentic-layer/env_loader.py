@@ -0,0 +1,16 @@
+"""Single entry point for loading the project's .env file."""
+# /// script
+# dependencies = [
+#   "python-dotenv",
+# ]
+# ///
+
+from functools import cache
+
+
+@cache
+def load_env() -> None:
+    """Load environment variables from .env exactly once per process."""
+    from dotenv import load_dotenv  # pylint: disable=import-outside-toplevel
+
+    load_dotenv()
@@ -0,0 +1,243 @@
+"""In-process async event bus for workflow events.
+
+Workflow code emits events (phase and iteration boundaries, test and review
+results, agent calls, the end of the workflow) without knowing who consumes
+them. ``emit`` only appends the event to each subscriber's queue, so it never
+waits on a consumer. Every subscriber drains its own bounded queue in a
+background task. A slow consumer therefore loses events according to its
+drop policy instead of slowing down the workflow.
+
+    bus = get_event_bus()
+    bus.subscribe(handler, name="metrics", event_types={EventType.PHASE_FINISHED})
+    emit(EventType.PHASE_FINISHED, duration_s=12.5)
+    await bus.drain()  # before the event loop ends
+
+Handlers may be plain functions or coroutines. Their errors are logged and
+never propagate into the workflow.
+"""
+
+import asyncio
+import inspect
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Any, Callable
+
+from run_context import get_iteration, get_phase, get_run_id
+
+DEFAULT_QUEUE_SIZE = 100
+DEFAULT_DRAIN_TIMEOUT_SECONDS = 10.0
+
+
+class EventType(Enum):
+    """Kinds of workflow events."""
+    RUN_STARTED = "run_started"
+    PHASE_STARTED = "phase_started"
+    PHASE_FINISHED = "phase_finished"
+    ITERATION_STARTED = "iteration_started"
+    TEST_RESULTS = "test_results"
+    REVIEW_RESULTS = "review_results"
+    AGENT_CALL_STARTED = "agent_call_started"
+    AGENT_CALL_FINISHED = "agent_call_finished"
+    WORKFLOW_FINISHED = "workflow_finished"
+
+
+class DropPolicy(Enum):
+    """What happens to an event when a subscriber's queue is full."""
+    # Discard the new event and keep what is queued
+    DROP_NEWEST = "drop_newest"
+    # Discard the oldest queued event to make room for the new one
+    DROP_OLDEST = "drop_oldest"
+
+
+@dataclass(frozen=True)
+class WorkflowEvent:
+    """A single workflow event with the run context it was emitted in."""
+    type: EventType
+    data: dict = field(default_factory=dict)
+    run_id: str | None = None
+    phase: str | None = None
+    iteration: int | None = None
+    timestamp: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+class Subscription:
+    """A subscriber's handler, bounded queue and consumer task."""
+
+    def __init__(
+        self,
+        name: str,
+        handler: Callable[[WorkflowEvent], Any],
+        event_types: set[EventType] | None,
+        maxsize: int,
+        policy: DropPolicy
+    ):
+        self.name = name
+        self.handler = handler
+        self.event_types = event_types
+        self.policy = policy
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max(1, maxsize))
+        self.dropped = 0
+        self.task: asyncio.Task | None = None
+
+    def wants(self, event: WorkflowEvent) -> bool:
+        """Return whether the subscriber listens to this kind of event."""
+        return self.event_types is None or event.type in self.event_types
+
+    def offer(self, event: WorkflowEvent) -> None:
+        """Queue an event without waiting, applying the drop policy when full."""
+        if self.queue.full():
+            self.dropped += 1
+            if self.policy == DropPolicy.DROP_NEWEST:
+                return
+            self.queue.get_nowait()
+            self.queue.task_done()
+        self.queue.put_nowait(event)
+
+    def ensure_consumer(self) -> None:
+        """Start the consumer task in the running event loop, if not running."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # No running loop yet; events wait in the queue
+        if self.task is not None and not self.task.done() and self.task.get_loop() is loop:
+            return
+        if self.task is not None:
+            # A queue is bound to the loop that first waited on it
+            if not self.task.done() and not self.task.get_loop().is_closed():
+                self.task.cancel()
+            pending = []
+            while not self.queue.empty():
+                pending.append(self.queue.get_nowait())
+            self.queue = asyncio.Queue(maxsize=self.queue.maxsize)
+            for event in pending:
+                self.queue.put_nowait(event)
+        self.task = loop.create_task(self._consume(), name=f"event-subscriber-{self.name}")
+
+    async def _consume(self) -> None:
+        logger = logging.getLogger(__name__)
+        while True:
+            event = await self.queue.get()
+            try:
+                result = self.handler(event)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                # Consumers must never break the workflow
+                logger.warning("Event subscriber %s failed on %s: %s", self.name, event.type.value, e)
+            finally:
+                self.queue.task_done()
+
+
+class EventBus:
+    """Delivers workflow events to subscribers through bounded queues."""
+
+    def __init__(self):
+        self._subscriptions: dict[str, Subscription] = {}
+
+    def subscribe(
+        self,
+        handler: Callable[[WorkflowEvent], Any],
+        name: str | None = None,
+        event_types: set[EventType] | None = None,
+        maxsize: int = DEFAULT_QUEUE_SIZE,
+        policy: DropPolicy = DropPolicy.DROP_OLDEST
+    ) -> Subscription:
+        """
+        Register a handler for workflow events.
+
+        Args:
+            handler: Function or coroutine function called with each event
+            name: Unique subscriber name (default: the handler's name)
+            event_types: Event types to receive (default: all)
+            maxsize: Capacity of the subscriber's queue
+            policy: What to drop when the queue is full
+
+        Returns:
+            Subscription: The registered subscription
+
+        Raises:
+            ValueError: If a subscriber of that name exists
+        """
+        name = name or getattr(handler, "__name__", repr(handler))
+        if name in self._subscriptions:
+            raise ValueError(f"Event subscriber '{name}' is already registered")
+        subscription = Subscription(name, handler, event_types, maxsize, policy)
+        self._subscriptions[name] = subscription
+        return subscription
+
+    def unsubscribe(self, name: str) -> None:
+        """Remove a subscriber and stop its consumer task."""
+        subscription = self._subscriptions.pop(name, None)
+        if subscription is not None and subscription.task is not None:
+            subscription.task.cancel()
+
+    def is_subscribed(self, name: str) -> bool:
+        """Return whether a subscriber of that name is registered."""
+        return name in self._subscriptions
+
+    def has_subscribers(self) -> bool:
+        """Return whether any subscriber is registered."""
+        return bool(self._subscriptions)
+
+    def publish(self, event: WorkflowEvent) -> None:
+        """Queue an event for every interested subscriber without waiting."""
+        for subscription in self._subscriptions.values():
+            if subscription.wants(event):
+                subscription.offer(event)
+                subscription.ensure_consumer()
+
+    async def drain(self, timeout: float = DEFAULT_DRAIN_TIMEOUT_SECONDS) -> bool:
+        """
+        Wait until all queued events are handled.
+
+        Call this before the event loop ends, since pending consumer tasks
+        are cancelled with it.
+
+        Args:
+            timeout: Maximum seconds to wait
+
+        Returns:
+            bool: True if every queue was emptied in time
+        """
+        for subscription in self._subscriptions.values():
+            subscription.ensure_consumer()
+        pending = [subscription.queue.join() for subscription in self._subscriptions.values()]
+        if not pending:
+            return True
+        try:
+            await asyncio.wait_for(asyncio.gather(*pending), timeout)
+            return True
+        except asyncio.TimeoutError:
+            logging.getLogger(__name__).warning("Event subscribers did not finish within %ss", timeout)
+            return False
+
+    def dropped_counts(self) -> dict[str, int]:
+        """Return how many events each subscriber has dropped."""
+        return {name: subscription.dropped for name, subscription in self._subscriptions.items()}
+
+
+_bus = EventBus()
+
+
+def get_event_bus() -> EventBus:
+    """Return the process-wide event bus."""
+    return _bus
+
+
+def emit(event_type: EventType, **data) -> None:
+    """
+    Emit a workflow event tagged with the current run, phase and iteration.
+
+    Must be called from the event loop's thread. Returns immediately.
+    """
+    if not _bus.has_subscribers():
+        return
+    _bus.publish(WorkflowEvent(
+        type=event_type,
+        data=data,
+        run_id=get_run_id(),
+        phase=get_phase(),
+        iteration=get_iteration(),
+    ))
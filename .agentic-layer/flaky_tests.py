@@ -0,0 +1,194 @@
+"""Flaky-test detection for the test loop.
+
+Before a newly failing test is handed to the agent, its test file is re-run
+locally (see local_tests) up to ``ADW_FLAKY_RERUNS`` times. Running the whole
+file keeps the test's order and shared state, so a test that fails only
+after its neighbours is not mistaken for a flaky one. A test that passes on
+any re-run is flaky. It is quarantined for the rest of the run, so the loop
+neither resolves it nor counts it as failing, and it is added to a persistent
+flaky-test list shared by all runs of the project. Tests that fail on every
+re-run, or that cannot be re-run locally, go to the agent as before.
+
+Configuration (environment variables):
+    ADW_FLAKY_RERUNS: Local re-runs of a newly failing test (default: 2, 0 disables)
+    ADW_FLAKY_TESTS_FILE: Persistent flaky-test list
+                          (default: <RUN_DIRECTORY>/flaky_tests.json)
+"""
+
+import json
+import logging
+import os
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+
+from convergence_tracker import failing_test_ids
+from local_tests import pytest_command, pytest_node_id, read_outcomes, run_pytest
+from run_context import get_run_id
+
+DEFAULT_RERUNS = 2
+FLAKY_TESTS_FILE_NAME = "flaky_tests.json"
+
+
+def flaky_reruns() -> int:
+    """Return the number of local re-runs of a newly failing test (ADW_FLAKY_RERUNS)."""
+    try:
+        return max(0, int(os.getenv("ADW_FLAKY_RERUNS") or DEFAULT_RERUNS))
+    except ValueError:
+        return DEFAULT_RERUNS
+
+
+def flaky_tests_path() -> Path | None:
+    """Return the path of the persistent flaky-test list, or None if not configured."""
+    configured = os.getenv("ADW_FLAKY_TESTS_FILE")
+    if configured:
+        return Path(configured)
+    run_directory = os.getenv("RUN_DIRECTORY")
+    return Path(run_directory) / FLAKY_TESTS_FILE_NAME if run_directory else None
+
+
+def load_flaky_tests(path: Path | None = None) -> dict[str, dict]:
+    """
+    Load the persistent flaky-test list.
+
+    Args:
+        path: List file (default: flaky_tests_path())
+
+    Returns:
+        dict[str, dict]: Test id to its flaky count, first and last detection
+                         and the run that last detected it
+    """
+    path = path or flaky_tests_path()
+    if path is None or not path.exists():
+        return {}
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError) as e:
+        logging.getLogger(__name__).warning("Could not read flaky-test list %s: %s", path, e)
+        return {}
+
+
+def record_flaky_tests(test_ids: set[str], path: Path | None = None) -> None:
+    """
+    Add detected flaky tests to the persistent flaky-test list.
+
+    Args:
+        test_ids: Ids of the tests found to be flaky
+        path: List file (default: flaky_tests_path())
+    """
+    path = path or flaky_tests_path()
+    if path is None or not test_ids:
+        return
+    now = datetime.now(timezone.utc).isoformat()
+    flaky_tests = load_flaky_tests(path)
+    for test_id in test_ids:
+        entry = flaky_tests.setdefault(test_id, {"count": 0, "first_seen": now})
+        entry["count"] += 1
+        entry["last_seen"] = now
+        entry["last_run_id"] = get_run_id()
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = path.with_suffix(".tmp")
+        temporary.write_text(json.dumps(flaky_tests, indent=2, sort_keys=True), encoding="utf-8")
+        os.replace(temporary, path)
+    except OSError as e:
+        # The list is informational; detection must never fail a run
+        logging.getLogger(__name__).warning("Could not update flaky-test list %s: %s", path, e)
+
+
+def _without_tests(failing_suites: list, test_ids: set[str]) -> list:
+    """Return the failing suites without the given tests, dropping empty suites."""
+    from junitparser import TestSuite  # pylint: disable=import-outside-toplevel
+
+    remaining = []
+    for suite in failing_suites:
+        kept = [
+            test_case for test_case in suite
+            if f"{test_case.classname or suite.name}::{test_case.name}" not in test_ids
+        ]
+        if len(kept) == len(list(suite)):
+            remaining.append(suite)
+        elif kept:
+            new_suite = TestSuite(suite.name)
+            for test_case in kept:
+                new_suite.add_testcase(test_case)
+            remaining.append(new_suite)
+    return remaining
+
+
+class FlakyTestDetector:
+    """Screens the failing tests of each test loop iteration for flaky tests."""
+
+    def __init__(self, reruns: int | None = None, cwd: str | Path | None = None):
+        """
+        Args:
+            reruns: Local re-runs of a newly failing test (default: ADW_FLAKY_RERUNS)
+            cwd: Directory pytest runs in and node ids are resolved against
+                 (default: the current directory)
+        """
+        self.reruns = flaky_reruns() if reruns is None else reruns
+        self.cwd = Path(cwd or os.getcwd())
+        self.quarantined: set[str] = set()
+        self._previously_failing: set[str] = set()
+
+    @property
+    def enabled(self) -> bool:
+        """Return whether re-runs are configured and pytest is available."""
+        return self.reruns > 0 and pytest_command() is not None
+
+    async def _find_flaky(self, test_ids: set[str]) -> set[str]:
+        """Re-run the tests' files locally and return the tests that passed at least once."""
+        logger = logging.getLogger(__name__)
+        test_files = {}
+        for test_id in sorted(test_ids):
+            node_id = pytest_node_id(test_id, self.cwd)
+            if node_id is None:
+                logger.debug("Cannot re-run %s locally: no matching test file", test_id)
+            else:
+                test_files[test_id] = node_id.split("::", 1)[0]
+
+        flaky = set()
+        with tempfile.TemporaryDirectory(prefix="adw_flaky_") as temporary:
+            for attempt in range(1, self.reruns + 1):
+                pending = {
+                    test_id: path for test_id, path in test_files.items() if test_id not in flaky
+                }
+                if not pending:
+                    break
+                junit_path = Path(temporary) / f"rerun_{attempt}.xml"
+                try:
+                    await run_pytest(sorted(set(pending.values())), junit_path, self.cwd)
+                except (OSError, RuntimeError) as e:
+                    logger.warning("Local re-run of failing tests failed: %s", e)
+                    break
+                outcomes = read_outcomes(junit_path)
+                flaky |= {test_id for test_id in pending if outcomes.get(test_id) == "passed"}
+                logger.info(
+                    "Re-run %s/%s: %s of %s failing test(s) passed",
+                    attempt, self.reruns, len(flaky), len(test_files)
+                )
+        return flaky
+
+    async def screen(self, failing_suites: list) -> tuple[list, set[str]]:
+        """
+        Remove flaky tests from an iteration's failing suites.
+
+        Tests that were not failing in the previous iteration are re-run;
+        those that pass are quarantined and recorded in the flaky-test list.
+        Quarantined tests are removed without re-running them.
+
+        Args:
+            failing_suites: TestSuite objects containing only failing tests
+
+        Returns:
+            tuple: The failing suites without flaky tests, and the ids of the
+                   tests newly found to be flaky
+        """
+        failing = failing_test_ids(failing_suites)
+        newly_failing = failing - self._previously_failing - self.quarantined
+        flaky = await self._find_flaky(newly_failing) if newly_failing and self.enabled else set()
+        if flaky:
+            self.quarantined |= flaky
+            record_flaky_tests(flaky)
+        self._previously_failing = failing - self.quarantined
+        return _without_tests(failing_suites, self.quarantined), flaky
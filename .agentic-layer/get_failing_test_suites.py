@@ -1,10 +1,13 @@
 """Utility module for parsing JUnit XML test results and extracting failing test suites."""
 
 from pathlib import Path
-from junitparser import JUnitXml, TestSuite, TestCase
+from typing import TYPE_CHECKING
 
+if TYPE_CHECKING:
+    from junitparser import TestSuite
 
-def _extract_failing_tests_from_suite(suite: TestSuite) -> TestSuite | None:
+
+def _extract_failing_tests_from_suite(suite: "TestSuite") -> "TestSuite | None":
     """
     Extract failing tests from a test suite.
 
@@ -14,6 +17,8 @@ def _extract_failing_tests_from_suite(suite: TestSuite) -> TestSuite | None:
     Returns:
         New TestSuite containing only failing tests, or None if no failures
     """
+    from junitparser import TestSuite, TestCase  # pylint: disable=import-outside-toplevel
+
     failing_tests = []
 
     for test in suite:
@@ -32,7 +37,7 @@ def _extract_failing_tests_from_suite(suite: TestSuite) -> TestSuite | None:
     return new_suite
 
 
-def get_failing_test_suites(path) -> list[TestSuite]:
+def get_failing_test_suites(path) -> list["TestSuite"]:
     """
     Parse all XML files in the given directory and return test suites containing only failing tests.
 
@@ -42,6 +47,8 @@ def get_failing_test_suites(path) -> list[TestSuite]:
     Returns:
         List of TestSuite objects containing only failing tests
     """
+    from junitparser import JUnitXml, TestSuite  # pylint: disable=import-outside-toplevel
+
     failing_suites = []
     xml_files = Path(path).glob("*.xml")
 
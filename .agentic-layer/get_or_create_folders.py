@@ -8,12 +8,11 @@
 import os
 from pathlib import Path
 from datetime import datetime
-from dotenv import load_dotenv
-
-load_dotenv()
+from env_loader import load_env
 
 def get_or_create_run_folder(run_id):
     """Creates a folder for the given run ID in the configured run directory."""
+    load_env()
     run_directory = os.getenv('RUN_DIRECTORY')
 
     if not run_directory:
@@ -36,7 +35,7 @@ def get_log_file_path(run_id: str) -> Path:
     """Generate log file path for the given run ID."""
     run_path = get_or_create_run_folder(run_id)
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    return run_path / f"{run_id}_adw_{timestamp}.log"
+    return run_path / f"{run_id}_adw_{timestamp}.jsonl"
 
 def get_or_create_review_folder(run_id):
     """Creates a 'review' folder inside the run folder for the given run ID."""
@@ -45,3 +44,27 @@ def get_or_create_review_folder(run_id):
     review_path.mkdir(parents=True, exist_ok=True)
 
     return review_path
+
+def get_or_create_transcript_folder(run_id):
+    """Creates a 'transcripts' folder inside the run folder for the given run ID."""
+    run_path = get_or_create_run_folder(run_id)
+    transcript_path = run_path / "transcripts"
+    transcript_path.mkdir(parents=True, exist_ok=True)
+
+    return transcript_path
+
+def get_or_create_repo_map_folder(run_id):
+    """Creates a 'repo_map' folder inside the run folder for the given run ID."""
+    run_path = get_or_create_run_folder(run_id)
+    repo_map_path = run_path / "repo_map"
+    repo_map_path.mkdir(parents=True, exist_ok=True)
+
+    return repo_map_path
+
+def get_or_create_args_folder(run_id):
+    """Creates an 'args' folder inside the run folder for the given run ID."""
+    run_path = get_or_create_run_folder(run_id)
+    args_path = run_path / "args"
+    args_path.mkdir(parents=True, exist_ok=True)
+
+    return args_path
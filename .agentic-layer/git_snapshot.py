@@ -0,0 +1,430 @@
+"""Git working-tree snapshots for ADW.
+
+A snapshot is the git tree object of the current working tree, including
+untracked (but not ignored) files. It is written through a temporary index so
+neither the real index nor the working tree is modified, which lets loops
+diff what an agent changed between two points in time.
+
+The run directory (RUN_DIRECTORY) is excluded from snapshots, so ADW's own
+artifacts never show up in diffs and are never touched by a restore.
+"""
+
+import hashlib
+import os
+import shutil
+import subprocess
+import tempfile
+from pathlib import Path
+
+BASE_TREE_FILE_NAME = "base_tree"
+# Ignored directories with installed dependencies that worktrees lack
+DEPENDENCY_DIRECTORIES = (".venv", "venv", "node_modules")
+
+
+def _run_git(args: list[str], env: dict | None = None, cwd: str | None = None) -> str:
+    """Run a git command and return its stdout, raising RuntimeError on failure."""
+    try:
+        result = subprocess.run(
+            ["git", *args],
+            check=True,
+            capture_output=True,
+            text=True,
+            encoding="utf-8",
+            errors="replace",
+            env=env,
+            cwd=cwd
+        )
+    except FileNotFoundError as e:
+        raise RuntimeError("git executable not found") from e
+    except subprocess.CalledProcessError as e:
+        raise RuntimeError(f"git {' '.join(args)} failed: {e.stderr.strip()}") from e
+    return result.stdout
+
+
+def _run_directory_pathspec(top_level: Path) -> str | None:
+    """Return the run directory relative to the repository root, if inside it."""
+    run_directory = os.getenv('RUN_DIRECTORY')
+    if not run_directory:
+        return None
+    try:
+        relative = Path(run_directory).resolve().relative_to(top_level.resolve())
+    except ValueError:
+        return None
+    return relative.as_posix() if relative.parts else None
+
+
+def repository_root(cwd: str | None = None) -> Path:
+    """
+    Return the top-level directory of the repository.
+
+    Args:
+        cwd: Directory inside the repository (default: current directory)
+
+    Raises:
+        RuntimeError: If git is unavailable or the directory is not a repository
+    """
+    return Path(_run_git(["rev-parse", "--show-toplevel"], cwd=cwd).strip())
+
+
+def _without_run_directory(paths, top_level: Path) -> list[str]:
+    """Drop empty paths and paths inside the run directory, and sort the rest."""
+    excluded = _run_directory_pathspec(top_level)
+    return sorted(
+        path for path in set(paths)
+        if path and not (excluded and (path == excluded or path.startswith(f"{excluded}/")))
+    )
+
+
+def _is_ignored(path: str, top_level: Path) -> bool:
+    """Return whether git ignores the given repository-relative path."""
+    result = subprocess.run(
+        ["git", "check-ignore", "-q", "--", path],
+        capture_output=True, cwd=str(top_level), check=False
+    )
+    return result.returncode == 0
+
+
+def snapshot_worktree(cwd: str | None = None) -> str:
+    """
+    Record the current working tree as a git tree object.
+
+    Args:
+        cwd: Repository directory (default: current directory)
+
+    Returns:
+        str: Hash of the tree object
+
+    Raises:
+        RuntimeError: If git is unavailable or the directory is not a repository
+    """
+    top_level = Path(_run_git(["rev-parse", "--show-toplevel"], cwd=cwd).strip())
+    index_path = Path(_run_git(["rev-parse", "--git-path", "index"], cwd=cwd).strip())
+    if cwd and not index_path.is_absolute():
+        index_path = Path(cwd) / index_path
+    excluded = _run_directory_pathspec(top_level)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp_index = Path(temp_dir) / "index"
+        # Seeding from the real index reuses its stat cache, keeping `add -A` fast
+        if index_path.exists():
+            shutil.copyfile(index_path, temp_index)
+        env = {**os.environ, "GIT_INDEX_FILE": str(temp_index)}
+        if excluded:
+            _run_git(
+                ["rm", "-r", "-q", "--cached", "--ignore-unmatch", "--", excluded],
+                env=env, cwd=str(top_level)
+            )
+            # git refuses an exclude pathspec naming an ignored directory
+            if _is_ignored(excluded, top_level):
+                _run_git(["add", "-A"], env=env, cwd=str(top_level))
+            else:
+                _run_git(["add", "-A", "--", ".", f":(exclude){excluded}"], env=env, cwd=str(top_level))
+        else:
+            _run_git(["add", "-A"], env=env, cwd=cwd)
+        return _run_git(["write-tree"], env=env, cwd=cwd).strip()
+
+
+def worktree_fingerprint(cwd: str | None = None) -> str:
+    """
+    Return a cheap fingerprint of the working tree's state.
+
+    Unlike snapshot_worktree(), no objects are written: the fingerprint
+    combines HEAD with the status, size and modification time of every
+    changed file. It changes whenever a file is edited, which makes it a
+    cheap cache key, but equal trees may have different fingerprints.
+
+    Args:
+        cwd: Repository directory (default: current directory)
+
+    Returns:
+        str: Hex digest of the working tree's state
+
+    Raises:
+        RuntimeError: If git is unavailable or the directory is not a repository
+    """
+    top_level = repository_root(cwd)
+    try:
+        head = _run_git(["rev-parse", "HEAD"], cwd=str(top_level)).strip()
+    except RuntimeError:
+        head = ""  # No commit yet
+    status = _run_git(
+        ["status", "--porcelain", "-z", "--untracked-files=all"], cwd=str(top_level)
+    ).split("\0")
+    changes = {}
+    index = 0
+    while index < len(status):
+        entry = status[index]
+        index += 1
+        if len(entry) < 4:
+            continue
+        changes[entry[3:]] = entry[:2]
+        if entry[0] in "RC":
+            index += 1  # The original path of a rename or copy follows
+    digest = hashlib.sha1(head.encode("utf-8"))
+    for path in _without_run_directory(changes, top_level):
+        try:
+            stat = (top_level / path).stat()
+            state = f"{stat.st_size}:{stat.st_mtime_ns}"
+        except OSError:
+            state = "missing"
+        digest.update(f"\0{changes[path]} {path} {state}".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def diff_snapshots(old_tree: str, new_tree: str, cwd: str | None = None) -> str:
+    """
+    Return the unified diff between two snapshots.
+
+    Args:
+        old_tree: Tree hash of the earlier snapshot
+        new_tree: Tree hash of the later snapshot
+        cwd: Repository directory (default: current directory)
+
+    Returns:
+        str: Unified diff text (empty if the snapshots are identical)
+    """
+    return _run_git(["diff", "--no-color", "--binary", old_tree, new_tree], cwd=cwd)
+
+
+def changed_files(old_tree: str, new_tree: str, cwd: str | None = None) -> list[str]:
+    """
+    Return the paths that differ between two snapshots.
+
+    Args:
+        old_tree: Tree hash of the earlier snapshot
+        new_tree: Tree hash of the later snapshot
+        cwd: Repository directory (default: current directory)
+
+    Returns:
+        list[str]: Repository-relative paths of changed files
+    """
+    output = _run_git(["diff", "--name-only", old_tree, new_tree], cwd=cwd)
+    return [line for line in output.splitlines() if line]
+
+
+def record_base_tree(run_folder: str | Path, cwd: str | None = None) -> str:
+    """
+    Record the working tree a run starts from, unless it is already recorded.
+
+    Later phases diff against this tree to find everything the run changed,
+    committed or not, even in a detached worktree.
+
+    Args:
+        run_folder: Run folder to store the tree hash in
+        cwd: Repository directory (default: current directory)
+
+    Returns:
+        str: Hash of the base tree
+
+    Raises:
+        RuntimeError: If git is unavailable or the directory is not a repository
+    """
+    existing = read_base_tree(run_folder)
+    if existing:
+        return existing
+    tree = snapshot_worktree(cwd)
+    (Path(run_folder) / BASE_TREE_FILE_NAME).write_text(tree + "\n", encoding="utf-8")
+    return tree
+
+
+def read_base_tree(run_folder: str | Path) -> str | None:
+    """Return the base tree recorded for a run, or None if there is none."""
+    path = Path(run_folder) / BASE_TREE_FILE_NAME
+    if not path.exists():
+        return None
+    return path.read_text(encoding="utf-8").strip() or None
+
+
+def branch_changed_files(
+    base_ref: str | None = None, cwd: str | None = None, base_tree: str | None = None
+) -> list[str]:
+    """
+    Return the existing files changed on the current branch.
+
+    With base_tree, this is every difference between that tree and the
+    current working tree. Otherwise it covers committed changes since the
+    merge base with base_ref (if given), staged and unstaged changes, and
+    untracked files. Deleted files and the run directory are left out.
+
+    Args:
+        base_ref: Branch the run started from (default: only uncommitted changes)
+        cwd: Repository directory (default: current directory)
+        base_tree: Tree the run started from, see record_base_tree()
+
+    Returns:
+        list[str]: Repository-relative paths of changed files, sorted
+    """
+    top_level = Path(_run_git(["rev-parse", "--show-toplevel"], cwd=cwd).strip())
+    if base_tree:
+        paths = set(_run_git(
+            ["diff", "--name-only", "--diff-filter=d", base_tree, snapshot_worktree(cwd)],
+            cwd=str(top_level)
+        ).splitlines())
+        return _without_run_directory(paths, top_level)
+
+    base = "HEAD"
+    if base_ref:
+        try:
+            base = _run_git(["merge-base", base_ref, "HEAD"], cwd=cwd).strip()
+        except RuntimeError:
+            # A detached snapshot commit shares no history with the branch
+            base = base_ref
+
+    paths = set(
+        _run_git(["diff", "--name-only", "--diff-filter=d", base], cwd=str(top_level)).splitlines()
+    )
+    paths.update(
+        _run_git(["ls-files", "--others", "--exclude-standard"], cwd=str(top_level)).splitlines()
+    )
+    return _without_run_directory(paths, top_level)
+
+
+def list_worktree_files(cwd: str | None = None) -> list[str]:
+    """
+    Return all tracked and untracked (but not ignored) files of the working tree.
+
+    Args:
+        cwd: Repository directory (default: current directory)
+
+    Returns:
+        list[str]: Repository-relative paths outside the run directory, sorted
+    """
+    top_level = repository_root(cwd)
+    output = _run_git(
+        ["ls-files", "--cached", "--others", "--exclude-standard"], cwd=str(top_level)
+    )
+    return [
+        path for path in _without_run_directory(output.splitlines(), top_level)
+        if (top_level / path).is_file()
+    ]
+
+
+def restore_snapshot(tree: str, cwd: str | None = None) -> None:
+    """
+    Restore the working tree to a snapshot.
+
+    Files that were added after the snapshot are deleted and all files of the
+    snapshot are written back. The real index is left untouched.
+
+    Args:
+        tree: Tree hash of the snapshot to restore
+        cwd: Repository directory (default: current directory)
+
+    Raises:
+        RuntimeError: If git is unavailable or the snapshot cannot be read
+    """
+    current = snapshot_worktree(cwd)
+    top_level = Path(_run_git(["rev-parse", "--show-toplevel"], cwd=cwd).strip())
+    added = _run_git(["diff", "--name-only", "--diff-filter=A", tree, current], cwd=cwd)
+    for path in added.splitlines():
+        if path:
+            (top_level / path).unlink(missing_ok=True)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        env = {**os.environ, "GIT_INDEX_FILE": str(Path(temp_dir) / "index")}
+        _run_git(["read-tree", tree], env=env, cwd=cwd)
+        _run_git(["checkout-index", "--all", "--force"], env=env, cwd=str(top_level))
+
+
+def add_worktree(path: str, tree: str, cwd: str | None = None) -> None:
+    """
+    Check out a snapshot into a new detached git worktree.
+
+    Args:
+        path: Directory for the new worktree (must not exist or be empty)
+        tree: Tree hash of the snapshot to check out
+        cwd: Repository directory (default: current directory)
+
+    Raises:
+        RuntimeError: If the worktree cannot be created
+    """
+    # A throwaway commit is needed because worktrees check out commits, not trees
+    env = {
+        **os.environ,
+        "GIT_AUTHOR_NAME": "ADW", "GIT_AUTHOR_EMAIL": "adw@localhost",
+        "GIT_COMMITTER_NAME": "ADW", "GIT_COMMITTER_EMAIL": "adw@localhost",
+    }
+    commit = _run_git(["commit-tree", tree, "-m", "ADW snapshot"], env=env, cwd=cwd).strip()
+    _run_git(["worktree", "add", "--detach", path, commit], cwd=cwd)
+
+
+def remove_worktree(path: str, cwd: str | None = None) -> None:
+    """
+    Remove a worktree created with add_worktree, discarding its changes.
+
+    Args:
+        path: Directory of the worktree
+        cwd: Repository directory (default: current directory)
+    """
+    _run_git(["worktree", "remove", "--force", path], cwd=cwd)
+
+
+def link_dependency_directories(
+    path: str, names: tuple[str, ...] = DEPENDENCY_DIRECTORIES, cwd: str | None = None
+) -> list[str]:
+    """
+    Symlink ignored dependency directories of the repository into a worktree.
+
+    A worktree only contains tracked and untracked files, so installed
+    dependencies (virtual environments, node_modules) are missing there. Only
+    top-level directories that git ignores are linked, and the links are
+    ignored in the worktree too, so they never show up in snapshots.
+
+    Args:
+        path: Directory of the worktree
+        names: Top-level directory names to link
+        cwd: Repository directory (default: current directory)
+
+    Returns:
+        list[str]: Names of the linked directories
+    """
+    top_level = Path(_run_git(["rev-parse", "--show-toplevel"], cwd=cwd).strip())
+    linked = []
+    for name in names:
+        source = top_level / name
+        link = Path(path) / name
+        if not source.is_dir() or link.exists() or not _is_ignored(name, top_level):
+            continue
+        try:
+            link.symlink_to(source, target_is_directory=True)
+        except OSError:
+            continue
+        # Directory-only patterns like "node_modules/" do not match a symlink
+        if not _is_ignored(name, Path(path)):
+            exclude_path = Path(_run_git(["rev-parse", "--git-path", "info/exclude"], cwd=path).strip())
+            if not exclude_path.is_absolute():
+                exclude_path = Path(path) / exclude_path
+            exclude_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(exclude_path, "a", encoding="utf-8") as f:
+                f.write(f"/{name}\n")
+        linked.append(name)
+    return linked
+
+
+def apply_diff(diff_text: str, cwd: str | None = None) -> bool:
+    """
+    Apply a diff to the working tree if it applies cleanly.
+
+    Args:
+        diff_text: Unified diff produced by diff_snapshots
+        cwd: Repository directory (default: current directory)
+
+    Returns:
+        bool: True if the diff was applied, False if it does not apply cleanly
+              (the working tree is left unchanged in that case)
+    """
+    if not diff_text.strip():
+        return True
+    top_level = _run_git(["rev-parse", "--show-toplevel"], cwd=cwd).strip()
+    with tempfile.NamedTemporaryFile("w", suffix=".diff", delete=False, encoding="utf-8") as f:
+        f.write(diff_text)
+        patch_path = f.name
+    try:
+        try:
+            _run_git(["apply", "--check", "--binary", patch_path], cwd=top_level)
+        except RuntimeError:
+            return False
+        _run_git(["apply", "--binary", patch_path], cwd=top_level)
+        return True
+    finally:
+        os.unlink(patch_path)
@@ -0,0 +1,172 @@
+"""Group review issues by the files they touch.
+
+Issues that share a file end up in the same group so they are patched one
+after another, while disjoint groups can be patched concurrently. Issues for
+which no file can be determined are returned separately, since they may touch
+anything and must not run alongside other patches.
+
+Reviews refer to the same file in different ways ("models.py",
+"./src/app/models.py", "/repo/src/app/models.py"). Given the repository root
+and its files, references are mapped onto repository-relative paths first, so
+those issues land in the same group.
+"""
+
+import os
+import posixpath
+import re
+from collections.abc import Iterable
+from pathlib import Path
+
+# Keys a review issue may use to list the files it concerns
+_FILE_KEYS = ("issue_files", "files", "file_path", "file")
+
+# File-like tokens with a known source extension, optionally with a directory
+_FILE_PATTERN = re.compile(
+    r"(?<![\w/.-])((?:[\w.-]+/)*[\w-][\w.-]*\."
+    r"(?:py|pyi|js|jsx|ts|tsx|mjs|cjs|vue|svelte|go|rs|java|kt|cs|rb|php|c|h|cpp|hpp|"
+    r"swift|scala|sh|sql|html|css|scss|json|yaml|yml|toml|ini|cfg|md))(?![\w/-])"
+)
+
+
+def extract_issue_files(issue: dict) -> frozenset[str]:
+    """
+    Determine the files a review issue refers to.
+
+    Explicit file fields are used when present; otherwise file paths are
+    extracted from the issue description and resolution text.
+
+    Args:
+        issue: Review issue dictionary from review.json
+
+    Returns:
+        Normalized relative file paths (may be empty)
+    """
+    files = set()
+    for key in _FILE_KEYS:
+        value = issue.get(key)
+        if isinstance(value, str):
+            files.add(value)
+        elif isinstance(value, list):
+            files.update(item for item in value if isinstance(item, str))
+
+    if not files:
+        text = f"{issue.get('issue_description') or ''}\n{issue.get('issue_resolution') or ''}"
+        files.update(match.group(1) for match in _FILE_PATTERN.finditer(text))
+
+    return frozenset(
+        path.strip().replace("\\", "/").removeprefix("./") for path in files if path.strip()
+    )
+
+
+def _index_by_name(known_files: Iterable[str]) -> dict[str, list[str]]:
+    """Index repository-relative paths by their file name."""
+    by_name: dict[str, list[str]] = {}
+    for path in known_files:
+        by_name.setdefault(posixpath.basename(path), []).append(path)
+    return by_name
+
+
+def _normalize(
+    files: Iterable[str], root: Path | None, by_name: dict[str, list[str]] | None
+) -> frozenset[str]:
+    """
+    Map the file references of an issue onto repository-relative paths.
+
+    Absolute paths inside root are made relative to it, and "." and ".."
+    segments are resolved. A reference that is not one of the known files
+    indexed in by_name is matched by path suffix, e.g. "models.py" or
+    "app/models.py" for "src/app/models.py". A reference matching several
+    files refers to all of them; one matching none is kept, since the patch
+    may create it.
+    """
+    normalized = set()
+    for path in files:
+        if root is not None and os.path.isabs(path):
+            try:
+                path = Path(path).resolve().relative_to(root.resolve()).as_posix()
+            except ValueError:
+                pass  # Outside the repository; keep as is
+        path = posixpath.normpath(path.replace("\\", "/")).removeprefix("./")
+        if by_name is None:
+            normalized.add(path)
+            continue
+        matches = [
+            candidate for candidate in by_name.get(posixpath.basename(path), [])
+            if candidate == path or candidate.endswith(f"/{path}")
+        ]
+        # Ambiguous references touch every match; unknown ones may be new files
+        normalized.update(matches or [path])
+    return frozenset(normalized)
+
+
+def group_issues_by_files(
+    issues: list[dict], root: Path | None = None, known_files: Iterable[str] | None = None
+) -> tuple[list[list[dict]], list[dict]]:
+    """
+    Partition issues into groups of overlapping files.
+
+    Two issues belong to the same group when they share a file, directly or
+    through other issues.
+
+    Args:
+        issues: Review issue dictionaries
+        root: Repository root, to relate absolute paths to known_files
+        known_files: Repository-relative paths of the repository's files; file
+                     references are matched against them before grouping
+
+    Returns:
+        Tuple of (file groups in original issue order, issues without files)
+    """
+    by_name = _index_by_name(known_files) if known_files is not None else None
+    parent = list(range(len(issues)))
+
+    def find(index: int) -> int:
+        while parent[index] != index:
+            parent[index] = parent[parent[index]]
+            index = parent[index]
+        return index
+
+    owner_by_file: dict[str, int] = {}
+    unscoped_indices = set()
+    for index, issue in enumerate(issues):
+        files = _normalize(extract_issue_files(issue), root, by_name)
+        if not files:
+            unscoped_indices.add(index)
+            continue
+        for path in files:
+            if path in owner_by_file:
+                parent[find(index)] = find(owner_by_file[path])
+            else:
+                owner_by_file[path] = index
+
+    groups: dict[int, list[dict]] = {}
+    unscoped = []
+    for index, issue in enumerate(issues):
+        if index in unscoped_indices:
+            unscoped.append(issue)
+        else:
+            groups.setdefault(find(index), []).append(issue)
+
+    return list(groups.values()), unscoped
+
+
+def merge_issue_descriptions(issues: list[dict]) -> str:
+    """
+    Combine several review issues into a single patch description.
+
+    Args:
+        issues: Review issues to merge
+
+    Returns:
+        Description listing every issue with its resolution
+    """
+    if len(issues) == 1:
+        issue = issues[0]
+        return f"Issue: {issue.get('issue_description')}\nResolution: {issue.get('issue_resolution')}"
+
+    sections = [
+        f"Issue #{issue.get('review_issue_number')}: {issue.get('issue_description')}\n"
+        f"Resolution: {issue.get('issue_resolution')}"
+        for issue in issues
+    ]
+    return "Fix all of the following issues.\n\n" + "\n\n".join(sections)
@@ -0,0 +1,281 @@
+"""Coding agent backend for local OpenAI-compatible inference servers.
+
+Runs a slash command against a chat completions endpoint such as Ollama,
+vLLM, llama.cpp or LM Studio. The command prompt is read from
+``.claude/commands/<command>.md`` with its arguments substituted, and the
+model works through three file tools (read_file, write_file, list_directory)
+until it answers without calling a tool.
+
+The local backend cannot run shell commands. It suits cheap, high-volume
+steps that only read and write files, such as classify and branch_name (see
+ADW_COMMAND_BACKENDS in agent_backends).
+
+Configuration (environment variables):
+    ADW_LOCAL_BASE_URL: Base URL of the server (default: Ollama on localhost)
+    ADW_LOCAL_MODEL: Model name; Claude model names such as "sonnet" are ignored
+    ADW_LOCAL_API_KEY: Bearer token, if the server needs one
+    ADW_LOCAL_MAX_TURNS: Maximum model turns per call
+    ADW_LOCAL_TIMEOUT: Timeout of one request in seconds
+"""
+
+import asyncio
+import json
+import logging
+import os
+import re
+import urllib.error
+import urllib.request
+from functools import partial
+from pathlib import Path
+
+from agent_backends import AgentBackend, AgentRequest
+from transcript_store import TranscriptWriter
+
+DEFAULT_BASE_URL = "http://localhost:11434/v1"
+DEFAULT_MODEL = "qwen2.5-coder:7b"
+DEFAULT_MAX_TURNS = 20
+DEFAULT_TIMEOUT_SECONDS = 300
+MAX_READ_CHARS = 100_000
+MAX_LISTED_ENTRIES = 500
+
+SYSTEM_PROMPT = (
+    "You are a coding agent working in a software repository. Use the provided tools "
+    "to read and write files; relative paths are relative to the repository root. "
+    "Do exactly what the task asks. When the task is done, reply with a short summary "
+    "and no tool call."
+)
+
+TOOLS = [
+    {
+        "type": "function",
+        "function": {
+            "name": "read_file",
+            "description": "Read a text file.",
+            "parameters": {
+                "type": "object",
+                "properties": {"path": {"type": "string", "description": "File path"}},
+                "required": ["path"],
+            },
+        },
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "write_file",
+            "description": "Create or overwrite a text file with the given content.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "path": {"type": "string", "description": "File path"},
+                    "content": {"type": "string", "description": "Complete new file content"},
+                },
+                "required": ["path", "content"],
+            },
+        },
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "list_directory",
+            "description": "List the entries of a directory.",
+            "parameters": {
+                "type": "object",
+                "properties": {"path": {"type": "string", "description": "Directory path"}},
+                "required": ["path"],
+            },
+        },
+    },
+]
+
+_FRONTMATTER_PATTERN = re.compile(r"\A---\n.*?\n---\n", re.DOTALL)
+
+
+def _env_number(name: str, default: int) -> int:
+    """Read a positive integer from the environment, falling back to a default."""
+    try:
+        value = int(os.getenv(name) or default)
+    except ValueError:
+        return default
+    return value if value > 0 else default
+
+
+def load_command_prompt(slash_command: str, arguments: list[str], cwd: str | None = None) -> str:
+    """
+    Build the prompt of a slash command as Claude Code would.
+
+    ``$ARGUMENTS`` is replaced by all arguments and ``$1``, ``$2``, ... by
+    single ones.
+
+    Args:
+        slash_command: Command name without slash
+        arguments: Command arguments
+        cwd: Repository directory (default: current directory)
+
+    Returns:
+        str: Prompt text
+
+    Raises:
+        FileNotFoundError: If the command file does not exist
+    """
+    command_file = Path(cwd or ".") / ".claude" / "commands" / f"{slash_command}.md"
+    if not command_file.exists():
+        raise FileNotFoundError(f"Slash command file not found: {command_file}")
+    text = _FRONTMATTER_PATTERN.sub("", command_file.read_text(encoding="utf-8"))
+    text = text.replace("$ARGUMENTS", " ".join(arguments))
+    return re.sub(
+        r"\$(\d+)",
+        lambda match: arguments[int(match.group(1)) - 1]
+        if 0 < int(match.group(1)) <= len(arguments) else match.group(0),
+        text
+    )
+
+
+class LocalWorkspace:
+    """File tools of the local agent, limited to the repository and the run directory."""
+
+    def __init__(self, cwd: str | None = None):
+        self.root = Path(cwd or ".").resolve()
+        self.allowed_roots = [self.root]
+        run_directory = os.getenv("RUN_DIRECTORY")
+        if run_directory:
+            self.allowed_roots.append((self.root / run_directory).resolve())
+
+    def _resolve(self, path: str) -> Path:
+        resolved = (self.root / path).resolve()
+        if not any(resolved.is_relative_to(root) for root in self.allowed_roots):
+            raise PermissionError(f"{path} is outside the repository")
+        return resolved
+
+    def read_file(self, path: str) -> str:
+        """Return a file's content, truncated to MAX_READ_CHARS."""
+        text = self._resolve(path).read_text(encoding="utf-8", errors="replace")
+        if len(text) > MAX_READ_CHARS:
+            return text[:MAX_READ_CHARS] + f"\n[truncated, {len(text)} characters in total]"
+        return text
+
+    def write_file(self, path: str, content: str) -> str:
+        """Write a file, creating its parent directories."""
+        target = self._resolve(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(content, encoding="utf-8")
+        return f"Wrote {len(content)} characters to {path}"
+
+    def list_directory(self, path: str) -> str:
+        """List a directory, marking subdirectories with a trailing slash."""
+        entries = sorted(
+            f"{entry.name}/" if entry.is_dir() else entry.name
+            for entry in self._resolve(path).iterdir() if entry.name != ".git"
+        )
+        return "\n".join(entries[:MAX_LISTED_ENTRIES]) or "(empty)"
+
+    def run_tool(self, name: str, raw_arguments: str) -> str:
+        """
+        Run a tool call of the model.
+
+        Errors are returned as text so that the model can correct itself.
+        """
+        tool = {
+            "read_file": self.read_file,
+            "write_file": self.write_file,
+            "list_directory": self.list_directory,
+        }.get(name)
+        if tool is None:
+            return f"Error: unknown tool '{name}'"
+        try:
+            arguments = json.loads(raw_arguments or "{}")
+            return tool(**arguments)
+        except (ValueError, TypeError, OSError) as e:
+            return f"Error: {e}"
+
+
+def _post_chat_completion(url: str, payload: dict, api_key: str | None, timeout: float) -> dict:
+    """
+    Send a chat completions request.
+
+    Raises:
+        RuntimeError: If the server is unreachable or answers with an error
+    """
+    headers = {"Content-Type": "application/json"}
+    if api_key:
+        headers["Authorization"] = f"Bearer {api_key}"
+    request = urllib.request.Request(
+        url, data=json.dumps(payload).encode("utf-8"), headers=headers, method="POST"
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return json.loads(response.read().decode("utf-8"))
+    except urllib.error.HTTPError as e:
+        body = e.read().decode("utf-8", errors="replace")[:500]
+        raise RuntimeError(f"Local model server returned HTTP {e.code}: {body}") from e
+    except (urllib.error.URLError, OSError, ValueError) as e:
+        raise RuntimeError(f"Local model server request to {url} failed: {e}") from e
+
+
+async def _execute_local_agent(
+    prompt: str, transcript: TranscriptWriter | None = None, cwd: str | None = None
+) -> None:
+    """Run the tool loop of a local model until it answers without a tool call."""
+    logger = logging.getLogger(__name__)
+    base_url = os.getenv("ADW_LOCAL_BASE_URL", DEFAULT_BASE_URL).rstrip("/")
+    model = os.getenv("ADW_LOCAL_MODEL", DEFAULT_MODEL)
+    max_turns = _env_number("ADW_LOCAL_MAX_TURNS", DEFAULT_MAX_TURNS)
+    timeout = _env_number("ADW_LOCAL_TIMEOUT", DEFAULT_TIMEOUT_SECONDS)
+    workspace = LocalWorkspace(cwd)
+    messages = [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": prompt},
+    ]
+    usage = {"input_tokens": 0, "output_tokens": 0}
+    logger.info("Executing local model %s at %s", model, base_url)
+
+    for turn in range(1, max_turns + 1):
+        response = await asyncio.to_thread(
+            _post_chat_completion,
+            f"{base_url}/chat/completions",
+            {"model": model, "messages": messages, "tools": TOOLS},
+            os.getenv("ADW_LOCAL_API_KEY"),
+            timeout
+        )
+        response_usage = response.get("usage") or {}
+        usage["input_tokens"] += response_usage.get("prompt_tokens", 0)
+        usage["output_tokens"] += response_usage.get("completion_tokens", 0)
+        try:
+            message = response["choices"][0]["message"]
+        except (KeyError, IndexError, TypeError) as e:
+            raise RuntimeError(f"Unexpected response from local model server: {response}") from e
+
+        messages.append(message)
+        if transcript is not None:
+            transcript.write({"type": "assistant", "message": message})
+        tool_calls = message.get("tool_calls") or []
+        if not tool_calls:
+            if transcript is not None:
+                transcript.write({
+                    "type": "result", "subtype": "success", "model": model,
+                    "num_turns": turn, "usage": usage,
+                })
+            logger.info("Local model finished after %s turn(s)", turn)
+            return
+
+        for tool_call in tool_calls:
+            function = tool_call.get("function") or {}
+            result = workspace.run_tool(function.get("name", ""), function.get("arguments", ""))
+            logger.debug("Local agent tool %s: %s", function.get("name"), result[:200])
+            messages.append({"role": "tool", "tool_call_id": tool_call.get("id"), "content": result})
+            if transcript is not None:
+                transcript.write({"type": "tool_result", "tool": function.get("name"), "content": result})
+
+    raise RuntimeError(f"Local model did not finish within {max_turns} turns")
+
+
+def prepare_local_agent(request: AgentRequest):
+    """Build the call that runs a slash command on the local model."""
+    prompt = load_command_prompt(request.slash_command, request.arguments, request.cwd)
+    return partial(_execute_local_agent, prompt, cwd=request.cwd)
+
+
+LOCAL_BACKEND = AgentBackend(
+    name="local",
+    prepare=prepare_local_agent,
+    description="Local OpenAI-compatible inference server (file tools only)",
+)
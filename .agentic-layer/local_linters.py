@@ -0,0 +1,257 @@
+"""Local linter and formatter fast path for the linting phase.
+
+Runs the project's linters and formatters directly on the files changed on
+the run's branch, auto-fixing what they can, and returns the remaining
+violations in a structured form. Only tools found on PATH are used, and
+``ADW_LINTERS`` (comma-separated names) restricts the set further.
+
+Tools that rewrite files run first, one after another per language and
+concurrently across languages. Read-only checkers then run concurrently.
+``lint_file`` runs only the rewriting tools on a single file, which is fast
+enough to do after every agent edit. It leaves unused imports and variables
+alone, since code written mid-implementation often uses them only later.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import re
+import shutil
+from pathlib import Path
+from typing import Callable, NamedTuple
+
+LINTER_TIMEOUT_SECONDS = 300
+
+_MYPY_LINE_PATTERN = re.compile(
+    r"^(?P<file>[^:\n]+):(?P<line>\d+):(?:(?P<column>\d+):)? (?P<severity>error|warning): "
+    r"(?P<message>.*?)(?:\s+\[(?P<code>[\w-]+)\])?$"
+)
+
+
+def parse_ruff_output(output: str) -> list[dict]:
+    """Parse `ruff check --output-format json` output into violations."""
+    if not output.strip():
+        return []
+    return [
+        {
+            "file": item.get("filename"),
+            "line": (item.get("location") or {}).get("row"),
+            "column": (item.get("location") or {}).get("column"),
+            "code": item.get("code"),
+            "message": item.get("message"),
+        }
+        for item in json.loads(output)
+    ]
+
+
+def parse_mypy_output(output: str) -> list[dict]:
+    """Parse mypy's `file:line:column: error: message [code]` lines into violations."""
+    violations = []
+    for line in output.splitlines():
+        match = _MYPY_LINE_PATTERN.match(line.strip())
+        if match and match.group("severity") == "error":
+            violations.append({
+                "file": match.group("file"),
+                "line": int(match.group("line")),
+                "column": int(match.group("column")) if match.group("column") else None,
+                "code": match.group("code"),
+                "message": match.group("message"),
+            })
+    return violations
+
+
+def parse_eslint_output(output: str) -> list[dict]:
+    """Parse `eslint --format json` output into violations."""
+    if not output.strip():
+        return []
+    return [
+        {
+            "file": result.get("filePath"),
+            "line": message.get("line"),
+            "column": message.get("column"),
+            "code": message.get("ruleId"),
+            "message": message.get("message"),
+        }
+        for result in json.loads(output)
+        for message in result.get("messages", [])
+    ]
+
+
+class LinterSpec(NamedTuple):
+    """How to run one linter or formatter on a set of files."""
+    name: str
+    executable: str
+    args: list[str]
+    extensions: tuple[str, ...]
+    language: str
+    writes_files: bool
+    parse: Callable[[str], list[dict]] | None
+
+
+LINTERS = [
+    LinterSpec(
+        "ruff", "ruff", ["check", "--fix", "--output-format", "json"],
+        (".py", ".pyi"), "python", True, parse_ruff_output
+    ),
+    LinterSpec("ruff-format", "ruff", ["format"], (".py", ".pyi"), "python", True, None),
+    LinterSpec(
+        "mypy", "mypy",
+        ["--no-error-summary", "--show-column-numbers", "--no-pretty", "--hide-error-context"],
+        (".py",), "python", False, parse_mypy_output
+    ),
+    LinterSpec(
+        "eslint", "eslint", ["--fix", "--format", "json"],
+        (".js", ".jsx", ".ts", ".tsx", ".mjs", ".cjs", ".vue"), "javascript", True,
+        parse_eslint_output
+    ),
+    LinterSpec(
+        "prettier", "prettier", ["--write"],
+        (".js", ".jsx", ".ts", ".tsx", ".css", ".scss", ".json", ".md", ".yaml", ".yml"),
+        "javascript", True, None
+    ),
+]
+
+
+# Arguments used while the agent is still editing: no unsafe fixes, and unused
+# imports and variables are reported but not removed
+ON_WRITE_ARGS = {
+    "ruff": [
+        "check", "--fix", "--no-unsafe-fixes", "--unfixable", "F401,F841",
+        "--output-format", "json"
+    ],
+}
+
+
+def configured_linters() -> list[LinterSpec]:
+    """Return the linters that are enabled and installed."""
+    selected = os.getenv("ADW_LINTERS")
+    names = {name.strip() for name in selected.split(",")} if selected else None
+    return [
+        spec for spec in LINTERS
+        if (names is None or spec.name in names) and shutil.which(spec.executable)
+    ]
+
+
+async def _run_linter(spec: LinterSpec, files: list[str], cwd: str | None) -> list[dict]:
+    """Run one linter on its files and return the violations it reports."""
+    logger = logging.getLogger(__name__)
+    logger.info("Running %s on %s file(s)", spec.name, len(files))
+    process = await asyncio.create_subprocess_exec(
+        shutil.which(spec.executable), *spec.args, *files,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        cwd=cwd
+    )
+    try:
+        stdout, stderr = await asyncio.wait_for(
+            process.communicate(), timeout=LINTER_TIMEOUT_SECONDS
+        )
+    except asyncio.TimeoutError:
+        process.kill()
+        await process.wait()
+        raise RuntimeError(f"{spec.name} timed out after {LINTER_TIMEOUT_SECONDS}s")
+
+    output = stdout.decode("utf-8", errors="replace")
+    if spec.parse is None:
+        if process.returncode != 0:
+            logger.warning(
+                "%s exited with code %s: %s", spec.name, process.returncode,
+                stderr.decode("utf-8", errors="replace").strip()
+            )
+        return []
+
+    try:
+        violations = spec.parse(output)
+    except (ValueError, KeyError) as e:
+        raise RuntimeError(f"Could not parse {spec.name} output: {e}") from e
+    # A failing exit without violations means the linter itself failed (e.g. a config error)
+    if process.returncode != 0 and not violations:
+        raise RuntimeError(
+            f"{spec.name} exited with code {process.returncode} without reporting violations: "
+            f"{stderr.decode('utf-8', errors='replace').strip()}"
+        )
+    for violation in violations:
+        violation["linter"] = spec.name
+    logger.info("%s reported %s violation(s)", spec.name, len(violations))
+    return violations
+
+
+async def _run_in_sequence(
+    specs: list[tuple[LinterSpec, list[str]]], cwd: str | None
+) -> list[dict]:
+    """Run linters one after another and collect their violations."""
+    violations = []
+    for spec, files in specs:
+        violations.extend(await _run_linter(spec, files, cwd))
+    return violations
+
+
+async def run_local_linters(
+    files: list[str], cwd: str | None = None
+) -> tuple[list[str], list[dict]]:
+    """
+    Run all configured linters on the given files.
+
+    Args:
+        files: Repository-relative paths to lint
+        cwd: Repository directory (default: current directory)
+
+    Returns:
+        Tuple of (names of the linters that ran, remaining violations)
+
+    Raises:
+        RuntimeError: If a linter times out, fails or its output cannot be parsed
+    """
+    base = Path(cwd) if cwd else Path.cwd()
+    existing = [path for path in files if (base / path).is_file()]
+
+    writers: dict[str, list[tuple[LinterSpec, list[str]]]] = {}
+    checkers: list[tuple[LinterSpec, list[str]]] = []
+    for spec in configured_linters():
+        matching = [path for path in existing if path.endswith(spec.extensions)]
+        if not matching:
+            continue
+        if spec.writes_files:
+            writers.setdefault(spec.language, []).append((spec, matching))
+        else:
+            checkers.append((spec, matching))
+
+    ran = [spec.name for chain in writers.values() for spec, _ in chain]
+    ran += [spec.name for spec, _ in checkers]
+
+    # Rewriting tools of one language must not race on the same files
+    fix_results = await asyncio.gather(
+        *(_run_in_sequence(chain, cwd) for chain in writers.values())
+    )
+    check_results = await asyncio.gather(
+        *(_run_linter(spec, matching, cwd) for spec, matching in checkers)
+    )
+
+    violations = [v for result in (*fix_results, *check_results) for v in result]
+    return ran, violations
+
+
+async def lint_file(path: str, cwd: str | None = None) -> tuple[list[str], list[dict]]:
+    """
+    Run the configured formatters and autofixers on a single file.
+
+    Read-only checkers are skipped to keep this fast enough for every edit,
+    and autofixers run with the conservative arguments of ON_WRITE_ARGS.
+
+    Args:
+        path: File to lint, absolute or relative to cwd
+        cwd: Repository directory (default: current directory)
+
+    Returns:
+        Tuple of (names of the tools that ran, remaining violations)
+
+    Raises:
+        RuntimeError: If a tool times out or its output cannot be parsed
+    """
+    chain = [
+        (spec._replace(args=ON_WRITE_ARGS.get(spec.name, spec.args)), [path])
+        for spec in configured_linters()
+        if spec.writes_files and path.endswith(spec.extensions)
+    ]
+    return [spec.name for spec, _ in chain], await _run_in_sequence(chain, cwd)
@@ -0,0 +1,179 @@
+"""Local pytest runs of selected tests.
+
+The test loop normally runs the suite through the agent's /test command.
+This module runs individual tests directly, without an agent call, for
+checks that need fast, repeated runs (e.g. re-running a failing test to see
+whether it is flaky). Tests are identified like in convergence_tracker:
+``"<classname or suite>::<test name>"`` from the JUnit reports, and mapped
+back to pytest node ids through the test files on disk.
+
+Configuration (environment variables):
+    ADW_TEST_COMMAND: Command that runs pytest (default: "pytest")
+    ADW_LOCAL_TEST_TIMEOUT: Seconds a local test run may take (default: 300)
+"""
+
+import asyncio
+import logging
+import os
+import shlex
+import shutil
+import signal
+from pathlib import Path
+
+DEFAULT_TEST_COMMAND = "pytest"
+DEFAULT_TIMEOUT_SECONDS = 300.0
+# Seconds an interrupted pytest gets to write its report before it is killed
+INTERRUPT_GRACE_SECONDS = 10.0
+
+
+def pytest_command() -> list[str] | None:
+    """Return the configured pytest command, or None if it is not installed."""
+    command = shlex.split(os.getenv("ADW_TEST_COMMAND") or DEFAULT_TEST_COMMAND)
+    if not command or shutil.which(command[0]) is None:
+        return None
+    return command
+
+
+def local_test_timeout() -> float:
+    """Return the time limit of a local test run in seconds."""
+    try:
+        return float(os.getenv("ADW_LOCAL_TEST_TIMEOUT") or DEFAULT_TIMEOUT_SECONDS)
+    except ValueError:
+        return DEFAULT_TIMEOUT_SECONDS
+
+
+def pytest_node_id(test_id: str, root: str | Path) -> str | None:
+    """
+    Map a JUnit test id to a pytest node id.
+
+    pytest reports ``tests/unit/test_mod.py::TestA::test_x`` with the
+    classname ``tests.unit.test_mod.TestA``. The longest dotted prefix of the
+    classname that names a test file under root is the module path; the
+    remaining parts are classes.
+
+    Args:
+        test_id: Id of the form "<classname>::<test name>"
+        root: Directory pytest is run from
+
+    Returns:
+        str: The node id, or None if no test file matches the classname
+    """
+    classname, separator, name = test_id.partition("::")
+    if not separator or not classname or not name:
+        return None
+    parts = classname.split(".")
+    for index in range(len(parts), 0, -1):
+        module_path = "/".join(parts[:index]) + ".py"
+        if (Path(root) / module_path).is_file():
+            return "::".join([module_path, *parts[index:], name])
+    return None
+
+
+def read_test_cases(report: str | Path | bytes) -> list[tuple[str, str, float]]:
+    """
+    Read the test cases of a JUnit report.
+
+    Args:
+        report: Path of a JUnit XML report, or its content
+
+    Returns:
+        list: (test id, outcome, time in seconds) per test case, where outcome
+              is "passed", "failed", "error" or "skipped" (empty if the report
+              is missing or unreadable)
+    """
+    # pylint: disable=import-outside-toplevel
+    from junitparser import JUnitXml, TestCase, TestSuite
+
+    try:
+        if isinstance(report, bytes):
+            xml = JUnitXml.fromstring(report)
+        else:
+            xml = JUnitXml.fromfile(str(report))
+    except (OSError, AttributeError, ValueError) as e:
+        logging.getLogger(__name__).warning("Could not read test report: %s", e)
+        return []
+    test_cases = []
+    for suite in [xml] if isinstance(xml, TestSuite) else xml:
+        for test_case in suite:
+            # An interrupted pytest run reports the interrupted test without a name
+            if not isinstance(test_case, TestCase) or not test_case.name:
+                continue
+            if test_case.is_error:
+                outcome = "error"
+            elif test_case.is_failure:
+                outcome = "failed"
+            elif test_case.is_skipped:
+                outcome = "skipped"
+            else:
+                outcome = "passed"
+            test_id = f"{test_case.classname or suite.name}::{test_case.name}"
+            test_cases.append((test_id, outcome, float(test_case.time or 0)))
+    return test_cases
+
+
+def read_outcomes(junit_path: str | Path) -> dict[str, str]:
+    """
+    Read the outcome of every test case in a JUnit report.
+
+    Args:
+        junit_path: JUnit XML report
+
+    Returns:
+        dict[str, str]: Test id to "passed", "failed", "error" or "skipped"
+    """
+    return {test_id: outcome for test_id, outcome, _ in read_test_cases(junit_path)}
+
+
+async def run_pytest(
+    args: list[str], junit_path: str | Path, cwd: str | Path | None = None,
+    timeout: float | None = None
+) -> int:
+    """
+    Run pytest and write a JUnit report.
+
+    Args:
+        args: Node ids and options passed to pytest
+        junit_path: Path of the JUnit XML report to write
+        cwd: Directory to run pytest in
+        timeout: Seconds the run may take (default: ADW_LOCAL_TEST_TIMEOUT,
+                 0: no limit)
+
+    Returns:
+        int: pytest's exit code
+
+    Raises:
+        RuntimeError: If pytest is not installed or the run times out
+
+    When the awaiting task is cancelled, pytest is interrupted like with
+    Ctrl+C, so it still writes the report of the tests run so far.
+    """
+    logger = logging.getLogger(__name__)
+    command = pytest_command()
+    if command is None:
+        raise RuntimeError(
+            f"Test command not found: {os.getenv('ADW_TEST_COMMAND') or DEFAULT_TEST_COMMAND}"
+        )
+    if timeout is None:
+        timeout = local_test_timeout()
+    logger.debug("Running %s with %s argument(s)", command[0], len(args))
+    process = await asyncio.create_subprocess_exec(
+        shutil.which(command[0]), *command[1:], *args, f"--junitxml={junit_path}",
+        "-p", "no:cacheprovider",
+        stdout=asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.DEVNULL,
+        cwd=cwd
+    )
+    try:
+        return await asyncio.wait_for(process.wait(), timeout=timeout or None)
+    except asyncio.TimeoutError:
+        process.kill()
+        await process.wait()
+        raise RuntimeError(f"Local test run timed out after {timeout:.0f}s")
+    except asyncio.CancelledError:
+        process.send_signal(signal.SIGINT)
+        try:
+            await asyncio.wait_for(process.wait(), timeout=INTERRUPT_GRACE_SECONDS)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+        raise
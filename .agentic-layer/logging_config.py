@@ -1,7 +1,10 @@
 """Centralized logging configuration with file and console handlers.
 
 This module provides logging setup functions that configure both
-Rich console output and detailed file logging for ADW.
+Rich console output and structured JSONL file logging for ADW.
+
+Records are handed to a QueueHandler on the calling thread and written by a
+QueueListener on a background thread, so log I/O never blocks the event loop.
 """
 # /// script
 # dependencies = [
@@ -10,14 +13,76 @@ Rich console output and detailed file logging for ADW.
 # ]
 # ///
 
+import atexit
+import copy
+import json
 import logging
-from datetime import datetime
-from rich.logging import RichHandler
-from get_or_create_folders import get_or_create_run_folder
+import logging.handlers
+import queue
+from datetime import datetime, timezone
+
+from get_or_create_folders import get_log_file_path
+
+# Maximum number of characters kept from a single message or traceback
+MAX_LOG_MESSAGE_CHARS = 4000
+
+# Size cap and number of rotated backups kept for the run log file
+LOG_FILE_MAX_BYTES = 20 * 1024 * 1024
+LOG_FILE_BACKUP_COUNT = 3
+
+_listener: logging.handlers.QueueListener | None = None
+
+
+def truncate_payload(text: str, limit: int = MAX_LOG_MESSAGE_CHARS) -> str:
+    """
+    Cap a log payload to a maximum length.
+
+    Args:
+        text: The text to cap
+        limit: Maximum number of characters to keep
+
+    Returns:
+        The original text, or its head followed by a truncation marker
+    """
+    if len(text) <= limit:
+        return text
+    return f"{text[:limit]}... [truncated {len(text) - limit} chars]"
+
+
+class JsonlFormatter(logging.Formatter):
+    """Format log records as single-line JSON objects."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "line": record.lineno,
+            "msg": truncate_payload(record.getMessage()),
+        }
+        if record.exc_info:
+            entry["exc"] = truncate_payload(self.formatException(record.exc_info))
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class _CappedQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that renders and caps the message on the emitting thread.
+
+    Unlike the stdlib implementation, exception info is kept on the record so
+    the listener thread can still render rich tracebacks.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = truncate_payload(record.getMessage())
+        record.args = None
+        record.message = record.msg
+        return record
+
 
 def setup_logging(run_id: str) -> logging.Logger:
     """
-    Set up logging with both console (Rich) and file output.
+    Set up logging with both console (Rich) and JSONL file output.
 
     Args:
         run_id: The run identifier for log file naming
@@ -25,48 +90,61 @@ def setup_logging(run_id: str) -> logging.Logger:
     Returns:
         Logger instance for the root logger
     """
+    # pylint: disable=global-statement
+    global _listener
+
     # Check if logging is already initialized by checking for handlers
     root_logger = logging.getLogger()
     if root_logger.handlers:
         return root_logger
 
-    # Create log file path
-    run_folder = get_or_create_run_folder(run_id)
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    log_file = run_folder / f"{run_id}_adw_{timestamp}.log"
+    from rich.logging import RichHandler  # pylint: disable=import-outside-toplevel
+
+    log_file = get_log_file_path(run_id)
 
     # Configure root logger
-    root_logger = logging.getLogger()
     root_logger.setLevel(logging.DEBUG)
 
-    # Remove existing handlers
-    root_logger.handlers.clear()
-
     # Console handler (INFO level, Rich formatting)
     console_handler = RichHandler(
         rich_tracebacks=True,
-        tracebacks_show_locals=True,
+        tracebacks_show_locals=False,
         show_time=False,
         show_path=False
     )
     console_handler.setLevel(logging.INFO)
-    console_formatter = logging.Formatter("%(message)s")
-    console_handler.setFormatter(console_formatter)
-    root_logger.addHandler(console_handler)
+    console_handler.setFormatter(logging.Formatter("%(message)s"))
 
-    # File handler (DEBUG level, detailed formatting)
-    file_handler = logging.FileHandler(log_file, encoding='utf-8')
+    # File handler (DEBUG level, one JSON object per line, size-capped)
+    file_handler = logging.handlers.RotatingFileHandler(
+        log_file, maxBytes=LOG_FILE_MAX_BYTES, backupCount=LOG_FILE_BACKUP_COUNT,
+        encoding='utf-8'
+    )
     file_handler.setLevel(logging.DEBUG)
-    file_formatter = logging.Formatter(
-        "%(asctime)s | %(levelname)-8s | %(name)s:%(lineno)d | %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S"
+    file_handler.setFormatter(JsonlFormatter())
+
+    # Route all records through a queue drained by a background thread
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    root_logger.addHandler(_CappedQueueHandler(log_queue))
+    _listener = logging.handlers.QueueListener(
+        log_queue, console_handler, file_handler, respect_handler_level=True
     )
-    file_handler.setFormatter(file_formatter)
-    root_logger.addHandler(file_handler)
+    _listener.start()
+    atexit.register(shutdown_logging)
 
     root_logger.info("Logging initialized. Log file: %s", log_file)
     return root_logger
 
+
+def shutdown_logging() -> None:
+    """Flush pending records and stop the background log listener."""
+    # pylint: disable=global-statement
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
 def get_logger(name: str) -> logging.Logger:
     """Get a logger instance for a specific module."""
     return logging.getLogger(name)
@@ -0,0 +1,86 @@
+"""Wall-time records of workflow phases.
+
+Every phase entry point is wrapped with ``timed_phase``. The wrapper sets the
+phase in the run context and, when the phase ends, appends one line to the
+run's ``phases.jsonl`` with its start time, duration, outcome and the number
+of loop iterations it ran. adw_stats aggregates these records across runs.
+"""
+
+import functools
+import json
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, TypeVar
+
+from event_bus import EventType, emit
+from get_or_create_folders import get_or_create_run_folder
+from run_budget import is_budget_error
+from run_context import get_iteration, get_run_id, set_phase
+
+PHASES_FILE_NAME = "phases.jsonl"
+
+T = TypeVar("T")
+
+
+def record_phase(phase: str, started_at: datetime, duration_s: float, status: str) -> None:
+    """
+    Append a phase record to the current run's phases.jsonl.
+
+    Nothing is written when no run is active.
+
+    Args:
+        phase: Phase name
+        started_at: Start time of the phase (UTC)
+        duration_s: Wall time of the phase in seconds
+        status: "success", "failed" (returned False), "error" (raised) or
+                "budget_exhausted" (stopped by the run budget)
+    """
+    run_id = get_run_id()
+    if not run_id:
+        return
+    entry = {
+        "run_id": run_id,
+        "phase": phase,
+        "started_at": started_at.isoformat(),
+        "duration_s": round(duration_s, 3),
+        "status": status,
+        "iterations": get_iteration(),
+    }
+    try:
+        with open(get_or_create_run_folder(run_id) / PHASES_FILE_NAME, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+    except (OSError, ValueError) as e:
+        # Statistics must never fail a run
+        logging.getLogger(__name__).warning("Could not record phase timing: %s", e)
+
+
+def timed_phase(phase: str) -> Callable[[Callable[..., Awaitable[T]]], Callable[..., Awaitable[T]]]:
+    """
+    Decorate a phase entry point so that its wall time is recorded.
+
+    Args:
+        phase: Phase name set in the run context (e.g. "test")
+    """
+    def decorator(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs) -> T:
+            set_phase(phase)
+            emit(EventType.PHASE_STARTED)
+            started_at = datetime.now(timezone.utc)
+            start = time.monotonic()
+            status = "error"
+            try:
+                result = await func(*args, **kwargs)
+                status = "failed" if result is False else "success"
+                return result
+            except Exception as e:
+                if is_budget_error(e):
+                    status = "budget_exhausted"
+                raise
+            finally:
+                duration_s = time.monotonic() - start
+                record_phase(phase, started_at, duration_s, status)
+                emit(EventType.PHASE_FINISHED, status=status, duration_s=round(duration_s, 3))
+        return wrapper
+    return decorator
@@ -0,0 +1,187 @@
+"""Host-wide rate limiting and retry policy for agent calls.
+
+All ADW processes on a machine share one token bucket stored in a SQLite
+database, so concurrent runs queue up for the model provider instead of all
+hitting it at once. Transient failures (throttling, overload, network errors)
+are retried with exponential backoff and full jitter.
+
+Configuration (environment variables):
+    ADW_RATE_LIMIT_PER_MINUTE: Agent calls started per minute (0 disables the limiter)
+    ADW_RATE_LIMIT_BURST: Bucket capacity, i.e. calls that may start at once
+    ADW_RATE_LIMIT_DB: Path of the shared SQLite database
+    ADW_AGENT_MAX_RETRIES: Retries for transient errors
+"""
+
+import asyncio
+import logging
+import os
+import random
+import re
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+DEFAULT_CALLS_PER_MINUTE = 30.0
+DEFAULT_BURST = 10
+DEFAULT_MAX_RETRIES = 3
+BACKOFF_BASE_SECONDS = 5.0
+BACKOFF_MAX_SECONDS = 120.0
+
+# Error messages worth retrying. Whole words only, and HTTP status codes only
+# next to "error", "status", "http" or "code", so e.g. "line 429" or
+# "test_timeout.py" in agent output do not count.
+_TRANSIENT_PATTERN = re.compile(
+    r"\b(?:rate[ _-]?limit\w*|too many requests|overloaded\w*|service unavailable"
+    r"|bad gateway|gateway time-?out|temporarily unavailable|timed out"
+    r"|connection (?:reset|refused|aborted)|econnreset|network error)\b"
+    r"|\b(?:error|status|http|code)\W{0,3}(?:code\W{0,3})?(?:429|502|503|504|529)\b",
+    re.IGNORECASE
+)
+
+
+def _env_float(name: str, default: float) -> float:
+    """Read a float environment variable, falling back to the default."""
+    value = os.getenv(name)
+    try:
+        return float(value) if value else default
+    except ValueError:
+        return default
+
+
+class TokenBucket:
+    """Token bucket whose state lives in SQLite so that processes share it."""
+
+    def __init__(
+        self,
+        db_path: Path,
+        rate_per_second: float,
+        capacity: float,
+        name: str = "agent_calls",
+        clock: Callable[[], float] = time.time
+    ):
+        self.db_path = Path(db_path)
+        self.rate_per_second = rate_per_second
+        self.capacity = capacity
+        self.name = name
+        self.clock = clock
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS buckets "
+                "(name TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+
+    def try_acquire(self) -> float:
+        """
+        Take one token if available.
+
+        Returns:
+            float: 0 if a token was taken, otherwise seconds until one is available
+        """
+        connection = self._connect()
+        try:
+            # BEGIN IMMEDIATE serializes the read-modify-write across processes
+            connection.execute("BEGIN IMMEDIATE")
+            now = self.clock()
+            row = connection.execute(
+                "SELECT tokens, updated FROM buckets WHERE name = ?", (self.name,)
+            ).fetchone()
+            tokens, updated = row if row else (self.capacity, now)
+            tokens = min(self.capacity, tokens + max(0.0, now - updated) * self.rate_per_second)
+
+            wait = 0.0
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                wait = (1 - tokens) / self.rate_per_second
+
+            connection.execute(
+                "INSERT OR REPLACE INTO buckets (name, tokens, updated) VALUES (?, ?, ?)",
+                (self.name, tokens, now)
+            )
+            connection.execute("COMMIT")
+            return wait
+        except BaseException:
+            if connection.in_transaction:
+                connection.execute("ROLLBACK")
+            raise
+        finally:
+            connection.close()
+
+    async def acquire(self) -> float:
+        """
+        Wait until a token is available and take it.
+
+        Returns:
+            float: Total seconds spent waiting
+        """
+        waited = 0.0
+        # BEGIN IMMEDIATE may wait for other processes' locks; keep that off the event loop
+        while (wait := await asyncio.to_thread(self.try_acquire)) > 0:
+            # A little jitter keeps waiting processes from retrying in lockstep
+            delay = wait + random.uniform(0, min(1.0, wait))
+            await asyncio.sleep(delay)
+            waited += delay
+        return waited
+
+
+def get_agent_bucket() -> TokenBucket | None:
+    """Return the shared agent-call bucket, or None if rate limiting is disabled."""
+    per_minute = _env_float("ADW_RATE_LIMIT_PER_MINUTE", DEFAULT_CALLS_PER_MINUTE)
+    if per_minute <= 0:
+        return None
+    db_path = os.getenv("ADW_RATE_LIMIT_DB") or Path(tempfile.gettempdir()) / "adw_rate_limit.sqlite3"
+    capacity = max(1.0, _env_float("ADW_RATE_LIMIT_BURST", DEFAULT_BURST))
+    return TokenBucket(Path(db_path), per_minute / 60.0, capacity)
+
+
+async def acquire_agent_slot() -> None:
+    """Wait for the host-wide rate limiter before starting an agent call."""
+    bucket = get_agent_bucket()
+    if bucket is None:
+        return
+    try:
+        waited = await bucket.acquire()
+    except sqlite3.Error as e:
+        # The limiter must never be the reason a run fails
+        logging.getLogger(__name__).warning("Rate limiter unavailable: %s", e)
+        return
+    if waited > 0:
+        logging.getLogger(__name__).info("Rate limiter delayed agent call by %.1fs", waited)
+
+
+def is_transient_error(error: BaseException) -> bool:
+    """Return whether an agent error looks like throttling, overload or a network issue."""
+    cause: BaseException | None = error
+    while cause is not None:
+        if isinstance(cause, (TimeoutError, ConnectionError)):
+            return True
+        cause = cause.__cause__
+    return _TRANSIENT_PATTERN.search(str(error)) is not None
+
+
+def max_retries() -> int:
+    """Return the number of retries for transient agent errors."""
+    return max(0, int(_env_float("ADW_AGENT_MAX_RETRIES", DEFAULT_MAX_RETRIES)))
+
+
+def backoff_delay(
+    attempt: int, base: float = BACKOFF_BASE_SECONDS, cap: float = BACKOFF_MAX_SECONDS
+) -> float:
+    """
+    Compute the delay before a retry using exponential backoff with full jitter.
+
+    Args:
+        attempt: Number of the failed attempt, starting at 0
+        base: Delay ceiling of the first retry in seconds
+        cap: Upper bound of the delay ceiling in seconds
+
+    Returns:
+        float: Delay in seconds, uniformly drawn from [0, min(cap, base * 2^attempt)]
+    """
+    return random.uniform(0, min(cap, base * 2 ** attempt))
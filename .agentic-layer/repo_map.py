@@ -0,0 +1,149 @@
+"""Repository map shared by all agent calls of a run.
+
+The map lists every file of the working tree with a one-line module summary
+and its top-level symbols, so agents can start working without exploring the
+repository first. It is keyed by a cheap fingerprint of the working tree
+(HEAD plus the state of changed files) and cached in the run folder, so it is
+only rebuilt when the working tree changed.
+"""
+
+import ast
+import logging
+import os
+import re
+import threading
+from pathlib import Path
+
+from get_or_create_folders import get_or_create_repo_map_folder
+from git_snapshot import list_worktree_files, repository_root, worktree_fingerprint
+from run_context import get_run_id
+
+# Upper bound for the map; symbols are dropped before files are
+MAX_REPO_MAP_CHARS = 60_000
+MAX_SYMBOLS_PER_FILE = 25
+# Files larger than this are listed but not parsed
+MAX_PARSED_FILE_BYTES = 512 * 1024
+
+_JS_EXPORT_PATTERN = re.compile(
+    r"^export\s+(?:default\s+)?(?:async\s+)?"
+    r"(?:function\*?|class|const|let|var|interface|type|enum)\s+([A-Za-z_$][\w$]*)",
+    re.MULTILINE
+)
+_JS_EXTENSIONS = (".js", ".jsx", ".ts", ".tsx", ".mjs", ".cjs")
+
+
+def _summarize_python(source: str) -> tuple[str, list[str]]:
+    """Return the first docstring line and top-level symbols of a Python module."""
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError):
+        return "", []
+    docstring = ast.get_docstring(tree) or ""
+    symbols = []
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef):
+            symbols.append(f"class {node.name}")
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            symbols.append(f"def {node.name}")
+    return docstring.strip().split("\n", 1)[0], symbols
+
+
+def _summarize_file(path: Path) -> tuple[str, list[str]]:
+    """Return a one-line summary and the top-level symbols of a source file."""
+    if not path.name.endswith((".py", *_JS_EXTENSIONS)):
+        return "", []
+    try:
+        if path.stat().st_size > MAX_PARSED_FILE_BYTES:
+            return "", []
+        source = path.read_text(encoding="utf-8", errors="replace")
+    except OSError:
+        return "", []
+    if path.suffix == ".py":
+        return _summarize_python(source)
+    return "", [f"export {name}" for name in _JS_EXPORT_PATTERN.findall(source)]
+
+
+def build_repo_map(cwd: str | None = None, tree: str | None = None) -> str:
+    """
+    Build the repository map of the current working tree.
+
+    Args:
+        cwd: Repository directory (default: current directory)
+        tree: Snapshot tree hash to mention in the header (optional)
+
+    Returns:
+        str: Markdown map of files, module summaries and top-level symbols
+    """
+    top_level = repository_root(cwd)
+    files = list_worktree_files(cwd)
+
+    header = [
+        "# Repository map" + (f" (tree {tree})" if tree else ""),
+        "",
+        "All files of the repository with their module summary and top-level symbols.",
+        "Use this map instead of listing or searching the repository to find your way.",
+        "",
+    ]
+    length = sum(len(line) + 1 for line in header)
+    entries = []
+    with_symbols = True
+    for index, relative in enumerate(files):
+        summary, symbols = _summarize_file(top_level / relative)
+        entry = f"- {relative}" + (f" — {summary}" if summary else "")
+        if with_symbols and symbols:
+            shown = symbols[:MAX_SYMBOLS_PER_FILE]
+            more = len(symbols) - len(shown)
+            entry += "\n  " + ", ".join(shown) + (f", … (+{more})" if more > 0 else "")
+        if length + len(entry) + 1 > MAX_REPO_MAP_CHARS:
+            if with_symbols:
+                # Keep listing the remaining files without their symbols
+                with_symbols = False
+                entry = f"- {relative}" + (f" — {summary}" if summary else "")
+            if length + len(entry) + 1 > MAX_REPO_MAP_CHARS:
+                entries.append(f"- … {len(files) - index} more file(s) not listed")
+                break
+        entries.append(entry)
+        length += len(entry) + 1
+
+    return "\n".join(header + entries) + "\n"
+
+
+def get_repo_map(cwd: str | None = None) -> Path | None:
+    """
+    Return the cached repository map for the current working tree.
+
+    The map is built on first use for each working tree fingerprint and
+    stored in the run folder. Set ADW_REPO_MAP=off to disable it. This runs
+    git and may build the map, so async callers run it in a thread.
+
+    Args:
+        cwd: Repository directory (default: current directory)
+
+    Returns:
+        Path of the map file, or None when disabled, no run is active, or the
+        directory is not a git repository
+    """
+    logger = logging.getLogger(__name__)
+    if os.getenv("ADW_REPO_MAP", "on").strip().lower() in ("0", "off", "false", "no"):
+        return None
+    run_id = get_run_id()
+    if not run_id:
+        return None
+
+    try:
+        fingerprint = worktree_fingerprint(cwd)
+    except RuntimeError as e:
+        logger.warning("Repository map unavailable: %s", e)
+        return None
+
+    map_path = get_or_create_repo_map_folder(run_id) / f"{fingerprint}.md"
+    if map_path.exists():
+        logger.debug("Using cached repository map %s", map_path.name)
+        return map_path
+
+    content = build_repo_map(cwd)
+    temp_path = map_path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+    temp_path.write_text(content, encoding="utf-8")
+    temp_path.replace(map_path)
+    logger.info("Built repository map for state %s (%s chars)", fingerprint[:12], len(content))
+    return map_path
@@ -0,0 +1,199 @@
+"""Per-iteration archives of test reports.
+
+At the end of every test loop iteration the JUnit XML reports in the test
+folder are packed into ``archive/iteration_<n>.tar.gz`` and summarized in
+``archive/index.jsonl`` (one line per iteration with test counts and the
+ids of failing tests). The reports of an iteration are removed from the test
+folder only after they were archived, so the next iteration starts clean
+while the history of the loop stays available for analysis:
+
+    for entry in read_archive_index(test_folder):
+        print(entry["iteration"], entry["failed"], entry["failing"])
+"""
+
+import json
+import logging
+import tarfile
+from datetime import datetime, timezone
+from pathlib import Path
+
+ARCHIVE_FOLDER_NAME = "archive"
+INDEX_FILE_NAME = "index.jsonl"
+
+
+def _archive_folder(test_folder: Path) -> Path:
+    return Path(test_folder) / ARCHIVE_FOLDER_NAME
+
+
+def summarize_reports(xml_files: list[Path]) -> dict:
+    """
+    Count the test cases of JUnit XML reports.
+
+    Reports that cannot be parsed are listed under "unparsed" instead of
+    failing the summary.
+
+    Args:
+        xml_files: JUnit XML report files
+
+    Returns:
+        dict: Counts of tests, passed, failed, errors and skipped, the sorted
+              failing test ids ("<classname or suite>::<test name>") and the
+              names of unparsed files
+    """
+    # pylint: disable=import-outside-toplevel
+    from junitparser import JUnitXml, TestCase, TestSuite
+
+    counts = {"tests": 0, "passed": 0, "failed": 0, "errors": 0, "skipped": 0}
+    failing = set()
+    unparsed = []
+    for xml_file in xml_files:
+        try:
+            xml = JUnitXml.fromfile(str(xml_file))
+        except (OSError, AttributeError, ValueError) as e:
+            logging.getLogger(__name__).warning("Could not parse %s: %s", xml_file, e)
+            unparsed.append(xml_file.name)
+            continue
+        suites = [xml] if isinstance(xml, TestSuite) else xml
+        for suite in suites:
+            for test_case in suite:
+                if not isinstance(test_case, TestCase) or not test_case.name:
+                    continue
+                counts["tests"] += 1
+                if test_case.is_error or test_case.is_failure:
+                    counts["errors" if test_case.is_error else "failed"] += 1
+                    failing.add(f"{test_case.classname or suite.name}::{test_case.name}")
+                elif test_case.is_skipped:
+                    counts["skipped"] += 1
+                else:
+                    counts["passed"] += 1
+    return {**counts, "failing": sorted(failing), "unparsed": unparsed}
+
+
+def _archive_path(archive_folder: Path, iteration: int) -> Path:
+    """Return a free archive path for the iteration (a re-run loop adds a suffix)."""
+    path = archive_folder / f"iteration_{iteration:03d}.tar.gz"
+    attempt = 1
+    while path.exists():
+        attempt += 1
+        path = archive_folder / f"iteration_{iteration:03d}-{attempt}.tar.gz"
+    return path
+
+
+def archive_test_results(
+    test_folder: str | Path, iteration: int, outcome: str, keep_reports: bool = False
+) -> dict | None:
+    """
+    Archive the JUnit XML reports of a test loop iteration.
+
+    Args:
+        test_folder: Folder the test run wrote its XML reports to
+        iteration: Test loop iteration that produced the reports
+        outcome: What the loop did with the results, e.g. "resolved",
+                 "rolled_back", "passed", "passed_with_quarantine" or "stopped"
+        keep_reports: Leave the XML files in the test folder after archiving
+
+    Returns:
+        dict: The index entry of the iteration, or None if there were no reports
+
+    Raises:
+        OSError: If the archive or index cannot be written
+    """
+    logger = logging.getLogger(__name__)
+    test_folder = Path(test_folder)
+    xml_files = sorted(test_folder.glob("*.xml"))
+    if not xml_files:
+        logger.debug("No test reports to archive for iteration %s", iteration)
+        return None
+
+    archive_folder = _archive_folder(test_folder)
+    archive_folder.mkdir(parents=True, exist_ok=True)
+    archive_path = _archive_path(archive_folder, iteration)
+    with tarfile.open(archive_path, "w:gz") as tar:
+        for xml_file in xml_files:
+            tar.add(xml_file, arcname=xml_file.name)
+
+    entry = {
+        "iteration": iteration,
+        "outcome": outcome,
+        "archived_at": datetime.now(timezone.utc).isoformat(),
+        "archive": archive_path.name,
+        "files": [xml_file.name for xml_file in xml_files],
+        **summarize_reports(xml_files),
+    }
+    with open(archive_folder / INDEX_FILE_NAME, "a", encoding="utf-8") as f:
+        f.write(json.dumps(entry) + "\n")
+
+    if not keep_reports:
+        for xml_file in xml_files:
+            xml_file.unlink()
+    logger.info(
+        "Archived %s report(s) of iteration %s to %s (%s failing)",
+        len(xml_files), iteration, archive_path.name, len(entry["failing"])
+    )
+    return entry
+
+
+def read_archive_index(test_folder: str | Path) -> list[dict]:
+    """
+    Read the archive index of a test folder.
+
+    Args:
+        test_folder: Test folder of a run
+
+    Returns:
+        list[dict]: Index entries in archive order (empty if nothing was archived)
+    """
+    index_path = _archive_folder(Path(test_folder)) / INDEX_FILE_NAME
+    if not index_path.exists():
+        return []
+    with open(index_path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def extract_iteration(test_folder: str | Path, archive: str, destination: str | Path) -> list[Path]:
+    """
+    Extract the reports of an archived iteration.
+
+    Args:
+        test_folder: Test folder of a run
+        archive: Archive file name from the index entry
+        destination: Folder to extract the XML reports into
+
+    Returns:
+        list[Path]: The extracted report files
+
+    Raises:
+        FileNotFoundError: If the archive does not exist
+    """
+    archive_path = _archive_folder(Path(test_folder)) / archive
+    if not archive_path.exists():
+        raise FileNotFoundError(f"Test report archive not found: {archive_path}")
+    destination = Path(destination)
+    destination.mkdir(parents=True, exist_ok=True)
+    with tarfile.open(archive_path, "r:gz") as tar:
+        tar.extractall(destination, filter="data")
+        names = tar.getnames()
+    return [destination / name for name in names]
+
+
+def read_archived_reports(test_folder: str | Path, archive: str) -> list[tuple[str, bytes]]:
+    """
+    Read the reports of an archived iteration without extracting them.
+
+    Args:
+        test_folder: Test folder of a run
+        archive: Archive file name from the index entry
+
+    Returns:
+        list: (file name, XML content) per report (empty if the archive is missing)
+    """
+    archive_path = _archive_folder(Path(test_folder)) / archive
+    if not archive_path.exists():
+        return []
+    reports = []
+    with tarfile.open(archive_path, "r:gz") as tar:
+        for member in tar.getmembers():
+            content = tar.extractfile(member) if member.isfile() else None
+            if content is not None:
+                reports.append((member.name, content.read()))
+    return reports
@@ -8,18 +8,21 @@
 # ///
 
 import logging
-from dotenv import load_dotenv
+from typing import TYPE_CHECKING
 from coding_agent import call_coding_agent
 from agent_types import AgentType
-from junitparser import TestSuite, TestCase
+from compact_test_failure import compact_test_case
+from git_snapshot import repository_root
 
-load_dotenv()
+if TYPE_CHECKING:
+    from junitparser import TestCase
 
 
 async def resolve_test(
-    test_case: TestCase,
+    test_case: "TestCase",
     spec_file_path: str,
-    agent_type: AgentType = AgentType.CLAUDE
+    agent_type: AgentType = AgentType.CLAUDE,
+    model: str = "sonnet"
 ) -> bool:
     """
     Resolves a single failed test case by calling Claude Code with
@@ -28,6 +31,8 @@ async def resolve_test(
     Args:
         test_case: A junitparser TestCase object representing the failed test
         spec_file_path: Path to the specification file
+        agent_type: The coding agent to use (CLAUDE or COPILOT)
+        model: Model to use for the resolution (default: "sonnet")
 
     Returns:
         bool: True if resolution completed successfully, False otherwise
@@ -35,15 +40,22 @@ async def resolve_test(
     logger = logging.getLogger(__name__)
     logger.info("Resolving test case: %s", test_case.name)
 
-    # Stringify the test case to XML format (returns bytes with utf-8 encoding)
-    stringified_test = test_case.tostring().decode('utf-8')
+    # Send only the failure essentials instead of the full JUnit XML
+    try:
+        repo_root = repository_root()
+    except RuntimeError:
+        repo_root = None
+    stringified_test = compact_test_case(test_case, repo_root)
+    logger.debug(
+        "Compacted test case %s to %s chars", test_case.name, len(stringified_test)
+    )
 
     # Call the coding agent to resolve tests
     # Note: Arguments are automatically sanitized in call_coding_agent to prevent
     # command parsing issues with special characters
     try:
         await call_coding_agent(
-            agent_type, "resolve_failed_test", [stringified_test, spec_file_path]
+            agent_type, "resolve_failed_test", [stringified_test, spec_file_path], model=model
         )
     except Exception as e:
         logger.error("Test resolution failed for test case %s: %s", test_case.name, e, exc_info=True)
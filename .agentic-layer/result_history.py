@@ -0,0 +1,220 @@
+"""Persistent per-project history of test outcomes and durations.
+
+Every test run of the test loop records the outcome and duration of each test
+from its JUnit reports in SQLite. The history outlives single runs, so even the
+first iteration of a new run knows which tests failed recently and how long
+each test file takes. Local test runs use it to run recently failing and fast
+test files first, and to balance shards before a run has reports of its own.
+
+Configuration (environment variables):
+    ADW_TEST_HISTORY: Record and use the test history (on or off, default: on)
+    ADW_TEST_HISTORY_DB: SQLite database
+                         (default: <RUN_DIRECTORY>/test_history.sqlite3)
+"""
+
+import logging
+import math
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Callable, NamedTuple
+
+from local_tests import pytest_node_id, read_test_cases
+from run_context import get_run_id
+
+HISTORY_FILE_NAME = "test_history.sqlite3"
+# Records kept per test; older ones are pruned
+KEEP_RECORDS_PER_TEST = 50
+# Records per test that count as "recent" when looking for failures
+RECENT_RECORDS = 5
+
+
+class FileHistory(NamedTuple):
+    """Recent failures and typical duration of one test file."""
+    recent_failures: int
+    duration_s: float
+
+
+class ResultHistory:
+    """Test outcomes and durations in SQLite, shared by all runs of a project."""
+
+    def __init__(self, db_path: Path, clock: Callable[[], float] = time.time):
+        self.db_path = Path(db_path)
+        self.clock = clock
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        connection = self._connect()
+        try:
+            with connection:
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS results ("
+                    "test_id TEXT NOT NULL, file TEXT, outcome TEXT NOT NULL, "
+                    "duration_s REAL NOT NULL, run_id TEXT, recorded_at REAL NOT NULL)"
+                )
+                connection.execute(
+                    "CREATE INDEX IF NOT EXISTS results_by_test ON results (test_id, recorded_at)"
+                )
+        finally:
+            connection.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def record(self, test_cases: list[tuple[str, str, float]], root: str | Path) -> int:
+        """
+        Record the outcomes of one test run.
+
+        Args:
+            test_cases: (test id, outcome, time in seconds) per test case
+            root: Directory pytest runs in, to map tests to their files
+
+        Returns:
+            int: Number of recorded test cases
+        """
+        now = self.clock()
+        run_id = get_run_id()
+        rows = []
+        for test_id, outcome, duration_s in test_cases:
+            node_id = pytest_node_id(test_id, root)
+            test_file = node_id.split("::", 1)[0] if node_id else None
+            rows.append((test_id, test_file, outcome, duration_s, run_id, now))
+        if not rows:
+            return 0
+        connection = self._connect()
+        try:
+            with connection:
+                self._insert(connection, rows)
+        finally:
+            connection.close()
+        return len(rows)
+
+    @staticmethod
+    def _insert(connection: sqlite3.Connection, rows: list[tuple]) -> None:
+        """Insert result rows and prune the oldest records of each test."""
+        connection.executemany(
+            "INSERT INTO results (test_id, file, outcome, duration_s, run_id, recorded_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            rows
+        )
+        connection.execute(
+            "DELETE FROM results WHERE rowid IN (SELECT rowid FROM ("
+            "SELECT rowid, ROW_NUMBER() OVER "
+            "(PARTITION BY test_id ORDER BY recorded_at DESC, rowid DESC) AS age "
+            "FROM results) WHERE age > ?)",
+            (KEEP_RECORDS_PER_TEST,)
+        )
+
+    def file_history(self) -> dict[str, FileHistory]:
+        """
+        Summarize the recent history of every test file.
+
+        A file's recent failures are the failed or erroring results among the
+        last RECENT_RECORDS results of each of its tests. Its duration is the
+        sum of its tests' mean durations over those results.
+
+        Returns:
+            dict[str, FileHistory]: Test file to its history
+        """
+        connection = self._connect()
+        try:
+            rows = connection.execute(
+                "SELECT file, SUM(failures), SUM(mean_duration) FROM ("
+                "SELECT test_id, file, "
+                "SUM(outcome IN ('failed', 'error')) AS failures, "
+                "AVG(duration_s) AS mean_duration FROM ("
+                "SELECT test_id, file, outcome, duration_s, ROW_NUMBER() OVER "
+                "(PARTITION BY test_id ORDER BY recorded_at DESC, rowid DESC) AS age "
+                "FROM results WHERE file IS NOT NULL) "
+                "WHERE age <= ? GROUP BY test_id) GROUP BY file",
+                (RECENT_RECORDS,)
+            ).fetchall()
+        finally:
+            connection.close()
+        return {
+            test_file: FileHistory(int(failures or 0), float(duration or 0.0))
+            for test_file, failures, duration in rows
+        }
+
+
+def order_failed_first(files: list[str], history: dict[str, FileHistory]) -> list[str]:
+    """
+    Order test files so that recently failing files run first, then fastest first.
+
+    Files without history run last, in collection order.
+
+    Args:
+        files: Test files in collection order
+        history: File histories from ResultHistory.file_history()
+
+    Returns:
+        list[str]: The files in run order
+    """
+    def key(item: tuple[int, str]) -> tuple:
+        position, test_file = item
+        entry = history.get(test_file)
+        if entry is None:
+            return (0, math.inf, position)
+        return (-entry.recent_failures, entry.duration_s, position)
+
+    return [test_file for _, test_file in sorted(enumerate(files), key=key)]
+
+
+def history_enabled() -> bool:
+    """Return whether the test history is recorded and used (ADW_TEST_HISTORY)."""
+    return os.getenv("ADW_TEST_HISTORY", "on").strip().lower() not in ("0", "off", "false", "no")
+
+
+def get_result_history() -> ResultHistory | None:
+    """Return the project's test history, or None if disabled or not configured."""
+    if not history_enabled():
+        return None
+    db_path = os.getenv("ADW_TEST_HISTORY_DB")
+    if not db_path:
+        run_directory = os.getenv("RUN_DIRECTORY")
+        if not run_directory:
+            return None
+        db_path = Path(run_directory) / HISTORY_FILE_NAME
+    try:
+        return ResultHistory(Path(db_path))
+    except (OSError, sqlite3.Error) as e:
+        # The history speeds runs up but must never be the reason one fails
+        logging.getLogger(__name__).warning("Test history unavailable: %s", e)
+        return None
+
+
+def record_test_reports(test_folder: str | Path, root: str | Path | None = None) -> int:
+    """
+    Record the JUnit reports in a test folder in the project's test history.
+
+    Args:
+        test_folder: Folder with the reports of the current test run
+        root: Directory pytest runs in (default: the current directory)
+
+    Returns:
+        int: Number of recorded test cases (0 if the history is unavailable)
+    """
+    history = get_result_history()
+    if history is None:
+        return 0
+    test_cases = [
+        test_case
+        for report in sorted(Path(test_folder).glob("*.xml"))
+        for test_case in read_test_cases(report)
+    ]
+    try:
+        return history.record(test_cases, root or os.getcwd())
+    except sqlite3.Error as e:
+        logging.getLogger(__name__).warning("Could not record test history: %s", e)
+        return 0
+
+
+def load_file_history() -> dict[str, FileHistory]:
+    """Return the file histories of the project, or {} if the history is unavailable."""
+    history = get_result_history()
+    if history is None:
+        return {}
+    try:
+        return history.file_history()
+    except sqlite3.Error as e:
+        logging.getLogger(__name__).warning("Could not read test history: %s", e)
+        return {}
@@ -0,0 +1,87 @@
+"""Fingerprinting of review issues across review loop iterations.
+
+A fingerprint identifies "the same" issue even when the reviewer rewords
+numbers or whitespace between iterations, so the review loop can tell when a
+blocker it already patched shows up again.
+"""
+
+import hashlib
+import json
+import re
+from pathlib import Path
+
+from group_review_issues import extract_issue_files
+
+_NUMBER_PATTERN = re.compile(r"\d+")
+_NON_WORD_PATTERN = re.compile(r"[^a-z_ ]+")
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+def fingerprint_issue(issue: dict) -> str:
+    """
+    Compute a stable fingerprint for a review issue.
+
+    The fingerprint covers the issue's files and its description with case,
+    digits (e.g. line numbers), punctuation and whitespace normalized away.
+
+    Args:
+        issue: Review issue dictionary from review.json
+
+    Returns:
+        str: 12-character hexadecimal fingerprint
+    """
+    description = (issue.get('issue_description') or '').lower()
+    description = _NUMBER_PATTERN.sub("", description)
+    description = _NON_WORD_PATTERN.sub(" ", description)
+    description = _WHITESPACE_PATTERN.sub(" ", description).strip()
+    files = ",".join(sorted(extract_issue_files(issue)))
+    return hashlib.sha1(f"{files}|{description}".encode("utf-8")).hexdigest()[:12]
+
+
+class ReviewHistory:
+    """Tracks blocker fingerprints and patch attempts across review iterations."""
+
+    def __init__(self):
+        self.attempts: dict[str, int] = {}
+        self.descriptions: dict[str, str] = {}
+        self.iterations: list[dict] = []
+
+    def record_review(self, iteration: int, blocker_issues: list[dict], incremental: bool) -> None:
+        """Record the blockers reported by one review."""
+        fingerprints = []
+        for issue in blocker_issues:
+            fingerprint = fingerprint_issue(issue)
+            self.descriptions.setdefault(fingerprint, issue.get('issue_description') or '')
+            fingerprints.append(fingerprint)
+        self.iterations.append({
+            "iteration": iteration,
+            "incremental": incremental,
+            "blockers": fingerprints,
+        })
+
+    def record_patched(self, blocker_issues: list[dict]) -> None:
+        """Count one patch attempt for each of the given blockers."""
+        for issue in blocker_issues:
+            fingerprint = fingerprint_issue(issue)
+            self.attempts[fingerprint] = self.attempts.get(fingerprint, 0) + 1
+
+    def attempts_for(self, issue: dict) -> int:
+        """Return how many times an issue has already been patched."""
+        return self.attempts.get(fingerprint_issue(issue), 0)
+
+    def save(self, path: Path) -> None:
+        """Write the history with per-issue attempt counts as JSON."""
+        data = {
+            "iterations": self.iterations,
+            "issues": [
+                {
+                    "fingerprint": fingerprint,
+                    "description": self.descriptions.get(fingerprint, ""),
+                    "patch_attempts": attempts,
+                }
+                for fingerprint, attempts in sorted(
+                    self.attempts.items(), key=lambda item: item[1], reverse=True
+                )
+            ],
+        }
+        path.write_text(json.dumps(data, indent=2), encoding="utf-8")
@@ -0,0 +1,248 @@
+"""Per-run budgets for wall time, tokens and agent calls.
+
+The orchestrator creates one RunBudget per run and puts it in the run context.
+Every agent call checks the budget before it starts and adds its calls and
+tokens afterwards. Tokens are the input and output tokens reported in the
+agent's result message. A call is cut off when the wall-time budget runs out.
+
+Once any dimension passes the warning fraction, the test and review loops
+scale back to one more iteration. Once a budget is used up, the next agent
+call raises BudgetExceededError, which ends the run with a partial result.
+
+Configuration (environment variables, 0 or unset means unlimited):
+    ADW_MAX_RUN_MINUTES: Wall time of a run
+    ADW_MAX_RUN_TOKENS: Input plus output tokens of all agent calls of a run
+    ADW_MAX_AGENT_CALLS: Agent calls of a run
+    ADW_BUDGET_WARN_FRACTION: Used fraction after which loops scale back (default 0.8)
+"""
+
+import logging
+import os
+import time
+from contextvars import ContextVar
+
+DEFAULT_WARN_FRACTION = 0.8
+
+_budget: ContextVar["RunBudget | None"] = ContextVar("adw_run_budget", default=None)
+
+
+class BudgetExceededError(RuntimeError):
+    """Raised when an agent call would exceed the run's budget."""
+
+
+def _env_number(name: str) -> float:
+    """Read a non-negative number from the environment (0 when unset or invalid)."""
+    try:
+        return max(0.0, float(os.getenv(name) or 0))
+    except ValueError:
+        logging.getLogger(__name__).warning("Ignoring invalid %s=%r", name, os.getenv(name))
+        return 0.0
+
+
+def usage_tokens(message) -> int:
+    """
+    Return the input plus output tokens reported by an agent message.
+
+    Understands the SDK's ResultMessage and dict messages with a "usage" entry
+    of type "result". Other messages report 0.
+    """
+    if isinstance(message, dict):
+        usage = message.get("usage") if message.get("type") == "result" else None
+    elif type(message).__name__ == "ResultMessage":
+        usage = getattr(message, "usage", None)
+    else:
+        usage = None
+    if not isinstance(usage, dict):
+        return 0
+    return int(usage.get("input_tokens") or 0) + int(usage.get("output_tokens") or 0)
+
+
+class RunBudget:
+    """Limits and consumption of one run."""
+
+    def __init__(
+        self,
+        max_wall_s: float = 0,
+        max_tokens: int = 0,
+        max_agent_calls: int = 0,
+        warn_fraction: float = DEFAULT_WARN_FRACTION,
+        clock=time.monotonic
+    ):
+        """
+        Args:
+            max_wall_s: Wall-time limit in seconds (0: unlimited)
+            max_tokens: Token limit (0: unlimited)
+            max_agent_calls: Agent-call limit (0: unlimited)
+            warn_fraction: Used fraction after which loops scale back
+            clock: Monotonic clock, replaceable in tests
+        """
+        self.max_wall_s = max_wall_s
+        self.max_tokens = max_tokens
+        self.max_agent_calls = max_agent_calls
+        self.warn_fraction = warn_fraction
+        self.clock = clock
+        self.started = clock()
+        self.tokens = 0
+        self.agent_calls = 0
+        self.exhausted_reason: str | None = None
+        self.exhausted_phase: str | None = None
+
+    @classmethod
+    def from_env(
+        cls,
+        max_minutes: float | None = None,
+        max_tokens: int | None = None,
+        max_agent_calls: int | None = None
+    ) -> "RunBudget":
+        """Build a budget from explicit limits, falling back to the environment."""
+        warn_fraction = _env_number("ADW_BUDGET_WARN_FRACTION") or DEFAULT_WARN_FRACTION
+        minutes = max_minutes if max_minutes is not None else _env_number("ADW_MAX_RUN_MINUTES")
+        return cls(
+            max_wall_s=minutes * 60,
+            max_tokens=int(max_tokens if max_tokens is not None else _env_number("ADW_MAX_RUN_TOKENS")),
+            max_agent_calls=int(
+                max_agent_calls if max_agent_calls is not None else _env_number("ADW_MAX_AGENT_CALLS")
+            ),
+            warn_fraction=min(1.0, warn_fraction),
+        )
+
+    @property
+    def limited(self) -> bool:
+        """Return whether any limit is set."""
+        return bool(self.max_wall_s or self.max_tokens or self.max_agent_calls)
+
+    def elapsed_s(self) -> float:
+        """Seconds since the run started."""
+        return self.clock() - self.started
+
+    def remaining_wall_s(self) -> float | None:
+        """Seconds left in the wall-time budget, or None without a limit."""
+        if not self.max_wall_s:
+            return None
+        return max(0.0, self.max_wall_s - self.elapsed_s())
+
+    def used_fractions(self) -> dict[str, float]:
+        """Return the used fraction of every limited dimension."""
+        fractions = {}
+        if self.max_wall_s:
+            fractions["wall time"] = self.elapsed_s() / self.max_wall_s
+        if self.max_tokens:
+            fractions["tokens"] = self.tokens / self.max_tokens
+        if self.max_agent_calls:
+            fractions["agent calls"] = self.agent_calls / self.max_agent_calls
+        return fractions
+
+    def used_fraction(self) -> float:
+        """Return the highest used fraction across all limited dimensions."""
+        return max(self.used_fractions().values(), default=0.0)
+
+    def nearly_exhausted(self) -> bool:
+        """Return whether the warning fraction has been reached."""
+        return self.used_fraction() >= self.warn_fraction
+
+    def exceeded(self, reason: str, phase: str | None = None) -> BudgetExceededError:
+        """Mark the budget as exhausted and return the error to raise."""
+        if self.exhausted_reason is None:
+            self.exhausted_reason = reason
+            self.exhausted_phase = phase
+        return BudgetExceededError(f"Run budget exhausted: {reason} ({self.summary()})")
+
+    def start_agent_call(self, phase: str | None = None) -> None:
+        """
+        Count an agent call that is about to start.
+
+        Raises:
+            BudgetExceededError: If a budget is already used up
+        """
+        if self.exhausted_reason is not None:
+            raise self.exceeded(self.exhausted_reason)
+        for dimension, fraction in self.used_fractions().items():
+            if fraction >= 1:
+                raise self.exceeded(dimension, phase)
+        self.agent_calls += 1
+
+    def add_tokens(self, tokens: int) -> None:
+        """Add tokens reported by an agent call."""
+        self.tokens += tokens
+
+    def summary(self) -> str:
+        """Describe the consumption against the limits."""
+        def part(name: str, used: float, limit: float, unit: str = "") -> str:
+            return f"{name} {used:,.0f}{unit}" + (f"/{limit:,.0f}{unit}" if limit else "")
+
+        return ", ".join([
+            part("wall time", self.elapsed_s(), self.max_wall_s, "s"),
+            part("tokens", self.tokens, self.max_tokens),
+            part("agent calls", self.agent_calls, self.max_agent_calls),
+        ])
+
+    def as_dict(self) -> dict:
+        """Return limits, consumption and exhaustion state for reports."""
+        return {
+            "max_wall_s": self.max_wall_s,
+            "max_tokens": self.max_tokens,
+            "max_agent_calls": self.max_agent_calls,
+            "elapsed_s": round(self.elapsed_s(), 3),
+            "tokens": self.tokens,
+            "agent_calls": self.agent_calls,
+            "exhausted_reason": self.exhausted_reason,
+            "exhausted_phase": self.exhausted_phase,
+        }
+
+
+class BudgetMeter:
+    """Message sink that adds reported tokens to the budget and forwards messages."""
+
+    def __init__(self, budget: RunBudget, transcript):
+        self.budget = budget
+        self.transcript = transcript
+
+    def write(self, message) -> None:
+        """Count the message's tokens and forward it to the transcript."""
+        self.budget.add_tokens(usage_tokens(message))
+        if self.transcript is not None:
+            self.transcript.write(message)
+
+
+def set_run_budget(budget: RunBudget | None) -> None:
+    """Set the budget of the run in the current context."""
+    _budget.set(budget)
+
+
+def get_run_budget() -> RunBudget | None:
+    """Return the budget of the run in the current context, if any."""
+    return _budget.get()
+
+
+def limit_iterations(completed: int, max_iterations: int) -> int:
+    """
+    Scale back a loop's iteration limit when the run budget is nearly used up.
+
+    Args:
+        completed: Iterations the loop has completed
+        max_iterations: The loop's configured limit
+
+    Returns:
+        int: The limit to use; at most one more iteration once the warning
+             fraction is reached
+    """
+    budget = get_run_budget()
+    if budget is None or not budget.nearly_exhausted() or completed + 1 >= max_iterations:
+        return max_iterations
+    logging.getLogger(__name__).warning(
+        "Run budget nearly used up (%s) - allowing one more iteration instead of %s",
+        budget.summary(), max_iterations - completed
+    )
+    return completed + 1
+
+
+def is_budget_error(error: BaseException | None) -> bool:
+    """Return whether an error was caused by an exhausted budget, even if wrapped."""
+    seen = set()
+    while error is not None and id(error) not in seen:
+        if isinstance(error, BudgetExceededError):
+            return True
+        seen.add(id(error))
+        error = error.__cause__ or error.__context__
+    return False
+
@@ -0,0 +1,43 @@
+"""Per-run context shared across ADW modules.
+
+The current run ID, phase and loop iteration are kept in context variables so
+cross-cutting concerns such as agent transcripts can locate the run folder
+without threading these values through every call.
+"""
+
+from contextvars import ContextVar
+
+_run_id: ContextVar[str | None] = ContextVar("adw_run_id", default=None)
+_phase: ContextVar[str | None] = ContextVar("adw_phase", default=None)
+_iteration: ContextVar[int | None] = ContextVar("adw_iteration", default=None)
+
+
+def set_run_id(run_id: str | None) -> None:
+    """Set the run identifier for the current context."""
+    _run_id.set(run_id)
+
+
+def get_run_id() -> str | None:
+    """Return the run identifier for the current context, if any."""
+    return _run_id.get()
+
+
+def set_phase(phase: str | None) -> None:
+    """Set the workflow phase for the current context and reset the iteration."""
+    _phase.set(phase)
+    _iteration.set(None)
+
+
+def get_phase() -> str | None:
+    """Return the workflow phase for the current context, if any."""
+    return _phase.get()
+
+
+def set_iteration(iteration: int | None) -> None:
+    """Set the loop iteration for the current context."""
+    _iteration.set(iteration)
+
+
+def get_iteration() -> int | None:
+    """Return the loop iteration for the current context, if any."""
+    return _iteration.get()
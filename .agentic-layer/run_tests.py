@@ -7,30 +7,59 @@
 # ///
 
 import logging
-from dotenv import load_dotenv
+from typing import NamedTuple
 from coding_agent import call_coding_agent
 from agent_types import AgentType
+from sharded_tests import maxfail_count, run_sharded_tests, shard_count
 
-load_dotenv()
+
+class RunTestsResult(NamedTuple):
+    """Whether a test run completed, and whether it stopped at maxfail."""
+    completed: bool
+    stopped_early: bool = False
 
 
 async def run_tests(
     test_result_folder: str,
-    agent_type: AgentType = AgentType.CLAUDE
-) -> bool:
+    agent_type: AgentType = AgentType.CLAUDE,
+    shards: int | None = None,
+    maxfail: int | None = None
+) -> RunTestsResult:
     """
     Runs tests calling the coding agent with the /test command.
 
+    With local shards configured, the suite runs in that many local pytest
+    processes instead, without an agent call. If the local run fails, the
+    agent runs the tests.
+
     Args:
         test_result_folder: Path to the test result folder
         agent_type: The coding agent to use (CLAUDE or COPILOT)
+        shards: Number of local pytest processes (default: ADW_TEST_SHARDS;
+                0 lets the agent run the tests)
+        maxfail: Stop a local run after this many failures
+                 (default: ADW_TEST_MAXFAIL; 0 runs the whole suite)
 
     Returns:
-        bool: True when ready, False otherwise
+        RunTestsResult: Whether the run completed, and whether a local run
+                        stopped at maxfail before the whole suite ran
     """
     logger = logging.getLogger(__name__)
     logger.info("Running tests, results in: %s", test_result_folder)
 
+    shards = shard_count(shards)
+    if shards:
+        try:
+            sharded_run = await run_sharded_tests(
+                test_result_folder, shards, maxfail=maxfail_count(maxfail)
+            )
+            logger.info(
+                "Local test run completed with %s shard report(s)", len(sharded_run.reports)
+            )
+            return RunTestsResult(True, sharded_run.stopped_early)
+        except (OSError, RuntimeError) as e:
+            logger.warning("Local sharded test run failed, falling back to the agent: %s", e)
+
     # Call the coding agent to run tests
     try:
         await call_coding_agent(
@@ -41,4 +70,4 @@ async def run_tests(
         raise
 
     logger.info("Tests command completed")
-    return True
+    return RunTestsResult(True)
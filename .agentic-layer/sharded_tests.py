@@ -0,0 +1,305 @@
+"""Sharded local test runs balanced by historical durations.
+
+Instead of asking the agent to run the suite, the test loop can run it
+locally in N pytest processes at once. The test files are collected with
+``pytest --collect-only`` and distributed over the shards like pytest-xdist's
+``--dist loadfile``: a file's tests always run in the same process, so
+module fixtures are set up once. Shards are balanced with the longest
+processing time first rule. A file's duration is the sum of the ``time``
+attributes of its tests in the previous reports of the run (the test folder
+and its archive), or else its duration in the project's test history (see
+result_history). Files without either count as the mean known duration.
+
+Within a shard, recently failing files run first, then the fastest. With
+``maxfail``, every shard stops after that many failures, and the remaining
+shards are interrupted as soon as the finished ones reported enough
+failures. The loop can then start resolving without waiting for the whole
+suite.
+
+Every shard writes ``shard_<n>.xml`` into a temporary folder. Only when
+the whole run succeeds are the reports moved into the test folder, where the
+test loop picks them up as usual, so a failed run leaves no partial reports
+behind for the agent's run.
+
+Configuration (environment variables):
+    ADW_TEST_SHARDS: Number of local pytest processes, "auto" for one per
+                     CPU core (default: 0, the agent runs the tests)
+    ADW_TEST_MAXFAIL: Stop a local test run after this many failures
+                      (default: 0, run the whole suite)
+    ADW_TEST_SHARD_TIMEOUT: Seconds a shard may take (default: 0, no limit)
+"""
+
+import asyncio
+import heapq
+import logging
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import NamedTuple
+
+from local_tests import pytest_command, pytest_node_id, read_test_cases, run_pytest
+from report_archive import read_archive_index, read_archived_reports
+from result_history import load_file_history, order_failed_first
+
+SHARD_REPORT_PATTERN = "shard_{index}.xml"
+
+
+class ShardedRun(NamedTuple):
+    """Reports of a sharded test run and whether it stopped at maxfail."""
+    reports: list[Path]
+    stopped_early: bool
+
+
+def shard_count(requested: int | None = None) -> int:
+    """
+    Return the number of local test shards.
+
+    Args:
+        requested: Explicit shard count (default: ADW_TEST_SHARDS)
+
+    Returns:
+        int: Shard count, 0 if the agent runs the tests
+    """
+    if requested is not None:
+        return max(0, requested)
+    configured = (os.getenv("ADW_TEST_SHARDS") or "0").strip().lower()
+    if configured == "auto":
+        return os.cpu_count() or 1
+    try:
+        return max(0, int(configured))
+    except ValueError:
+        logging.getLogger(__name__).warning("Ignoring invalid ADW_TEST_SHARDS=%r", configured)
+        return 0
+
+
+def maxfail_count(requested: int | None = None) -> int:
+    """
+    Return the failure count after which a local test run stops.
+
+    Args:
+        requested: Explicit threshold (default: ADW_TEST_MAXFAIL)
+
+    Returns:
+        int: Threshold, 0 to run the whole suite
+    """
+    if requested is not None:
+        return max(0, requested)
+    try:
+        return max(0, int(os.getenv("ADW_TEST_MAXFAIL") or 0))
+    except ValueError:
+        logging.getLogger(__name__).warning(
+            "Ignoring invalid ADW_TEST_MAXFAIL=%r", os.getenv("ADW_TEST_MAXFAIL")
+        )
+        return 0
+
+
+def shard_timeout() -> float:
+    """Return the time limit of a shard in seconds, 0 for no limit (ADW_TEST_SHARD_TIMEOUT)."""
+    try:
+        return max(0.0, float(os.getenv("ADW_TEST_SHARD_TIMEOUT") or 0))
+    except ValueError:
+        logging.getLogger(__name__).warning(
+            "Ignoring invalid ADW_TEST_SHARD_TIMEOUT=%r", os.getenv("ADW_TEST_SHARD_TIMEOUT")
+        )
+        return 0.0
+
+
+def balance_shards(durations: dict[str, float | None], shards: int) -> list[list[str]]:
+    """
+    Distribute test files over shards, longest first onto the least loaded shard.
+
+    Args:
+        durations: Test file to its expected duration in seconds (None: unknown)
+        shards: Number of shards
+
+    Returns:
+        list[list[str]]: Test files per shard; empty shards are left out
+    """
+    known = [duration for duration in durations.values() if duration is not None]
+    default = sum(known) / len(known) if known else 1.0
+    expected = {
+        path: default if duration is None else duration for path, duration in durations.items()
+    }
+    loads = [(0.0, index) for index in range(max(1, shards))]
+    assignment: list[list[str]] = [[] for _ in loads]
+    for path in sorted(expected, key=lambda p: (-expected[p], p)):
+        load, index = heapq.heappop(loads)
+        assignment[index].append(path)
+        heapq.heappush(loads, (load + expected[path], index))
+    return [sorted(files) for files in assignment if files]
+
+
+def _latest_reports(test_folder: Path) -> list[str | Path | bytes]:
+    """Return the reports in the test folder, or those of the last archived iteration."""
+    reports: list[str | Path | bytes] = sorted(test_folder.glob("*.xml"))
+    if reports:
+        return reports
+    index = read_archive_index(test_folder)
+    if not index:
+        return []
+    return [content for _, content in read_archived_reports(test_folder, index[-1]["archive"])]
+
+
+def report_durations(test_folder: str | Path, root: str | Path) -> dict[str, float]:
+    """
+    Sum the test times of the latest reports of a run per test file.
+
+    Args:
+        test_folder: Test folder of the run
+        root: Directory pytest runs in
+
+    Returns:
+        dict[str, float]: Test file (relative to root) to its duration in seconds
+    """
+    durations: dict[str, float] = {}
+    for report in _latest_reports(Path(test_folder)):
+        for test_id, _, time_s in read_test_cases(report):
+            node_id = pytest_node_id(test_id, root)
+            if node_id is not None:
+                path = node_id.split("::", 1)[0]
+                durations[path] = durations.get(path, 0.0) + time_s
+    return durations
+
+
+async def collect_test_files(cwd: str | Path | None = None) -> list[str]:
+    """
+    Collect the test files of the suite with pytest.
+
+    Args:
+        cwd: Directory pytest runs in
+
+    Returns:
+        list[str]: Test files relative to cwd, in collection order
+
+    Raises:
+        RuntimeError: If pytest is missing or collection fails
+    """
+    command = pytest_command()
+    if command is None:
+        raise RuntimeError("Test command not found")
+    process = await asyncio.create_subprocess_exec(
+        # An absolute verbosity overrides -v/-q from the project's addopts
+        *command, "--collect-only", "--verbosity=-1", "-p", "no:cacheprovider",
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        cwd=cwd
+    )
+    stdout, stderr = await process.communicate()
+    # Exit code 5: no tests collected
+    if process.returncode not in (0, 5):
+        output = (stdout + stderr).decode("utf-8", errors="replace").strip()
+        raise RuntimeError(f"Test collection failed ({process.returncode}): {output[-2000:]}")
+    files = []
+    for line in stdout.decode("utf-8", errors="replace").splitlines():
+        path = line.split("::", 1)[0].strip()
+        if "::" in line and path not in files:
+            files.append(path)
+    return files
+
+
+def _count_failures(report: Path) -> int:
+    """Count the failed and erroring tests of a shard report."""
+    return sum(
+        1 for _, outcome, _ in read_test_cases(report) if outcome in ("failed", "error")
+    ) if report.exists() else 0
+
+
+async def _run_shards(
+    assignment: list[list[str]], reports: list[Path], cwd: Path, maxfail: int
+) -> bool:
+    """
+    Run the shards concurrently, interrupting them once maxfail failures are known.
+
+    Returns:
+        bool: True if the run was stopped early
+    """
+    logger = logging.getLogger(__name__)
+    options = [f"--maxfail={maxfail}"] if maxfail else []
+    timeout = shard_timeout()
+    tasks = {
+        asyncio.ensure_future(run_pytest([*shard_files, *options], report, cwd, timeout)): report
+        for shard_files, report in zip(assignment, reports)
+    }
+    pending = set(tasks)
+    failures = 0
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                report = tasks[task]
+                exit_code = task.result()
+                # Exit code 1 only means that tests failed
+                if not report.exists():
+                    raise RuntimeError(
+                        f"Test shard {report.name} wrote no report (exit code {exit_code})"
+                    )
+                failures += _count_failures(report)
+                logger.debug("Shard %s finished with exit code %s", report.name, exit_code)
+            if maxfail and failures >= maxfail and pending:
+                logger.info(
+                    "%s failure(s) known - interrupting %s remaining shard(s)",
+                    failures, len(pending)
+                )
+                return True
+        return bool(maxfail and failures >= maxfail)
+    finally:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+
+async def run_sharded_tests(
+    test_result_folder: str | Path, shards: int, cwd: str | Path | None = None,
+    maxfail: int = 0
+) -> ShardedRun:
+    """
+    Run the suite in balanced pytest shards.
+
+    Args:
+        test_result_folder: Folder the shard reports are written to
+        shards: Number of pytest processes
+        cwd: Directory pytest runs in (default: the current directory)
+        maxfail: Stop after this many failures (0: run the whole suite)
+
+    Returns:
+        ShardedRun: The JUnit reports written by the shards (in the test
+                    folder), and whether maxfail stopped the run before the
+                    whole suite ran
+
+    Raises:
+        RuntimeError: If collection fails, or a shard times out or writes no
+                      report; no report is moved into the test folder then
+    """
+    logger = logging.getLogger(__name__)
+    cwd = Path(cwd or os.getcwd())
+    test_folder = Path(test_result_folder)
+    files = await collect_test_files(cwd)
+    if not files:
+        raise RuntimeError("pytest collected no tests")
+
+    file_history = load_file_history()
+    durations = {path: entry.duration_s for path, entry in file_history.items()}
+    durations.update(report_durations(test_folder, cwd))
+    assignment = [
+        order_failed_first(shard_files, file_history)
+        for shard_files in balance_shards({path: durations.get(path) for path in files}, shards)
+    ]
+    logger.info(
+        "Running %s test file(s) in %s shard(s), %s with duration history",
+        len(files), len(assignment), sum(1 for path in files if path in durations)
+    )
+
+    with tempfile.TemporaryDirectory(prefix="adw_shards_") as temp_dir:
+        reports = [
+            Path(temp_dir) / SHARD_REPORT_PATTERN.format(index=index)
+            for index in range(1, len(assignment) + 1)
+        ]
+        stopped_early = await _run_shards(assignment, reports, cwd, maxfail)
+        if stopped_early:
+            logger.info("Test run stopped early after reaching %s failure(s)", maxfail)
+        written = []
+        for report in reports:
+            if report.exists():
+                written.append(Path(shutil.move(report, test_folder / report.name)))
+    return ShardedRun(written, stopped_early)
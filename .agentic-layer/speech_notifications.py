@@ -9,8 +9,14 @@ Provides audio feedback for workflow completion and errors.
 # ///
 
 import logging
+import os
 import random
-import pyttsx3
+import subprocess
+import sys
+
+from event_bus import DropPolicy, EventType, WorkflowEvent, get_event_bus
+
+SPEECH_SUBSCRIBER = "speech"
 
 # Suppress verbose INFO logs from comtypes (Windows COM wrapper)
 logging.getLogger('comtypes').setLevel(logging.WARNING)
@@ -41,16 +47,35 @@ ERROR_MESSAGES = [
 ]
 
 
-def speak_notification(message: str):
-    """Speak a notification message using text-to-speech.
+def speech_enabled() -> bool:
+    """Check whether spoken notifications should be played.
 
-    Args:
-        message: The text message to speak
+    The ``ADW_SPEECH`` environment variable forces speech on ("1", "on", "true")
+    or off ("0", "off", "false"). Otherwise speech is skipped for unattended
+    runs (no interactive terminal or a CI environment) and on Linux machines
+    without a graphical session.
 
-    Note:
-        Errors are logged but don't raise exceptions to avoid breaking workflow.
+    Returns:
+        bool: True if notifications should be spoken
     """
+    setting = os.getenv("ADW_SPEECH", "auto").strip().lower()
+    if setting in ("0", "off", "false", "no"):
+        return False
+    if setting in ("1", "on", "true", "yes"):
+        return True
+
+    if os.getenv("CI") or not sys.stdin or not sys.stdin.isatty():
+        return False
+    if sys.platform.startswith("linux"):
+        return bool(os.getenv("DISPLAY") or os.getenv("WAYLAND_DISPLAY"))
+    return True
+
+
+def _speak_now(message: str):
+    """Speak a message synchronously, importing the TTS engine on demand."""
     try:
+        import pyttsx3  # pylint: disable=import-outside-toplevel
+
         engine = pyttsx3.init()
         # Set speech rate (slower for clarity)
         engine.setProperty('rate', 150)
@@ -61,33 +86,92 @@ def speak_notification(message: str):
         logging.getLogger(__name__).warning("Failed to speak notification: %s", e)
 
 
-def speak_success():
-    """Speak a randomly selected success message."""
-    message = random.choice(SUCCESS_MESSAGES)
+def speak_notification(message: str, blocking: bool = False):
+    """Speak a notification message using text-to-speech.
+
+    By default the message is handed to a detached child process, so neither
+    the event loop nor process exit waits on engine start-up or audio playback.
+
+    Args:
+        message: The text message to speak
+        blocking: Speak in the current process and wait until playback ends
+
+    Note:
+        Errors are logged but don't raise exceptions to avoid breaking workflow.
+    """
+    if blocking:
+        _speak_now(message)
+        return
+
+    if not speech_enabled():
+        logging.getLogger(__name__).debug("Speech disabled, skipping: %s", message)
+        return
+
+    try:
+        subprocess.Popen(  # pylint: disable=consider-using-with
+            [sys.executable, __file__, "--message", message, "--blocking"],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True
+        )
+    except OSError as e:
+        logging.getLogger(__name__).warning("Failed to start speech process: %s", e)
+
+
+def _announce(message: str, blocking: bool) -> None:
+    """Print and speak a message, unless speech is disabled."""
+    # A blocking call speaks in the current process, as asked, e.g. by the speech process
+    if not blocking and not speech_enabled():
+        logging.getLogger(__name__).debug("Speech disabled, skipping: %s", message)
+        return
     print(f"[SPEECH] Speaking: {message}")
-    speak_notification(message)
+    speak_notification(message, blocking)
 
 
-def speak_error():
+def speak_success(blocking: bool = False):
+    """Speak a randomly selected success message."""
+    _announce(random.choice(SUCCESS_MESSAGES), blocking)
+
+
+def speak_error(blocking: bool = False):
     """Speak a randomly selected error message."""
-    message = random.choice(ERROR_MESSAGES)
-    print(f"[SPEECH] Speaking: {message}")
-    speak_notification(message)
+    _announce(random.choice(ERROR_MESSAGES), blocking)
 
 
-def speak_custom(message: str):
+def speak_custom(message: str, blocking: bool = False):
     """Speak a custom message.
 
     Args:
         message: Custom text to speak
+        blocking: Speak in the current process and wait until playback ends
     """
-    print(f"[SPEECH] Speaking: {message}")
-    speak_notification(message)
+    _announce(message, blocking)
+
+
+def _on_workflow_finished(event: WorkflowEvent) -> None:
+    """Speak the outcome of a finished workflow."""
+    if event.data.get("success"):
+        speak_success()
+    else:
+        speak_error()
+
+
+def subscribe_speech() -> None:
+    """Speak a notification whenever a workflow finishes (registered once)."""
+    bus = get_event_bus()
+    if not bus.is_subscribed(SPEECH_SUBSCRIBER):
+        bus.subscribe(
+            _on_workflow_finished,
+            name=SPEECH_SUBSCRIBER,
+            event_types={EventType.WORKFLOW_FINISHED},
+            maxsize=1,
+            policy=DropPolicy.DROP_OLDEST
+        )
 
 
 # Testing
 if __name__ == "__main__":
-    import sys
     import argparse
 
     parser = argparse.ArgumentParser(description="Test speech notifications")
@@ -101,30 +185,39 @@ if __name__ == "__main__":
         "--message",
         help="Custom message to speak (use with 'custom' action or standalone)"
     )
+    parser.add_argument(
+        "--blocking",
+        action="store_true",
+        help="Speak synchronously in this process and wait until playback ends "
+             "(used by the background speech process)"
+    )
 
     args = parser.parse_args()
 
     # If a custom message is provided without action, speak it directly
     if args.message and not args.action:
-        speak_custom(args.message)
+        if args.blocking:
+            speak_notification(args.message, blocking=True)
+        else:
+            speak_custom(args.message, blocking=True)
         sys.exit(0)
 
     # Non-interactive mode
     if args.action:
         if args.action == "success":
-            speak_success()
+            speak_success(blocking=True)
         elif args.action == "error":
-            speak_error()
+            speak_error(blocking=True)
         elif args.action == "all-success":
             print("\nTesting all success messages...")
             for msg in SUCCESS_MESSAGES:
                 print(f"\n[SPEECH] {msg}")
-                speak_notification(msg)
+                speak_notification(msg, blocking=True)
         elif args.action == "all-error":
             print("\nTesting all error messages...")
             for msg in ERROR_MESSAGES:
                 print(f"\n[SPEECH] {msg}")
-                speak_notification(msg)
+                speak_notification(msg, blocking=True)
         print("\n[OK] Test complete!")
         sys.exit(0)
 
@@ -142,22 +235,22 @@ if __name__ == "__main__":
     choice = input("Enter choice (1-5): ").strip()
 
     if choice == "1":
-        speak_success()
+        speak_success(blocking=True)
     elif choice == "2":
-        speak_error()
+        speak_error(blocking=True)
     elif choice == "3":
         custom = input("Enter custom message: ")
-        speak_custom(custom)
+        speak_custom(custom, blocking=True)
     elif choice == "4":
         print("\nTesting all success messages...")
         for msg in SUCCESS_MESSAGES:
             print(f"\n[SPEECH] {msg}")
-            speak_notification(msg)
+            speak_notification(msg, blocking=True)
     elif choice == "5":
         print("\nTesting all error messages...")
         for msg in ERROR_MESSAGES:
             print(f"\n[SPEECH] {msg}")
-            speak_notification(msg)
+            speak_notification(msg, blocking=True)
     else:
         print("Invalid choice")
         sys.exit(1)
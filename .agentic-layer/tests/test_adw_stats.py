@@ -0,0 +1,68 @@
+"""Unit tests for adw_stats module."""
+import json
+from datetime import datetime, timezone
+
+import pytest
+
+from adw_stats import build_report, load_runs, percentile, select_runs
+
+
+def _write_run(run_directory, run_id, started_at, phases, calls):
+    run_folder = run_directory / run_id
+    (run_folder / "transcripts").mkdir(parents=True)
+    with open(run_folder / "phases.jsonl", "w", encoding="utf-8") as f:
+        for phase, duration, iterations in phases:
+            f.write(json.dumps({
+                "run_id": run_id, "phase": phase, "started_at": started_at,
+                "duration_s": duration, "status": "success", "iterations": iterations,
+            }) + "\n")
+    with open(run_folder / "transcripts" / "index.jsonl", "w", encoding="utf-8") as f:
+        for command, agent, duration in calls:
+            f.write(json.dumps({
+                "run_id": run_id, "phase": "test", "iteration": 1, "command": command,
+                "agent": agent, "model": "sonnet", "started_at": started_at,
+                "duration_s": duration, "status": "success",
+            }) + "\n")
+
+
+def test_percentile_uses_nearest_rank():
+    """Test that percentiles pick an observed value by nearest rank."""
+    values = list(range(1, 21))
+
+    assert percentile(values, 0.5) == 10
+    assert percentile(values, 0.95) == 19
+    assert percentile([7], 0.95) == 7
+
+
+def test_report_aggregates_phases_commands_and_iterations(tmp_path):
+    """Test that phases, calls and loop iterations are summarized across runs."""
+    _write_run(tmp_path, "run_a", "2026-10-01T10:00:00+00:00",
+               [("test", 100.0, 3), ("review", 50.0, 1)], [("test", "claude", 20.0)])
+    _write_run(tmp_path, "run_b", "2026-10-02T10:00:00+00:00",
+               [("test", 300.0, 5)], [("test", "local", 40.0), ("classify", "local", 2.0)])
+
+    report = build_report(load_runs(tmp_path), slowest=1)
+
+    assert report["phases"]["test"]["p50"] == 100.0
+    assert report["phases"]["test"]["p95"] == 300.0
+    assert report["command"]["test"]["count"] == 2
+    assert report["agent"]["local"]["count"] == 2
+    assert report["iterations"]["test"]["max"] == 5
+    assert report["slowest_runs"] == [{
+        "run_id": "run_b", "started_at": "2026-10-02T10:00:00+00:00",
+        "wall_s": 300.0, "calls": 2, "failed_calls": 0,
+    }]
+
+
+def test_select_runs_by_window_and_agent(tmp_path):
+    """Test that runs are selected by start time and by their agent calls."""
+    _write_run(tmp_path, "run_a", "2026-10-01T10:00:00+00:00", [], [("test", "claude", 1.0)])
+    _write_run(tmp_path, "run_b", "2026-10-05T10:00:00+00:00", [], [("test", "local", 1.0)])
+    runs = load_runs(tmp_path)
+
+    since = datetime(2026, 10, 3, tzinfo=timezone.utc)
+    assert [run.run_id for run in select_runs(runs, since=since)] == ["run_b"]
+    assert [run.run_id for run in select_runs(runs, until=since)] == ["run_a"]
+    assert [run.run_id for run in select_runs(runs, where=["agent=claude"])] == ["run_a"]
+    with pytest.raises(ValueError):
+        select_runs(runs, where=["agent"])
@@ -0,0 +1,76 @@
+"""Unit tests for agent_backends module."""
+import pytest
+
+import agent_backends
+from agent_backends import (
+    CAPABILITY_SHELL, AgentBackend, check_backend_supports, command_backend, get_backend,
+    register_backend
+)
+from agent_types import AgentType
+
+
+class _FakeEntryPoint:
+    name = "fake"
+    value = "fake_package:BACKEND"
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    def load(self):
+        return self.backend
+
+
+def test_command_backend_routes_listed_commands(monkeypatch):
+    """Test that ADW_COMMAND_BACKENDS maps single commands to a backend."""
+    monkeypatch.setenv("ADW_COMMAND_BACKENDS", "classify=local, branch_name = LOCAL,broken")
+
+    assert command_backend("classify") == "local"
+    assert command_backend("branch_name") == "local"
+    assert command_backend("implement") is None
+
+
+def test_register_backend_rejects_duplicates(monkeypatch):
+    """Test that a name can only be registered once unless replaced."""
+    monkeypatch.setattr(agent_backends, "_backends", {})
+    first = AgentBackend("demo", prepare=lambda request: None)
+    second = AgentBackend("demo", prepare=lambda request: None)
+
+    register_backend(first)
+    with pytest.raises(ValueError):
+        register_backend(second)
+    register_backend(second, replace=True)
+
+    assert get_backend("DEMO") is second
+
+
+def test_entry_point_backends_become_agent_types(monkeypatch):
+    """Test that a backend from an entry point is usable as an agent type."""
+    backend = AgentBackend("plugin_agent", prepare=lambda request: None)
+    monkeypatch.setattr(agent_backends, "_backends", {})
+    monkeypatch.setattr(agent_backends, "_entry_points_loaded", False)
+    monkeypatch.setattr(
+        agent_backends, "entry_points", lambda group: [_FakeEntryPoint(lambda: backend)]
+    )
+
+    agent_type = AgentType.from_string("plugin_agent")
+
+    assert get_backend("plugin_agent") is backend
+    assert agent_type.value == "plugin_agent"
+    assert AgentType("plugin_agent") is agent_type
+    assert "plugin_agent" in AgentType.choices()
+    with pytest.raises(ValueError):
+        AgentType.from_string("unknown_agent")
+
+
+def test_shell_commands_need_a_shell_backend():
+    """Test that tests and linters are never routed to a backend without shell."""
+    no_shell = AgentBackend("files_only", prepare=lambda request: None)
+    with_shell = AgentBackend(
+        "full", prepare=lambda request: None, capabilities=frozenset({CAPABILITY_SHELL})
+    )
+
+    for command in ("test", "resolve_failed_test", "lint"):
+        with pytest.raises(ValueError, match="shell"):
+            check_backend_supports(no_shell, command)
+        check_backend_supports(with_shell, command)
+    check_backend_supports(no_shell, "classify")
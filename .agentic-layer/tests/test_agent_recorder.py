@@ -0,0 +1,123 @@
+"""Unit tests for agent_recorder module."""
+import asyncio
+import json
+import subprocess
+
+import pytest
+
+import agent_recorder
+import run_context
+from agent_recorder import _match_call, normalize_argument, record_call, replay_call
+
+
+def _git(cwd, *args):
+    subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True)
+
+
+def _make_repository(path):
+    path.mkdir()
+    _git(path, "init", "-q")
+    _git(path, "config", "user.email", "test@localhost")
+    _git(path, "config", "user.name", "Test")
+    (path / "app.py").write_text("VALUE = 1\n", encoding="utf-8")
+    (path / ".gitignore").write_text(".agentic-runs/\n", encoding="utf-8")
+    _git(path, "add", "-A")
+    _git(path, "commit", "-q", "-m", "Initial commit")
+    return path
+
+
+def test_normalize_argument_replaces_run_folder_and_id(monkeypatch, tmp_path):
+    """Test that run-specific paths and IDs become placeholders."""
+    monkeypatch.setenv("RUN_DIRECTORY", str(tmp_path))
+    run_context.set_run_id("abc123")
+    try:
+        spec = tmp_path / "abc123" / "spec_abc123.md"
+        assert normalize_argument(str(spec)) == "{run}/spec_{run_id}.md"
+        assert normalize_argument("abc123") == "{run_id}"
+    finally:
+        run_context.set_run_id(None)
+
+
+def test_match_call_requires_exact_arguments_unless_loose():
+    """Test that only exact argument matches replay, unless loose matching is on."""
+    calls = [
+        {"sequence": 0, "command": "implement", "arguments": ["a"]},
+        {"sequence": 1, "command": "implement", "arguments": ["b"]},
+        {"sequence": 2, "command": "lint", "arguments": ["a"]},
+    ]
+
+    assert _match_call(calls, set(), "implement", ["b"])["sequence"] == 1
+    with pytest.raises(RuntimeError, match="ADW_REPLAY_LOOSE_MATCH"):
+        _match_call(calls, {1}, "implement", ["c"])
+    assert _match_call(calls, {1}, "implement", ["c"], loose=True)["sequence"] == 0
+    with pytest.raises(RuntimeError):
+        _match_call(calls, {0, 1}, "implement", ["a"])
+
+
+def test_record_and_replay_round_trip(monkeypatch, tmp_path):
+    """Test that a replay re-applies the messages, repository diff and run artifacts."""
+    monkeypatch.setenv("ADW_RECORDING_DIR", str(tmp_path / "recording"))
+    monkeypatch.setattr(agent_recorder, "_record_lock", None)
+    monkeypatch.setattr(agent_recorder, "_replay_cursors", {})
+
+    recorded = _make_repository(tmp_path / "recorded")
+    monkeypatch.setenv("RUN_DIRECTORY", str(recorded / ".agentic-runs"))
+    run_context.set_run_id("rec1")
+    try:
+        spec = recorded / ".agentic-runs" / "rec1" / "spec_rec1.md"
+
+        async def execute(sink):
+            sink.write({"type": "assistant", "content": "done"})
+            (recorded / "app.py").write_text("VALUE = 2\n", encoding="utf-8")
+            spec.write_text("# Spec\n", encoding="utf-8")
+
+        asyncio.run(record_call(execute, "implement", [str(spec)], "sonnet", None, str(recorded)))
+    finally:
+        run_context.set_run_id(None)
+
+    index = [
+        json.loads(line)
+        for line in (tmp_path / "recording" / "calls.jsonl").read_text(encoding="utf-8").splitlines()
+    ]
+    assert index[0]["arguments"] == ["{run}/spec_{run_id}.md"]
+    assert index[0]["artifacts"] == ["spec_{run_id}.md"]
+
+    replayed = _make_repository(tmp_path / "replayed")
+    monkeypatch.setenv("RUN_DIRECTORY", str(replayed / ".agentic-runs"))
+    transcript = agent_recorder._MessageSink(None)
+    run_context.set_run_id("rep2")
+    try:
+        spec = replayed / ".agentic-runs" / "rep2" / "spec_rep2.md"
+        asyncio.run(replay_call("implement", [str(spec)], transcript, str(replayed)))
+    finally:
+        run_context.set_run_id(None)
+
+    assert transcript.messages == [{"type": "assistant", "content": "done"}]
+    assert (replayed / "app.py").read_text(encoding="utf-8") == "VALUE = 2\n"
+    assert spec.read_text(encoding="utf-8") == "# Spec\n"
+
+
+def test_failed_call_is_recorded_and_replayed(monkeypatch, tmp_path):
+    """Test that a failing call's partial effects are recorded and its error replayed."""
+    monkeypatch.setenv("ADW_RECORDING_DIR", str(tmp_path / "recording"))
+    monkeypatch.setattr(agent_recorder, "_record_lock", None)
+    monkeypatch.setattr(agent_recorder, "_replay_cursors", {})
+
+    recorded = _make_repository(tmp_path / "recorded")
+
+    async def execute(sink):
+        (recorded / "app.py").write_text("VALUE = 2\n", encoding="utf-8")
+        raise RuntimeError("Claude Code SDK execution failed: boom")
+
+    with pytest.raises(RuntimeError, match="boom"):
+        asyncio.run(record_call(execute, "patch", ["issue"], "sonnet", None, str(recorded)))
+
+    index = json.loads((tmp_path / "recording" / "calls.jsonl").read_text(encoding="utf-8"))
+    assert index["error"] == {
+        "type": "RuntimeError", "message": "Claude Code SDK execution failed: boom"
+    }
+
+    replayed = _make_repository(tmp_path / "replayed")
+    with pytest.raises(RuntimeError, match="boom"):
+        asyncio.run(replay_call("patch", ["issue"], None, str(replayed)))
+    assert (replayed / "app.py").read_text(encoding="utf-8") == "VALUE = 2\n"
@@ -0,0 +1,29 @@
+"""Unit tests for argument_store module."""
+import run_context
+from argument_store import externalize_argument
+
+
+def test_small_arguments_stay_inline(monkeypatch):
+    """Test that arguments below the threshold are passed unchanged."""
+    monkeypatch.setenv("ADW_MAX_INLINE_ARG_BYTES", "100")
+
+    assert externalize_argument("short") == "short"
+
+
+def test_large_arguments_are_stored_once_in_run_folder(monkeypatch, tmp_path):
+    """Test that large arguments go to a content-addressed file in the run folder."""
+    monkeypatch.setenv("ADW_MAX_INLINE_ARG_BYTES", "10")
+    monkeypatch.setenv("RUN_DIRECTORY", str(tmp_path))
+    run_context.set_run_id("run123")
+    try:
+        first = externalize_argument("x" * 50)
+        second = externalize_argument("x" * 50)
+    finally:
+        run_context.set_run_id(None)
+
+    args_folder = tmp_path / "run123" / "args"
+    stored = list(args_folder.iterdir())
+    assert first == second
+    assert len(stored) == 1
+    assert str(stored[0]) in first
+    assert stored[0].read_text(encoding="utf-8") == "x" * 50
@@ -0,0 +1,36 @@
+"""Unit tests for the lint-on-write hook in claude_options module."""
+import asyncio
+from claude_options import lint_on_write_hook
+
+
+def test_hook_reports_remaining_violations(monkeypatch, tmp_path):
+    """Test that violations left after autofixing are fed back to the agent."""
+    source = tmp_path / "app.py"
+    source.write_text("x=1\n", encoding="utf-8")
+
+    async def fake_lint_file(path, cwd=None):
+        source.write_text("x = 1\n", encoding="utf-8")
+        return ["ruff"], [{"line": 1, "column": 1, "code": "F821", "message": "Undefined name"}]
+
+    monkeypatch.setattr("claude_options.lint_file", fake_lint_file)
+    output = asyncio.run(lint_on_write_hook(
+        {"tool_name": "Write", "tool_input": {"file_path": str(source)}}, None, None
+    ))
+
+    context = output["hookSpecificOutput"]["additionalContext"]
+    assert output["hookSpecificOutput"]["hookEventName"] == "PostToolUse"
+    assert "reformatted on disk" in context
+    assert "[F821] Undefined name" in context
+
+
+def test_hook_is_silent_without_applicable_linters(monkeypatch, tmp_path):
+    """Test that nothing is reported when no linter handles the file."""
+    async def fake_lint_file(path, cwd=None):
+        return [], []
+
+    monkeypatch.setattr("claude_options.lint_file", fake_lint_file)
+    output = asyncio.run(lint_on_write_hook(
+        {"tool_name": "Edit", "tool_input": {"file_path": str(tmp_path / "notes.txt")}}, None, None
+    ))
+
+    assert output == {}
@@ -0,0 +1,67 @@
+"""Unit tests for compact_test_failure module."""
+from pathlib import Path
+from junitparser import Failure, TestCase
+from compact_test_failure import compact_test_case, compact_trace, head_tail
+
+PYTEST_TRACE = """def test_fetch():
+>       fetch()
+
+tests/test_client.py:5: 
+_ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _
+
+/venv/lib/python3.13/site-packages/requests/api.py:73: in get
+    return request("get", url)
+E   ValueError: boom
+
+/venv/lib/python3.13/site-packages/requests/sessions.py:12: ValueError"""
+
+
+def test_pytest_trace_drops_library_frames_but_keeps_error():
+    """Test that library frames are omitted while the raised error is kept."""
+    trace = compact_trace(PYTEST_TRACE, Path("/repo"))
+
+    assert ">       fetch()" in trace
+    assert "tests/test_client.py:5:" in trace
+    assert "requests/api.py" not in trace
+    assert "[1 library frame(s) omitted]" in trace
+    assert "E   ValueError: boom" in trace
+
+
+def test_python_traceback_collapses_repeated_frames():
+    """Test that identical consecutive frames are collapsed with a count."""
+    frame = '  File "/repo/app.py", line 8, in run\n    run()\n'
+    text = "Traceback (most recent call last):\n" + frame * 4 + "RecursionError: too deep"
+
+    trace = compact_trace(text, Path("/repo"))
+
+    assert trace.count('File "/repo/app.py"') == 1
+    assert "[previous frame repeated 3 more times]" in trace
+    assert trace.endswith("RecursionError: too deep")
+
+
+def test_head_tail_keeps_both_ends():
+    """Test that long output keeps its first and last lines."""
+    text = "\n".join(f"line {i}" for i in range(100))
+
+    result = head_tail(text, head=2, tail=3)
+
+    assert result.splitlines() == ["line 0", "line 1", "... [95 lines omitted] ...",
+                                   "line 97", "line 98", "line 99"]
+
+
+def test_compact_test_case_includes_message_and_capped_output():
+    """Test that the compact form has identity, message, trace and shortened output."""
+    test_case = TestCase("test_fetch", classname="tests.test_client")
+    failure = Failure("assert 1 == 2", "AssertionError")
+    failure.text = PYTEST_TRACE
+    test_case.result = [failure]
+    test_case.system_out = "\n".join(f"log {i}" for i in range(1000))
+
+    compact = compact_test_case(test_case, Path("/repo"))
+
+    assert compact.startswith("Test: tests.test_client::test_fetch")
+    assert "Result: failure (AssertionError)" in compact
+    assert "Message: assert 1 == 2" in compact
+    assert "lines omitted" in compact
+    assert "log 500" not in compact
+    assert len(compact) < len(test_case.tostring())
@@ -0,0 +1,47 @@
+"""Unit tests for convergence_tracker module."""
+from junitparser import TestSuite, TestCase
+from convergence_tracker import ConvergenceDecision, ConvergenceTracker, failing_test_ids
+
+
+def test_failing_test_ids_use_classname_or_suite():
+    """Test that ids combine classname (or suite name) and test name."""
+    suite = TestSuite("Suite")
+    with_class = TestCase("test_a", classname="tests.test_mod")
+    without_class = TestCase("test_b")
+    suite.add_testcase(with_class)
+    suite.add_testcase(without_class)
+
+    assert failing_test_ids([suite]) == {"tests.test_mod::test_a", "Suite::test_b"}
+
+
+def test_shrinking_failures_are_progress():
+    """Test that fewer failures than ever before count as progress."""
+    tracker = ConvergenceTracker()
+    assert tracker.record({"a", "b", "c"}) == ConvergenceDecision.PROGRESS
+    assert tracker.record({"a"}) == ConvergenceDecision.PROGRESS
+    assert tracker.best_iteration == 2
+
+
+def test_stall_after_limit_without_progress():
+    """Test that the loop stalls after stall_limit iterations without a new best."""
+    tracker = ConvergenceTracker(stall_limit=2)
+    tracker.record({"a", "b"})
+    assert tracker.record({"a", "c"}) == ConvergenceDecision.NO_PROGRESS
+    assert tracker.record({"a", "d"}) == ConvergenceDecision.STALLED
+
+
+def test_growing_failures_are_regression():
+    """Test that more failures than the previous iteration is a regression."""
+    tracker = ConvergenceTracker()
+    tracker.record({"a"})
+    assert tracker.record({"a", "b"}) == ConvergenceDecision.REGRESSED
+    assert tracker.best_count == 1
+
+
+def test_reset_stall_grants_fresh_budget():
+    """Test that resetting the stall counter delays the stall decision."""
+    tracker = ConvergenceTracker(stall_limit=1)
+    tracker.record({"a"})
+    assert tracker.record({"b"}) == ConvergenceDecision.STALLED
+    tracker.reset_stall()
+    assert tracker.record({"c"}) == ConvergenceDecision.STALLED
@@ -0,0 +1,115 @@
+"""Unit tests for event_bus module."""
+import asyncio
+
+import run_context
+from event_bus import DropPolicy, EventBus, EventType, WorkflowEvent
+
+
+def _event(number: int) -> WorkflowEvent:
+    return WorkflowEvent(EventType.TEST_RESULTS, {"number": number})
+
+
+def test_subscribers_receive_filtered_events_in_order():
+    """Test that each subscriber gets the event types it asked for, in order."""
+    bus = EventBus()
+    received, finished = [], []
+    bus.subscribe(lambda event: received.append(event.data["number"]), name="all")
+
+    async def on_finished(event):
+        await asyncio.sleep(0)
+        finished.append(event.type)
+
+    bus.subscribe(on_finished, name="finished", event_types={EventType.WORKFLOW_FINISHED})
+
+    async def run():
+        for number in range(3):
+            bus.publish(_event(number))
+        bus.publish(WorkflowEvent(EventType.WORKFLOW_FINISHED, {"number": 3}))
+        assert await bus.drain(timeout=1)
+
+    asyncio.run(run())
+
+    assert received == [0, 1, 2, 3]
+    assert finished == [EventType.WORKFLOW_FINISHED]
+
+
+def test_full_queues_apply_drop_policy():
+    """Test that publishing never waits and full queues drop by policy."""
+    bus = EventBus()
+    newest, oldest = [], []
+    bus.subscribe(lambda event: newest.append(event.data["number"]), name="newest",
+                  maxsize=2, policy=DropPolicy.DROP_NEWEST)
+    bus.subscribe(lambda event: oldest.append(event.data["number"]), name="oldest",
+                  maxsize=2, policy=DropPolicy.DROP_OLDEST)
+
+    async def run():
+        # Consumers only run once control returns to the loop
+        for number in range(5):
+            bus.publish(_event(number))
+        await bus.drain(timeout=1)
+
+    asyncio.run(run())
+
+    assert newest == [0, 1]
+    assert oldest == [3, 4]
+    assert bus.dropped_counts() == {"newest": 3, "oldest": 3}
+
+
+def test_failing_subscriber_does_not_affect_others():
+    """Test that handler errors are contained in their subscriber."""
+    bus = EventBus()
+    received = []
+
+    def broken(event):
+        raise RuntimeError("boom")
+
+    bus.subscribe(broken)
+    bus.subscribe(lambda event: received.append(event.data["number"]), name="ok")
+
+    async def run():
+        bus.publish(_event(1))
+        bus.publish(_event(2))
+        assert await bus.drain(timeout=1)
+
+    asyncio.run(run())
+
+    assert received == [1, 2]
+
+
+def test_subscribers_survive_across_event_loops():
+    """Test that events queued outside a loop are delivered in a later loop."""
+    bus = EventBus()
+    received = []
+    bus.subscribe(lambda event: received.append(event.data["number"]), name="collector")
+
+    async def publish_and_drain(number):
+        bus.publish(_event(number))
+        await bus.drain(timeout=1)
+
+    asyncio.run(publish_and_drain(1))
+    bus.publish(_event(2))
+    asyncio.run(publish_and_drain(3))
+
+    assert received == [1, 2, 3]
+
+
+def test_emit_tags_events_with_run_context(monkeypatch):
+    """Test that emitted events carry the current run, phase and iteration."""
+    import event_bus  # pylint: disable=import-outside-toplevel
+
+    bus = EventBus()
+    monkeypatch.setattr(event_bus, "_bus", bus)
+    received = []
+    bus.subscribe(received.append, name="collector")
+
+    async def run():
+        run_context.set_run_id("run1")
+        run_context.set_phase("test")
+        run_context.set_iteration(2)
+        event_bus.emit(EventType.ITERATION_STARTED, note="x")
+        await bus.drain(timeout=1)
+
+    asyncio.run(run())
+
+    assert (received[0].run_id, received[0].phase, received[0].iteration) == ("run1", "test", 2)
+    assert received[0].data == {"note": "x"}
@@ -0,0 +1,91 @@
+"""Unit tests for flaky_tests and local_tests modules."""
+import asyncio
+import json
+import sys
+
+from junitparser import TestSuite, TestCase, Failure
+from flaky_tests import FlakyTestDetector, load_flaky_tests
+from local_tests import pytest_node_id
+
+SAMPLE_TESTS = '''
+from pathlib import Path
+
+
+class TestSample:
+    def test_flaky(self):
+        marker = Path(__file__).with_name("ran_once")
+        first_run = not marker.exists()
+        marker.touch()
+        assert not first_run
+
+    def test_broken(self):
+        assert False
+'''
+
+
+def _failing_suite(*names):
+    suite = TestSuite("pytest")
+    for name in names:
+        test_case = TestCase(name, classname="tests.test_sample.TestSample")
+        test_case.result = [Failure("assert False")]
+        suite.add_testcase(test_case)
+    return [suite]
+
+
+def test_pytest_node_id_resolves_module_and_classes(tmp_path):
+    """Test that the longest classname prefix naming a file becomes the module path."""
+    (tmp_path / "tests").mkdir()
+    (tmp_path / "tests" / "test_sample.py").write_text("", encoding="utf-8")
+
+    assert pytest_node_id("tests.test_sample.TestSample::test_x[1-a]", tmp_path) == (
+        "tests/test_sample.py::TestSample::test_x[1-a]"
+    )
+    assert pytest_node_id("tests.test_sample::test_y", tmp_path) == "tests/test_sample.py::test_y"
+    assert pytest_node_id("other.TestSample::test_x", tmp_path) is None
+    assert pytest_node_id("no separator", tmp_path) is None
+
+
+def test_detector_quarantines_tests_that_pass_on_rerun(monkeypatch, tmp_path):
+    """Test that a flaky test is quarantined and recorded while a broken test stays."""
+    (tmp_path / "tests").mkdir()
+    (tmp_path / "tests" / "test_sample.py").write_text(SAMPLE_TESTS, encoding="utf-8")
+    (tmp_path / "tests" / "__init__.py").write_text("", encoding="utf-8")
+    flaky_file = tmp_path / "flaky_tests.json"
+    monkeypatch.setenv("ADW_TEST_COMMAND", f"{sys.executable} -m pytest")
+    monkeypatch.setenv("ADW_FLAKY_TESTS_FILE", str(flaky_file))
+
+    detector = FlakyTestDetector(reruns=2, cwd=tmp_path)
+    remaining, flaky = asyncio.run(detector.screen(_failing_suite("test_flaky", "test_broken")))
+
+    assert flaky == {"tests.test_sample.TestSample::test_flaky"}
+    assert [test_case.name for suite in remaining for test_case in suite] == ["test_broken"]
+    assert load_flaky_tests()["tests.test_sample.TestSample::test_flaky"]["count"] == 1
+
+    # Quarantined tests are dropped without another re-run
+    remaining, flaky = asyncio.run(detector.screen(_failing_suite("test_flaky")))
+    assert (remaining, flaky) == ([], set())
+    assert json.loads(flaky_file.read_text(encoding="utf-8"))[
+        "tests.test_sample.TestSample::test_flaky"
+    ]["count"] == 1
+
+
+def test_order_dependent_failure_is_not_flaky(monkeypatch, tmp_path):
+    """Test that a test failing only after its neighbours is re-run with them."""
+    (tmp_path / "tests").mkdir()
+    (tmp_path / "tests" / "test_order.py").write_text(
+        "STATE = []\n\n\ndef test_first():\n    STATE.append(1)\n\n\n"
+        "def test_second():\n    assert not STATE\n",
+        encoding="utf-8"
+    )
+    monkeypatch.setenv("ADW_TEST_COMMAND", f"{sys.executable} -m pytest")
+    monkeypatch.setenv("ADW_FLAKY_TESTS_FILE", str(tmp_path / "flaky_tests.json"))
+    suite = TestSuite("pytest")
+    test_case = TestCase("test_second", classname="tests.test_order")
+    test_case.result = [Failure("assert not [1]")]
+    suite.add_testcase(test_case)
+
+    detector = FlakyTestDetector(reruns=2, cwd=tmp_path)
+    remaining, flaky = asyncio.run(detector.screen([suite]))
+
+    assert flaky == set()
+    assert [test_case.name for suite in remaining for test_case in suite] == ["test_second"]
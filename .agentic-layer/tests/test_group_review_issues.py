@@ -0,0 +1,96 @@
+"""Unit tests for group_review_issues module."""
+from group_review_issues import extract_issue_files, group_issues_by_files, merge_issue_descriptions
+
+
+def _issue(num, description, resolution="", **extra):
+    return {
+        "review_issue_number": num,
+        "issue_description": description,
+        "issue_resolution": resolution,
+        "issue_severity": "blocker",
+        **extra,
+    }
+
+
+def test_extract_issue_files_from_text():
+    """Test that file paths are extracted from description and resolution."""
+    issue = _issue(1, "Missing check in src/app/models.py", "Update ./tests/test_models.py too")
+    assert extract_issue_files(issue) == {"src/app/models.py", "tests/test_models.py"}
+
+
+def test_extract_issue_files_prefers_explicit_field():
+    """Test that an explicit file list overrides text extraction."""
+    issue = _issue(1, "Problem in other.py", issue_files=["api/routes.ts"])
+    assert extract_issue_files(issue) == {"api/routes.ts"}
+
+
+def test_extract_issue_files_ignores_plain_words():
+    """Test that prose without file names yields no files."""
+    assert extract_issue_files(_issue(1, "The e.g. example is wrong, i.e. broken")) == set()
+
+
+def test_group_issues_merges_overlapping_files():
+    """Test that issues sharing files transitively form one group."""
+    issues = [
+        _issue(1, "Bug in a.py"),
+        _issue(2, "Bug in b.py"),
+        _issue(3, "Bug spanning a.py and c.py"),
+        _issue(4, "Bug in c.py"),
+    ]
+    groups, unscoped = group_issues_by_files(issues)
+
+    assert unscoped == []
+    assert [[i["review_issue_number"] for i in group] for group in groups] == [[1, 3, 4], [2]]
+
+
+def test_group_issues_separates_unscoped():
+    """Test that issues without files are returned separately."""
+    issues = [_issue(1, "General naming problem"), _issue(2, "Bug in a.py")]
+    groups, unscoped = group_issues_by_files(issues)
+
+    assert len(groups) == 1
+    assert [i["review_issue_number"] for i in unscoped] == [1]
+
+
+def test_merge_issue_descriptions_single_issue_format():
+    """Test that a single issue keeps the original patch description format."""
+    assert merge_issue_descriptions([_issue(1, "desc", "fix")]) == "Issue: desc\nResolution: fix"
+
+
+def test_merge_issue_descriptions_multiple_issues():
+    """Test that merged descriptions list every issue."""
+    merged = merge_issue_descriptions([_issue(1, "first", "fix1"), _issue(2, "second", "fix2")])
+    assert "Issue #1: first" in merged
+    assert "Resolution: fix2" in merged
+
+
+def test_group_issues_resolves_references_onto_repository(tmp_path):
+    """Test that absolute, relative, bare and new file references group correctly."""
+    known = ["src/app/models.py", "src/app/views.py", "lib/util.py", "tests/util.py"]
+    issues = [
+        _issue(1, "Bug", file=str(tmp_path / "src/app/models.py")),
+        _issue(2, "Bug", file="src/app/../app/models.py"),
+        _issue(3, "Bug", file="util.py"),
+        _issue(4, "Bug", file="tests/util.py"),
+        _issue(5, "Bug", file="lib/util.py"),
+        _issue(6, "Bug", file="src/new.py"),
+        _issue(7, "Bug", file="app/views.py"),
+        _issue(8, "Bug", file="src/app/views.py"),
+    ]
+    groups, _ = group_issues_by_files(issues, tmp_path, known)
+
+    assert [[i["review_issue_number"] for i in group] for group in groups] == [
+        [1, 2], [3, 4, 5], [6], [7, 8]
+    ]
+
+
+def test_group_issues_matches_paths_against_known_files(tmp_path):
+    """Test that the same file named differently puts issues in one group."""
+    issues = [
+        _issue(1, "Bug in models.py"),
+        _issue(2, "Bug", file=str(tmp_path / "src" / "models.py")),
+        _issue(3, "Bug in src/views.py"),
+    ]
+    groups, _ = group_issues_by_files(issues, tmp_path, ["src/models.py", "src/views.py"])
+
+    assert [[i["review_issue_number"] for i in group] for group in groups] == [[1, 2], [3]]
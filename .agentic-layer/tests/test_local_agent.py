@@ -0,0 +1,100 @@
+"""Unit tests for local_agent module."""
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+from local_agent import LocalWorkspace, _execute_local_agent, load_command_prompt
+
+
+class _Transcript:
+    def __init__(self):
+        self.messages = []
+
+    def write(self, message):
+        self.messages.append(message)
+
+
+def _serve(responses):
+    """Start a chat completions server answering with the given responses in turn."""
+    requests = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):  # noqa: N802
+            length = int(self.headers["Content-Length"])
+            requests.append(json.loads(self.rfile.read(length)))
+            body = json.dumps(responses[len(requests) - 1]).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, requests
+
+
+def test_load_command_prompt_substitutes_arguments(tmp_path):
+    """Test that $ARGUMENTS and positional arguments are substituted."""
+    commands = tmp_path / ".claude" / "commands"
+    commands.mkdir(parents=True)
+    (commands / "classify.md").write_text(
+        "---\ndescription: Classify\n---\nRead $1 and write to $2.\nAll: $ARGUMENTS $3\n",
+        encoding="utf-8"
+    )
+
+    prompt = load_command_prompt("classify", ["draft.md", "out.txt"], str(tmp_path))
+
+    assert prompt == "Read draft.md and write to out.txt.\nAll: draft.md out.txt $3\n"
+    with pytest.raises(FileNotFoundError):
+        load_command_prompt("missing", [], str(tmp_path))
+
+
+def test_workspace_rejects_paths_outside_repository(monkeypatch, tmp_path):
+    """Test that file tools cannot leave the repository."""
+    monkeypatch.delenv("RUN_DIRECTORY", raising=False)
+    workspace = LocalWorkspace(str(tmp_path))
+
+    result = workspace.run_tool("write_file", json.dumps({"path": "../outside.txt", "content": "x"}))
+
+    assert result.startswith("Error:")
+    assert not (tmp_path.parent / "outside.txt").exists()
+
+
+def test_tool_loop_writes_files_and_reports_usage(monkeypatch, tmp_path):
+    """Test that tool calls are executed until the model answers without one."""
+    write_call = {
+        "id": "call_1",
+        "type": "function",
+        "function": {
+            "name": "write_file",
+            "arguments": json.dumps({"path": "out.txt", "content": "FEATURE"}),
+        },
+    }
+    server, requests = _serve([
+        {
+            "choices": [{"message": {"role": "assistant", "content": None, "tool_calls": [write_call]}}],
+            "usage": {"prompt_tokens": 100, "completion_tokens": 10},
+        },
+        {
+            "choices": [{"message": {"role": "assistant", "content": "Done"}}],
+            "usage": {"prompt_tokens": 120, "completion_tokens": 5},
+        },
+    ])
+    monkeypatch.setenv("ADW_LOCAL_BASE_URL", f"http://127.0.0.1:{server.server_port}/v1")
+    monkeypatch.setenv("ADW_LOCAL_MODEL", "test-model")
+    transcript = _Transcript()
+    try:
+        asyncio.run(_execute_local_agent("Classify", transcript, cwd=str(tmp_path)))
+    finally:
+        server.shutdown()
+
+    assert (tmp_path / "out.txt").read_text(encoding="utf-8") == "FEATURE"
+    assert requests[0]["model"] == "test-model"
+    assert requests[1]["messages"][-1]["role"] == "tool"
+    assert transcript.messages[-1]["usage"] == {"input_tokens": 220, "output_tokens": 15}
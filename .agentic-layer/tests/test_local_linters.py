@@ -0,0 +1,103 @@
+"""Unit tests for local_linters module."""
+import asyncio
+import json
+import shutil
+import sys
+
+import pytest
+from local_linters import (
+    LinterSpec, _run_linter, configured_linters, lint_file, parse_eslint_output, parse_mypy_output,
+    parse_ruff_output
+)
+
+
+def test_parse_ruff_output():
+    """Test that ruff JSON diagnostics become violations."""
+    output = json.dumps([{
+        "filename": "/repo/app.py",
+        "location": {"row": 3, "column": 1},
+        "code": "F401",
+        "message": "`os` imported but unused",
+    }])
+
+    assert parse_ruff_output(output) == [{
+        "file": "/repo/app.py", "line": 3, "column": 1,
+        "code": "F401", "message": "`os` imported but unused",
+    }]
+
+
+def test_parse_ruff_output_empty():
+    """Test that empty ruff output means no violations."""
+    assert parse_ruff_output("") == []
+    assert parse_ruff_output("[]") == []
+
+
+def test_parse_mypy_output_keeps_errors_only():
+    """Test that mypy errors are parsed and notes are ignored."""
+    output = (
+        'app.py:10:5: error: Incompatible return value type (got "int", expected "str")  [return-value]\n'
+        "app.py:11: note: See https://mypy.readthedocs.io\n"
+        "lib/util.py:2: error: Name \"x\" is not defined  [name-defined]\n"
+    )
+
+    violations = parse_mypy_output(output)
+
+    assert violations == [
+        {
+            "file": "app.py", "line": 10, "column": 5, "code": "return-value",
+            "message": 'Incompatible return value type (got "int", expected "str")',
+        },
+        {
+            "file": "lib/util.py", "line": 2, "column": None, "code": "name-defined",
+            "message": 'Name "x" is not defined',
+        },
+    ]
+
+
+def test_parse_eslint_output():
+    """Test that eslint JSON results are flattened into violations."""
+    output = json.dumps([
+        {"filePath": "/repo/a.js", "messages": [
+            {"line": 1, "column": 7, "ruleId": "no-unused-vars", "message": "'x' is unused."}
+        ]},
+        {"filePath": "/repo/b.js", "messages": []},
+    ])
+
+    assert parse_eslint_output(output) == [{
+        "file": "/repo/a.js", "line": 1, "column": 7,
+        "code": "no-unused-vars", "message": "'x' is unused.",
+    }]
+
+
+def test_configured_linters_respects_selection(monkeypatch):
+    """Test that ADW_LINTERS limits the linters to the named, installed ones."""
+    monkeypatch.setenv("ADW_LINTERS", "ruff, eslint")
+    monkeypatch.setattr("local_linters.shutil.which", lambda name: f"/usr/bin/{name}")
+
+    assert [spec.name for spec in configured_linters()] == ["ruff", "eslint"]
+
+
+def test_failing_linter_without_output_is_an_error(tmp_path):
+    """Test that a non-zero exit with empty output is not read as zero violations."""
+    spec = LinterSpec(
+        "broken", sys.executable, ["-c", "import sys; sys.exit(2)"], (".js",), "javascript",
+        False, parse_eslint_output
+    )
+
+    with pytest.raises(RuntimeError, match="exited with code 2"):
+        asyncio.run(_run_linter(spec, ["a.js"], str(tmp_path)))
+
+
+def test_lint_file_keeps_unused_imports(monkeypatch, tmp_path):
+    """Test that lint-on-write does not remove imports the agent may use later."""
+    if not shutil.which("ruff"):
+        pytest.skip("ruff is not installed")
+    monkeypatch.setenv("ADW_LINTERS", "ruff")
+    path = tmp_path / "app.py"
+    path.write_text("import os\n", encoding="utf-8")
+
+    linters, violations = asyncio.run(lint_file(str(path), cwd=str(tmp_path)))
+
+    assert linters == ["ruff"]
+    assert path.read_text(encoding="utf-8") == "import os\n"
+    assert [violation["code"] for violation in violations] == ["F401"]
@@ -0,0 +1,39 @@
+"""Unit tests for phase_timing module."""
+import asyncio
+import json
+
+import pytest
+
+import run_context
+from phase_timing import timed_phase
+
+
+def test_timed_phase_records_outcome_and_iterations(monkeypatch, tmp_path):
+    """Test that each phase appends its status and final iteration."""
+    monkeypatch.setenv("RUN_DIRECTORY", str(tmp_path))
+
+    @timed_phase("test")
+    async def loop():
+        assert run_context.get_phase() == "test"
+        run_context.set_iteration(3)
+        return False
+
+    @timed_phase("lint")
+    async def broken():
+        raise RuntimeError("boom")
+
+    run_context.set_run_id("run1")
+    try:
+        assert asyncio.run(loop()) is False
+        with pytest.raises(RuntimeError):
+            asyncio.run(broken())
+    finally:
+        run_context.set_run_id(None)
+
+    records = [
+        json.loads(line)
+        for line in (tmp_path / "run1" / "phases.jsonl").read_text(encoding="utf-8").splitlines()
+    ]
+    assert [(r["phase"], r["status"], r["iterations"]) for r in records] == [
+        ("test", "failed", 3), ("lint", "error", None)
+    ]
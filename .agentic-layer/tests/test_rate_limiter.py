@@ -0,0 +1,123 @@
+"""Unit tests for rate_limiter module."""
+import asyncio
+import subprocess
+
+import pytest
+from coding_agent import _execute_with_retries
+from rate_limiter import TokenBucket, backoff_delay, is_transient_error
+
+
+class FakeClock:
+    """Manually advanced clock."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_bucket_allows_burst_then_reports_wait(tmp_path):
+    """Test that the bucket hands out its capacity and then asks callers to wait."""
+    clock = FakeClock()
+    bucket = TokenBucket(tmp_path / "limit.db", rate_per_second=0.5, capacity=2, clock=clock)
+
+    assert bucket.try_acquire() == 0
+    assert bucket.try_acquire() == 0
+    assert bucket.try_acquire() == 2.0
+
+    clock.now += 2
+    assert bucket.try_acquire() == 0
+
+
+def test_bucket_state_is_shared_between_instances(tmp_path):
+    """Test that separate limiter instances (e.g. processes) share one bucket."""
+    clock = FakeClock()
+    first = TokenBucket(tmp_path / "limit.db", rate_per_second=1, capacity=1, clock=clock)
+    second = TokenBucket(tmp_path / "limit.db", rate_per_second=1, capacity=1, clock=clock)
+
+    assert first.try_acquire() == 0
+    assert second.try_acquire() > 0
+
+
+def test_transient_error_classification():
+    """Test that throttling and network errors are retried, others are not."""
+    assert is_transient_error(RuntimeError("API Error: 429 Too Many Requests"))
+    assert is_transient_error(RuntimeError("Overloaded"))
+    assert is_transient_error(TimeoutError())
+    assert is_transient_error(RuntimeError("Claude Code SDK execution failed: HTTP 503"))
+    assert not is_transient_error(RuntimeError("GitHub Copilot CLI not found"))
+
+
+def test_transient_error_needs_whole_words_and_causes():
+    """Test that numbers and words inside agent output are not mistaken for throttling."""
+    assert not is_transient_error(RuntimeError("SyntaxError in app.py, line 429"))
+    assert not is_transient_error(RuntimeError("tests/test_timeout.py failed"))
+    assert not is_transient_error(RuntimeError("Pool of 5030 workers exhausted"))
+    try:
+        raise RuntimeError("Claude Code SDK execution failed") from ConnectionResetError()
+    except RuntimeError as e:
+        assert is_transient_error(e)
+
+
+def test_backoff_delay_is_bounded():
+    """Test that jittered delays stay within the exponential ceiling and the cap."""
+    for attempt in range(8):
+        delay = backoff_delay(attempt, base=1, cap=10)
+        assert 0 <= delay <= min(10, 2 ** attempt)
+
+
+def test_retry_only_without_partial_edits(monkeypatch, tmp_path):
+    """Test that a transient failure is retried unless the attempt already edited files."""
+    subprocess.run(["git", "init", "-q"], cwd=tmp_path, check=True)
+    monkeypatch.setenv("ADW_RATE_LIMIT_PER_MINUTE", "0")
+    monkeypatch.setenv("ADW_AGENT_MAX_RETRIES", "1")
+    monkeypatch.setattr("coding_agent.backoff_delay", lambda attempt: 0)
+    attempts = []
+
+    async def throttled_before_editing():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RuntimeError("API Error: 429 Too Many Requests")
+
+    asyncio.run(_execute_with_retries(throttled_before_editing, None, str(tmp_path)))
+    assert len(attempts) == 2
+
+    async def throttled_after_editing():
+        attempts.append(1)
+        (tmp_path / "app.py").write_text(f"x = {len(attempts)}\n", encoding="utf-8")
+        raise RuntimeError("API Error: 429 Too Many Requests")
+
+    attempts.clear()
+    with pytest.raises(RuntimeError, match="429"):
+        asyncio.run(_execute_with_retries(throttled_after_editing, None, str(tmp_path)))
+    assert len(attempts) == 1
+
+
+def test_retry_when_another_call_shares_the_tree(monkeypatch, tmp_path):
+    """Test that a sibling's edits in a shared working tree do not stop a retry."""
+    subprocess.run(["git", "init", "-q"], cwd=tmp_path, check=True)
+    monkeypatch.setenv("ADW_RATE_LIMIT_PER_MINUTE", "0")
+    monkeypatch.setenv("ADW_AGENT_MAX_RETRIES", "1")
+    monkeypatch.setattr("coding_agent.backoff_delay", lambda attempt: 0)
+    attempts = []
+    sibling_started = asyncio.Event()
+
+    async def sibling():
+        sibling_started.set()
+        (tmp_path / "other.py").write_text("y = 1\n", encoding="utf-8")
+
+    async def throttled_while_sibling_edits():
+        attempts.append(1)
+        if len(attempts) == 1:
+            await sibling_started.wait()
+            raise RuntimeError("API Error: 429 Too Many Requests")
+
+    async def run_both():
+        await asyncio.gather(
+            _execute_with_retries(throttled_while_sibling_edits, None, str(tmp_path)),
+            _execute_with_retries(sibling, None, str(tmp_path)),
+        )
+
+    asyncio.run(run_both())
+    assert len(attempts) == 2
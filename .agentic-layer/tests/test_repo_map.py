@@ -0,0 +1,55 @@
+"""Unit tests for repo_map module."""
+import subprocess
+from repo_map import build_repo_map, get_repo_map
+from run_context import set_run_id
+
+
+def _init_repo(path):
+    subprocess.run(["git", "init", "-q"], cwd=path, check=True)
+    (path / "pkg").mkdir()
+    (path / "pkg" / "service.py").write_text(
+        '"""Order service.\n\nMore details."""\n\n\nclass OrderService:\n    pass\n\n\n'
+        "async def place_order():\n    pass\n",
+        encoding="utf-8"
+    )
+    (path / "web.ts").write_text("export function render() {}\nconst hidden = 1;\n", encoding="utf-8")
+    (path / "README.md").write_text("# Demo\n", encoding="utf-8")
+
+
+def test_build_repo_map_lists_files_summaries_and_symbols(tmp_path, monkeypatch):
+    """Test that the map covers every file with its summary and top-level symbols."""
+    monkeypatch.delenv("RUN_DIRECTORY", raising=False)
+    _init_repo(tmp_path)
+
+    repo_map = build_repo_map(str(tmp_path))
+
+    assert "- README.md" in repo_map
+    assert "- pkg/service.py — Order service." in repo_map
+    assert "class OrderService, def place_order" in repo_map
+    assert "export render" in repo_map
+    assert "hidden" not in repo_map
+
+
+def test_get_repo_map_is_cached_per_tree(tmp_path, monkeypatch):
+    """Test that the map is reused for the same tree and rebuilt after changes."""
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    _init_repo(repo)
+    monkeypatch.setenv("RUN_DIRECTORY", str(repo / ".runs"))
+    set_run_id("run1")
+    try:
+        first = get_repo_map(str(repo))
+        assert first is not None and first.parent == repo / ".runs" / "run1" / "repo_map"
+        assert get_repo_map(str(repo)) == first
+        assert ".runs" not in first.read_text(encoding="utf-8")
+
+        (repo / "new_module.py").write_text("def added():\n    pass\n", encoding="utf-8")
+        second = get_repo_map(str(repo))
+        # A second edit of an already changed file is noticed too
+        (repo / "new_module.py").write_text("def renamed():\n    pass\n", encoding="utf-8")
+        third = get_repo_map(str(repo))
+    finally:
+        set_run_id(None)
+    assert second != first
+    assert "def added" in second.read_text(encoding="utf-8")
+    assert "def renamed" in third.read_text(encoding="utf-8")
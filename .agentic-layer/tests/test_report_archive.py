@@ -0,0 +1,54 @@
+"""Unit tests for report_archive module."""
+from junitparser import JUnitXml, TestSuite, TestCase, Failure, Error, Skipped
+from report_archive import archive_test_results, extract_iteration, read_archive_index
+
+
+def _write_report(folder, name, failing=(), erroring=(), skipped=(), passing=("test_ok",)):
+    suite = TestSuite("Suite")
+    for test_name, result in (
+        [(n, [Failure("boom")]) for n in failing]
+        + [(n, [Error("crash")]) for n in erroring]
+        + [(n, [Skipped("later")]) for n in skipped]
+        + [(n, None) for n in passing]
+    ):
+        test_case = TestCase(test_name)
+        if result:
+            test_case.result = result
+        suite.add_testcase(test_case)
+    xml = JUnitXml()
+    xml.add_testsuite(suite)
+    xml.write(str(folder / name))
+
+
+def test_archive_moves_reports_and_indexes_counts(tmp_path):
+    """Test that an iteration's reports are archived, summarized and removed."""
+    _write_report(tmp_path, "unit.xml", failing=["test_a"], erroring=["test_b"], skipped=["test_c"])
+    _write_report(tmp_path, "e2e.xml")
+
+    entry = archive_test_results(tmp_path, 1, "resolved")
+
+    assert not list(tmp_path.glob("*.xml"))
+    assert (tmp_path / "archive" / "iteration_001.tar.gz").exists()
+    assert entry["files"] == ["e2e.xml", "unit.xml"]
+    assert (entry["tests"], entry["passed"], entry["failed"], entry["errors"], entry["skipped"]) == (
+        5, 2, 1, 1, 1
+    )
+    assert entry["failing"] == ["Suite::test_a", "Suite::test_b"]
+    assert read_archive_index(tmp_path) == [entry]
+
+    extracted = extract_iteration(tmp_path, entry["archive"], tmp_path / "restored")
+    assert sorted(path.name for path in extracted) == ["e2e.xml", "unit.xml"]
+
+
+def test_archive_keeps_final_reports_and_never_overwrites(tmp_path):
+    """Test keep_reports and that a re-run loop gets a new archive name."""
+    assert archive_test_results(tmp_path, 1, "resolved") is None
+
+    _write_report(tmp_path, "unit.xml")
+    archive_test_results(tmp_path, 1, "resolved")
+    _write_report(tmp_path, "unit.xml")
+    entry = archive_test_results(tmp_path, 1, "passed", keep_reports=True)
+
+    assert entry["archive"] == "iteration_001-2.tar.gz"
+    assert (tmp_path / "unit.xml").exists()
+    assert [e["outcome"] for e in read_archive_index(tmp_path)] == ["resolved", "passed"]
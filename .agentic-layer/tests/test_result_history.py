@@ -0,0 +1,80 @@
+"""Unit tests for result_history module."""
+import asyncio
+import sys
+
+from local_tests import read_test_cases
+from result_history import FileHistory, ResultHistory, order_failed_first
+from sharded_tests import run_sharded_tests
+
+
+class FakeClock:
+    """Clock advanced by one second per call."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        self.now += 1
+        return self.now
+
+
+def test_history_reports_recent_failures_and_durations(tmp_path):
+    """Test that only the recent results of each test count per file."""
+    (tmp_path / "tests").mkdir()
+    for name in ("test_a", "test_b"):
+        (tmp_path / "tests" / f"{name}.py").write_text("", encoding="utf-8")
+    history = ResultHistory(tmp_path / "history.sqlite3", clock=FakeClock())
+
+    history.record([("tests.test_a::test_x", "failed", 2.0)], tmp_path)
+    for _ in range(5):
+        history.record([
+            ("tests.test_a::test_x", "passed", 1.0),
+            ("tests.test_b::test_y", "error", 0.5),
+            ("tests.test_b::test_z", "passed", 0.25),
+            ("elsewhere::test_q", "failed", 9.0),
+        ], tmp_path)
+
+    assert history.file_history() == {
+        "tests/test_a.py": FileHistory(0, 1.0),
+        "tests/test_b.py": FileHistory(5, 0.75),
+    }
+
+
+def test_order_failed_first_then_fastest():
+    """Test that failing files lead, then fast ones, then files without history."""
+    history = {
+        "slow.py": FileHistory(0, 9.0),
+        "fast.py": FileHistory(0, 0.1),
+        "failing.py": FileHistory(2, 5.0),
+    }
+
+    assert order_failed_first(["new.py", "slow.py", "fast.py", "failing.py"], history) == [
+        "failing.py", "fast.py", "slow.py", "new.py"
+    ]
+
+
+def test_maxfail_interrupts_remaining_shards(monkeypatch, tmp_path):
+    """Test that enough known failures stop the other shards early."""
+    (tmp_path / "tests").mkdir()
+    (tmp_path / "tests" / "test_fail.py").write_text(
+        "def test_a():\n    assert False\n\n\ndef test_b():\n    assert False\n", encoding="utf-8"
+    )
+    (tmp_path / "tests" / "test_slow.py").write_text(
+        "import time\n\n\ndef test_fast():\n    pass\n\n\ndef test_slow():\n    time.sleep(60)\n",
+        encoding="utf-8"
+    )
+    results = tmp_path / "results"
+    results.mkdir()
+    monkeypatch.setenv("ADW_TEST_COMMAND", f"{sys.executable} -m pytest")
+    monkeypatch.setenv("ADW_TEST_HISTORY", "off")
+
+    reports, stopped_early = asyncio.run(run_sharded_tests(results, 2, cwd=tmp_path, maxfail=1))
+
+    assert stopped_early
+
+    outcomes = {}
+    for report in reports:
+        outcomes.update({test_id: outcome for test_id, outcome, _ in read_test_cases(report)})
+    assert outcomes["tests.test_fail::test_a"] == "failed"
+    assert "tests.test_fail::test_b" not in outcomes
+    assert "tests.test_slow::test_slow" not in outcomes
@@ -0,0 +1,39 @@
+"""Unit tests for review_fingerprints module."""
+import json
+from review_fingerprints import ReviewHistory, fingerprint_issue
+
+
+def _issue(description, **extra):
+    return {"issue_description": description, "issue_severity": "blocker", **extra}
+
+
+def test_fingerprint_ignores_numbers_case_and_punctuation():
+    """Test that rewording of line numbers and formatting keeps the fingerprint."""
+    first = _issue("Missing validation in api.py at line 12.")
+    second = _issue("missing   validation in api.py at line 48")
+    assert fingerprint_issue(first) == fingerprint_issue(second)
+
+
+def test_fingerprint_differs_for_different_files():
+    """Test that the same wording in different files is a different issue."""
+    assert fingerprint_issue(_issue("Missing validation in api.py")) != \
+        fingerprint_issue(_issue("Missing validation in cli.py"))
+
+
+def test_history_counts_patch_attempts(tmp_path):
+    """Test that patch attempts accumulate per fingerprint and are persisted."""
+    history = ReviewHistory()
+    issue = _issue("Broken import in app.py")
+
+    history.record_review(1, [issue], incremental=False)
+    history.record_patched([issue])
+    history.record_review(2, [_issue("broken import in app.py")], incremental=True)
+    history.record_patched([issue])
+
+    assert history.attempts_for(issue) == 2
+
+    path = tmp_path / "history.json"
+    history.save(path)
+    data = json.loads(path.read_text(encoding="utf-8"))
+    assert data["issues"][0]["patch_attempts"] == 2
+    assert [entry["incremental"] for entry in data["iterations"]] == [False, True]
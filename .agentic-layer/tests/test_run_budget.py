@@ -0,0 +1,111 @@
+"""Unit tests for run_budget module."""
+import asyncio
+
+import pytest
+
+import run_context
+from coding_agent import _run_within_budget
+from phase_timing import timed_phase
+from run_budget import (
+    BudgetExceededError,
+    BudgetMeter,
+    RunBudget,
+    is_budget_error,
+    limit_iterations,
+    set_run_budget,
+    usage_tokens,
+)
+
+
+class FakeClock:
+    """Monotonic clock advanced by hand."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_usage_tokens_reads_result_messages():
+    """Test that only result messages report tokens."""
+    assert usage_tokens({"type": "result", "usage": {"input_tokens": 30, "output_tokens": 12}}) == 42
+    assert usage_tokens({"type": "assistant", "usage": {"input_tokens": 30}}) == 0
+    assert usage_tokens("text") == 0
+
+
+def test_agent_calls_stop_once_a_budget_is_used_up():
+    """Test that the call after the limit raises and records why."""
+    budget = RunBudget(max_agent_calls=2, max_tokens=100)
+    budget.start_agent_call("plan")
+    meter = BudgetMeter(budget, None)
+    meter.write({"type": "result", "usage": {"input_tokens": 60, "output_tokens": 50}})
+    assert budget.tokens == 110
+
+    with pytest.raises(BudgetExceededError, match="tokens"):
+        budget.start_agent_call("test")
+    assert (budget.exhausted_reason, budget.exhausted_phase) == ("tokens", "test")
+    assert budget.agent_calls == 1
+    assert budget.as_dict()["exhausted_reason"] == "tokens"
+
+
+def test_limit_iterations_scales_back_near_the_limit():
+    """Test that loops get one more iteration once the warning fraction is reached."""
+    clock = FakeClock()
+    budget = RunBudget(max_wall_s=100, warn_fraction=0.8, clock=clock)
+    set_run_budget(budget)
+    try:
+        assert limit_iterations(2, 10) == 10
+        clock.now = 85
+        assert limit_iterations(2, 10) == 3
+        assert limit_iterations(9, 10) == 10
+    finally:
+        set_run_budget(None)
+    assert limit_iterations(2, 10) == 10
+
+
+def test_wall_time_budget_cuts_off_agent_call():
+    """Test that a running call is cut off when the wall time runs out."""
+    budget = RunBudget(max_wall_s=0.05)
+
+    async def slow_call():
+        await asyncio.sleep(5)
+
+    with pytest.raises(BudgetExceededError):
+        asyncio.run(_run_within_budget(slow_call(), budget))
+    assert budget.exhausted_reason == "wall time"
+
+
+def test_agent_timeout_is_not_a_budget_error():
+    """Test that a timeout raised by the agent itself is passed on unchanged."""
+    budget = RunBudget(max_wall_s=60)
+
+    async def timing_out_call():
+        raise asyncio.TimeoutError("agent timed out")
+
+    with pytest.raises(asyncio.TimeoutError, match="agent timed out"):
+        asyncio.run(_run_within_budget(timing_out_call(), budget))
+    assert budget.exhausted_reason is None
+
+
+def test_phase_records_budget_exhaustion(monkeypatch, tmp_path):
+    """Test that a wrapped budget error marks the phase as budget_exhausted."""
+    monkeypatch.setenv("RUN_DIRECTORY", str(tmp_path))
+
+    @timed_phase("review")
+    async def review():
+        try:
+            raise RunBudget(max_agent_calls=1, clock=FakeClock()).exceeded("agent calls")
+        except BudgetExceededError as e:
+            raise RuntimeError("Review failed") from e
+
+    run_context.set_run_id("run1")
+    try:
+        with pytest.raises(RuntimeError) as excinfo:
+            asyncio.run(review())
+    finally:
+        run_context.set_run_id(None)
+
+    assert is_budget_error(excinfo.value)
+    assert not is_budget_error(RuntimeError("boom"))
+    assert '"status": "budget_exhausted"' in (tmp_path / "run1" / "phases.jsonl").read_text(encoding="utf-8")
@@ -0,0 +1,90 @@
+"""Unit tests for sharded_tests module."""
+import asyncio
+import sys
+
+import pytest
+from junitparser import JUnitXml, TestSuite, TestCase
+from local_tests import read_outcomes
+from report_archive import archive_test_results
+from sharded_tests import balance_shards, report_durations, run_sharded_tests, shard_count
+
+
+def test_balance_shards_puts_longest_files_on_least_loaded_shard():
+    """Test longest-processing-time-first balancing and unknown durations."""
+    shards = balance_shards({"a.py": 8.0, "b.py": 5.0, "c.py": 4.0, "d.py": 3.0, "e.py": None}, 2)
+
+    # e.py counts as the mean of the known durations (5s)
+    assert shards == [["a.py", "c.py"], ["b.py", "d.py", "e.py"]]
+    assert balance_shards({"a.py": None}, 4) == [["a.py"]]
+
+
+def test_shard_count_reads_environment(monkeypatch):
+    """Test explicit, configured and automatic shard counts."""
+    monkeypatch.delenv("ADW_TEST_SHARDS", raising=False)
+    assert shard_count() == 0
+    assert shard_count(3) == 3
+    monkeypatch.setenv("ADW_TEST_SHARDS", "auto")
+    assert shard_count() >= 1
+
+
+def test_report_durations_fall_back_to_archive(tmp_path):
+    """Test that test times are summed per file from the last archived iteration."""
+    (tmp_path / "tests").mkdir()
+    (tmp_path / "tests" / "test_a.py").write_text("", encoding="utf-8")
+    test_folder = tmp_path / "test"
+    test_folder.mkdir()
+    suite = TestSuite("pytest")
+    for name, time_s in (("test_x", 1.5), ("test_y", 2.0)):
+        test_case = TestCase(name, classname="tests.test_a", time=time_s)
+        suite.add_testcase(test_case)
+    xml = JUnitXml()
+    xml.add_testsuite(suite)
+    xml.write(str(test_folder / "report.xml"))
+    archive_test_results(test_folder, 1, "resolved")
+
+    assert report_durations(test_folder, tmp_path) == {"tests/test_a.py": 3.5}
+
+
+def test_run_sharded_tests_writes_one_report_per_shard(monkeypatch, tmp_path):
+    """Test that the suite runs in balanced shards that report every test."""
+    (tmp_path / "tests").mkdir()
+    for index in range(3):
+        (tmp_path / "tests" / f"test_{index}.py").write_text(
+            f"def test_ok():\n    pass\n\n\ndef test_fails():\n    assert {index} == 0\n",
+            encoding="utf-8"
+        )
+    test_folder = tmp_path / "results"
+    test_folder.mkdir()
+    monkeypatch.setenv("ADW_TEST_COMMAND", f"{sys.executable} -m pytest")
+    monkeypatch.setenv("ADW_TEST_HISTORY", "off")
+
+    reports, stopped_early = asyncio.run(run_sharded_tests(test_folder, 2, cwd=tmp_path))
+
+    assert not stopped_early
+    assert [report.name for report in reports] == ["shard_1.xml", "shard_2.xml"]
+    outcomes = {}
+    for report in reports:
+        outcomes.update(read_outcomes(report))
+    assert len(outcomes) == 6
+    assert sorted(test_id for test_id, outcome in outcomes.items() if outcome == "failed") == [
+        "tests.test_1::test_fails", "tests.test_2::test_fails"
+    ]
+
+
+def test_failed_run_leaves_no_shard_reports(monkeypatch, tmp_path):
+    """Test that a timed-out shard keeps all partial reports out of the test folder."""
+    (tmp_path / "tests").mkdir()
+    (tmp_path / "tests" / "test_fast.py").write_text("def test_ok():\n    pass\n", encoding="utf-8")
+    (tmp_path / "tests" / "test_slow.py").write_text(
+        "import time\n\n\ndef test_slow():\n    time.sleep(60)\n", encoding="utf-8"
+    )
+    test_folder = tmp_path / "results"
+    test_folder.mkdir()
+    monkeypatch.setenv("ADW_TEST_COMMAND", f"{sys.executable} -m pytest")
+    monkeypatch.setenv("ADW_TEST_HISTORY", "off")
+    monkeypatch.setenv("ADW_TEST_SHARD_TIMEOUT", "3")
+
+    with pytest.raises(RuntimeError, match="timed out"):
+        asyncio.run(run_sharded_tests(test_folder, 2, cwd=tmp_path))
+
+    assert not list(test_folder.glob("*.xml"))
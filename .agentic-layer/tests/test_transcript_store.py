@@ -0,0 +1,106 @@
+"""Unit tests for transcript_store module."""
+import gzip
+import json
+import os
+import time
+
+import pytest
+import run_context
+from transcript_store import TranscriptWriter, enforce_retention, open_transcript, read_index
+
+
+def _read_part(path):
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_writer_streams_messages_and_indexes_call(tmp_path):
+    """Test that messages land in a gzip part and the call is indexed."""
+    writer = TranscriptWriter(tmp_path, {"command": "implement", "phase": "implement"})
+    writer.write({"type": "stdout", "line": "hello"})
+    writer.write({"type": "stdout", "line": "world"})
+    writer.close("success")
+
+    assert len(writer.parts) == 1
+    assert _read_part(tmp_path / writer.parts[0])[1]["line"] == "world"
+
+    entries = read_index(tmp_path)
+    assert len(entries) == 1
+    assert entries[0]["command"] == "implement"
+    assert entries[0]["status"] == "success"
+    assert entries[0]["messages"] == 2
+
+
+def test_writer_rotates_parts(tmp_path, monkeypatch):
+    """Test that a transcript rolls over once the rotate size is exceeded."""
+    monkeypatch.setenv("ADW_TRANSCRIPT_ROTATE_BYTES", "10")
+    writer = TranscriptWriter(tmp_path, {"command": "test"})
+    for i in range(3):
+        writer.write({"type": "stdout", "line": f"line {i}"})
+    writer.close("success")
+
+    assert len(writer.parts) == 3
+
+
+def test_enforce_retention_prunes_oldest(tmp_path, monkeypatch):
+    """Test that retention keeps only the newest parts."""
+    monkeypatch.setenv("ADW_TRANSCRIPT_MAX_FILES", "2")
+    for i in range(4):
+        part = tmp_path / f"call{i}.0.jsonl.gz"
+        part.write_bytes(b"x")
+        os.utime(part, (i, i))
+
+    enforce_retention(tmp_path)
+
+    assert sorted(p.name for p in tmp_path.glob("*.jsonl.gz")) == [
+        "call2.0.jsonl.gz", "call3.0.jsonl.gz"
+    ]
+
+
+def test_enforce_retention_keeps_open_calls_and_marks_index(tmp_path, monkeypatch):
+    """Test that a concurrent call's part survives and pruned parts are recorded."""
+    monkeypatch.setenv("ADW_TRANSCRIPT_MAX_FILES", "1")
+    open_writer = TranscriptWriter(tmp_path, {"command": "review"})
+    open_writer.write({"type": "stdout", "line": "still running"})
+    now = time.time()
+    os.utime(tmp_path / open_writer.parts[0], (now - 20, now - 20))
+    closed_writer = TranscriptWriter(tmp_path, {"command": "patch"})
+    closed_writer.write({"type": "stdout", "line": "done"})
+    os.utime(tmp_path / closed_writer.parts[0], (now - 10, now - 10))
+    closed_writer.close("success")
+
+    assert (tmp_path / open_writer.parts[0]).exists()
+    assert not (tmp_path / closed_writer.parts[0]).exists()
+    entry = read_index(tmp_path)[0]
+    assert entry["parts"] == []
+    assert entry["pruned_parts"] == closed_writer.parts
+    open_writer.close("success")
+
+
+def test_open_transcript_without_run_returns_none():
+    """Test that no transcript is opened outside of a run."""
+    run_context.set_run_id(None)
+    assert open_transcript("claude", "implement", "sonnet") is None
+
+
+@pytest.fixture
+def active_run(tmp_path, monkeypatch):
+    """Activate a run whose folder lives under tmp_path."""
+    monkeypatch.setenv("RUN_DIRECTORY", str(tmp_path))
+    run_context.set_run_id("run123")
+    run_context.set_phase("review")
+    run_context.set_iteration(2)
+    yield tmp_path / "run123" / "transcripts"
+    run_context.set_run_id(None)
+    run_context.set_phase(None)
+
+
+def test_open_transcript_records_run_context(active_run):
+    """Test that phase and iteration from the run context are indexed."""
+    writer = open_transcript("claude", "patch", "sonnet")
+    writer.close("error")
+
+    entry = read_index(active_run)[0]
+    assert entry["phase"] == "review"
+    assert entry["iteration"] == 2
+    assert entry["status"] == "error"
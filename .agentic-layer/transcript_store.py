@@ -0,0 +1,225 @@
+"""Compressed per-call agent transcript store.
+
+Each coding agent invocation streams its messages into its own gzip-compressed
+JSONL transcript in the run's ``transcripts`` folder. A plain ``index.jsonl``
+file records one line per call with its phase, iteration, command, timing and
+the transcript parts it produced.
+
+Disk usage is bounded in two ways:
+    * a transcript rolls over to a new part once its uncompressed size
+      exceeds ``ADW_TRANSCRIPT_ROTATE_BYTES``
+    * after each call the oldest parts are pruned while the folder holds more
+      than ``ADW_TRANSCRIPT_MAX_FILES`` parts or ``ADW_TRANSCRIPT_MAX_BYTES``
+      compressed bytes
+
+Only parts of finished calls (those with an index entry) are pruned, so a
+concurrent call never loses the part it is writing. Their index entries list
+the pruned parts under ``pruned_parts`` instead of ``parts``.
+"""
+
+import dataclasses
+import gzip
+import json
+import logging
+import os
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+
+from get_or_create_folders import get_or_create_transcript_folder
+from run_context import get_iteration, get_phase, get_run_id
+
+DEFAULT_ROTATE_BYTES = 50 * 1024 * 1024
+DEFAULT_MAX_FILES = 500
+DEFAULT_MAX_BYTES = 500 * 1024 * 1024
+
+INDEX_FILE_NAME = "index.jsonl"
+# Parts of a call that was never indexed and did not change for this long
+# belong to a crashed process and may be pruned
+ABANDONED_AFTER_SECONDS = 24 * 60 * 60
+
+logger = logging.getLogger(__name__)
+
+
+def _env_int(name: str, default: int) -> int:
+    """Read a positive integer from the environment, falling back to a default."""
+    value = os.getenv(name)
+    if not value:
+        return default
+    try:
+        parsed = int(value)
+    except ValueError:
+        logger.warning("Ignoring invalid %s=%r, using %s", name, value, default)
+        return default
+    return parsed if parsed > 0 else default
+
+
+def message_to_jsonable(message) -> dict:
+    """Convert an agent message into a JSON-serializable dictionary."""
+    if isinstance(message, dict):
+        return message
+    if dataclasses.is_dataclass(message) and not isinstance(message, type):
+        return {"type": type(message).__name__, **dataclasses.asdict(message)}
+    return {"type": type(message).__name__, "repr": repr(message)}
+
+
+class TranscriptWriter:
+    """Streams the messages of a single agent call into compressed JSONL parts."""
+
+    def __init__(self, folder: Path, metadata: dict):
+        self.folder = folder
+        self.metadata = metadata
+        self.call_id = (
+            f"{datetime.now():%Y%m%d_%H%M%S}_{metadata['command']}_{uuid.uuid4().hex[:6]}"
+        )
+        self.rotate_bytes = _env_int("ADW_TRANSCRIPT_ROTATE_BYTES", DEFAULT_ROTATE_BYTES)
+        self.parts: list[str] = []
+        self.message_count = 0
+        self._part_bytes = 0
+        self._handle = None
+        self._started_at = datetime.now(timezone.utc)
+        self._start = time.monotonic()
+
+    def _open_next_part(self) -> None:
+        """Close the current part (if any) and open the next one."""
+        if self._handle is not None:
+            self._handle.close()
+        part_name = f"{self.call_id}.{len(self.parts)}.jsonl.gz"
+        self._handle = gzip.open(
+            self.folder / part_name, "wt", encoding="utf-8", compresslevel=6
+        )
+        self.parts.append(part_name)
+        self._part_bytes = 0
+
+    def write(self, message) -> None:
+        """Append one message to the transcript."""
+        line = json.dumps(message_to_jsonable(message), ensure_ascii=False, default=str) + "\n"
+        if self._handle is None or self._part_bytes >= self.rotate_bytes:
+            self._open_next_part()
+        self._handle.write(line)
+        self._part_bytes += len(line)
+        self.message_count += 1
+
+    def close(self, status: str) -> None:
+        """Finish the transcript, append its index entry and apply retention."""
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+        entry = {
+            "call_id": self.call_id,
+            **self.metadata,
+            "started_at": self._started_at.isoformat(),
+            "duration_s": round(time.monotonic() - self._start, 3),
+            "status": status,
+            "messages": self.message_count,
+            "parts": self.parts,
+        }
+        with open(self.folder / INDEX_FILE_NAME, "a", encoding="utf-8") as index:
+            index.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+        enforce_retention(self.folder)
+
+
+def open_transcript(agent: str, command: str, model: str) -> TranscriptWriter | None:
+    """
+    Open a transcript for an agent call in the current run.
+
+    Args:
+        agent: Agent type value (e.g. "claude")
+        command: Slash command name
+        model: Model name passed to the agent
+
+    Returns:
+        TranscriptWriter, or None when no run is active for the current context
+    """
+    run_id = get_run_id()
+    if not run_id:
+        return None
+    metadata = {
+        "run_id": run_id,
+        "phase": get_phase(),
+        "iteration": get_iteration(),
+        "command": command,
+        "agent": agent,
+        "model": model,
+    }
+    return TranscriptWriter(get_or_create_transcript_folder(run_id), metadata)
+
+
+def _part_call_id(part_name: str) -> str:
+    """Return the call id of a part named ``<call id>.<n>.jsonl.gz``."""
+    return part_name.rsplit(".", 3)[0]
+
+
+def enforce_retention(folder: Path) -> None:
+    """
+    Delete the oldest transcript parts until the folder is within limits.
+
+    Parts of calls that are still open are kept but count towards the limits.
+    Index entries of pruned parts are updated.
+    """
+    max_files = _env_int("ADW_TRANSCRIPT_MAX_FILES", DEFAULT_MAX_FILES)
+    max_bytes = _env_int("ADW_TRANSCRIPT_MAX_BYTES", DEFAULT_MAX_BYTES)
+
+    parts = [(path, path.stat()) for path in folder.glob("*.jsonl.gz")]
+    count = len(parts)
+    total_bytes = sum(stat.st_size for _, stat in parts)
+    if count <= max_files and total_bytes <= max_bytes:
+        return
+
+    closed = {entry["call_id"] for entry in read_index(folder) if "call_id" in entry}
+    last_change: dict[str, float] = {}
+    for path, stat in parts:
+        call_id = _part_call_id(path.name)
+        last_change[call_id] = max(last_change.get(call_id, 0.0), stat.st_mtime)
+    abandoned_before = time.time() - ABANDONED_AFTER_SECONDS
+    prunable = sorted(
+        (
+            (path, stat) for path, stat in parts
+            if _part_call_id(path.name) in closed
+            or last_change[_part_call_id(path.name)] < abandoned_before
+        ),
+        key=lambda item: item[1].st_mtime
+    )
+
+    pruned = set()
+    while prunable and (count > max_files or total_bytes > max_bytes):
+        path, stat = prunable.pop(0)
+        path.unlink(missing_ok=True)
+        pruned.add(path.name)
+        count -= 1
+        total_bytes -= stat.st_size
+        logger.debug("Pruned transcript part: %s", path.name)
+    if pruned:
+        _mark_pruned_parts(folder, pruned)
+
+
+def _mark_pruned_parts(folder: Path, pruned: set[str]) -> None:
+    """Move pruned parts from ``parts`` to ``pruned_parts`` in the index entries."""
+    entries = read_index(folder)
+    changed = False
+    for entry in entries:
+        gone = [part for part in entry.get("parts", []) if part in pruned]
+        if gone:
+            entry["parts"] = [part for part in entry["parts"] if part not in pruned]
+            entry["pruned_parts"] = entry.get("pruned_parts", []) + gone
+            changed = True
+    if not changed:
+        return
+    index_path = folder / INDEX_FILE_NAME
+    temp_path = index_path.with_suffix(".tmp")
+    with open(temp_path, "w", encoding="utf-8") as index:
+        for entry in entries:
+            index.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    os.replace(temp_path, index_path)
+
+
+def read_index(folder: Path) -> list[dict]:
+    """Read all index entries from a transcript folder."""
+    index_path = folder / INDEX_FILE_NAME
+    if not index_path.exists():
+        return []
+    with open(index_path, "r", encoding="utf-8") as index:
+        return [json.loads(line) for line in index if line.strip()]